@@ -0,0 +1,20 @@
+{% macro incremental_filter(updated_at_column='__updated_at') %}
+
+{#
+  Em execuções incrementais, filtra apenas as linhas carregadas na camada raw depois
+  da última linha já presente no modelo de destino. O loader preenche a coluna
+  __updated_at na inserção e a atualiza quando o upsert altera o conteúdo do registro.
+  Se o destino ainda não possui a coluna (modelo criado antes dela existir), nenhum
+  filtro é aplicado e on_schema_change='append_new_columns' a adiciona nesta execução.
+#}
+{% if is_incremental() %}
+  {% set existing_columns = adapter.get_columns_in_relation(this) | map(attribute='name') | list %}
+  {% if updated_at_column in existing_columns %}
+WHERE {{ adapter.quote(updated_at_column) }} > (
+  SELECT COALESCE(MAX({{ adapter.quote(updated_at_column) }}), '-infinity'::timestamptz)
+  FROM {{ this }}
+)
+  {% endif %}
+{% endif %}
+
+{% endmacro %}
@@ -1,17 +1,40 @@
 {% macro process_jsonb_fields(source_table, content_column='"CONTENT"') %}
 
-{# Get all keys from the JSONB content column #}
-{% set keys_query %}
-  SELECT DISTINCT jsonb_object_keys({{ content_column }}) AS key
-  FROM {{ source_table }}
-{% endset %}
-
-{% set keys_results = run_query(keys_query) %}
+{# Read the keys from the catalog maintained by PostgresLoader at load time, seeded with a full scan of the raw table on its first load #}
 {% set keys = [] %}
-{% if keys_results and keys_results.rows %}
-  {% for row in keys_results.rows %}
-    {% do keys.append(row[0]) %}
-  {% endfor %}
+{% set catalog = adapter.get_relation(
+    database=source_table.database,
+    schema=source_table.schema,
+    identifier='_raw_key_catalog'
+) %}
+{% if catalog is not none and content_column == '"CONTENT"' %}
+  {% set catalog_query %}
+    SELECT key
+    FROM {{ catalog }}
+    WHERE table_name = '{{ source_table.identifier }}'
+    ORDER BY key
+  {% endset %}
+  {% set catalog_results = run_query(catalog_query) %}
+  {% if catalog_results and catalog_results.rows %}
+    {% for row in catalog_results.rows %}
+      {% do keys.append(row[0]) %}
+    {% endfor %}
+  {% endif %}
+{% endif %}
+
+{# Fall back to scanning the JSONB content column when the table is not cataloged yet #}
+{% if not keys %}
+  {% set keys_query %}
+    SELECT DISTINCT jsonb_object_keys({{ content_column }}) AS key
+    FROM {{ source_table }}
+  {% endset %}
+
+  {% set keys_results = run_query(keys_query) %}
+  {% if keys_results and keys_results.rows %}
+    {% for row in keys_results.rows %}
+      {% do keys.append(row[0]) %}
+    {% endfor %}
+  {% endif %}
 {% endif %}
 
 {# Generate the SQL query #}
@@ -24,4 +47,4 @@ SELECT
   {% endfor %}
 FROM {{ source_table }}
 
-{% endmacro %} 
\ No newline at end of file
+{% endmacro %}
@@ -24,5 +24,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'available_credit_limit')::numeric AS available_credit_limit,
 ("CONTENT"->>'minimum_order')::numeric AS minimum_order,
 ("CONTENT"->>'ecommerce_minimum_order')::numeric AS ecommerce_minimum_order,
-("CONTENT"->>'minimum_quantity')::integer AS minimum_quantity
-FROM {{source('bendito','bdt_raw_client')}}
\ No newline at end of file
+("CONTENT"->>'minimum_quantity')::integer AS minimum_quantity,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_client')}}
+{{ incremental_filter() }}
\ No newline at end of file
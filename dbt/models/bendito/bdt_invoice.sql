@@ -58,5 +58,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'nf_notes')::text AS nf_notes,
 ("CONTENT"->>'creation_source')::integer AS creation_source,
 ("CONTENT"->>'tax_ipi')::numeric AS tax_ipi,
-("CONTENT"->>'tax_st')::numeric AS tax_st
-FROM {{source('bendito','bdt_raw_invoice')}}
\ No newline at end of file
+("CONTENT"->>'tax_st')::numeric AS tax_st,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_invoice')}}
+{{ incremental_filter() }}
\ No newline at end of file
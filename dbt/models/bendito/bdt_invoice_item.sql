@@ -45,5 +45,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'unit_percentage_addition')::numeric AS unit_percentage_addition,
 ("CONTENT"->>'configured_product')::integer AS configured_product,
 ("CONTENT"->>'tax_ipi')::numeric AS tax_ipi,
-("CONTENT"->>'tax_st')::numeric AS tax_st
-FROM {{source('bendito','bdt_raw_invoice_item')}}
\ No newline at end of file
+("CONTENT"->>'tax_st')::numeric AS tax_st,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_invoice_item')}}
+{{ incremental_filter() }}
\ No newline at end of file
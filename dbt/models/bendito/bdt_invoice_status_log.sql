@@ -5,5 +5,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'id_customer')::integer AS id_customer,
 ("CONTENT"->>'id_user_modification')::integer AS id_user_modification,
 ("CONTENT"->>'time_creation')::timestamp without time zone AS time_creation,
-("CONTENT"->>'origem')::character varying AS origem
-FROM {{source('bendito','bdt_raw_invoice_status_log')}}
\ No newline at end of file
+("CONTENT"->>'origem')::character varying AS origem,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_invoice_status_log')}}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -17,5 +17,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'business_situation')::integer AS business_situation,
 ("CONTENT"->>'payment_method')::integer AS payment_method,
 ("CONTENT"->>'preferred_salesperson')::bigint AS preferred_salesperson,
-("CONTENT"->>'tax_situation')::integer AS tax_situation
-FROM {{source('bendito','bdt_raw_person')}}
\ No newline at end of file
+("CONTENT"->>'tax_situation')::integer AS tax_situation,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_person')}}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -42,5 +42,7 @@ SELECT ("CONTENT"->>'id_customer')::integer AS id_customer,
 ("CONTENT"->>'services_taxation')::integer AS services_taxation,
 ("CONTENT"->>'configurable')::boolean AS configurable,
 ("CONTENT"->>'app_sale')::boolean AS app_sale,
-("CONTENT"->>'creation_source')::integer AS creation_source
-FROM {{source('bendito','bdt_raw_product')}}
\ No newline at end of file
+("CONTENT"->>'creation_source')::integer AS creation_source,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_product')}}
+{{ incremental_filter() }}
\ No newline at end of file
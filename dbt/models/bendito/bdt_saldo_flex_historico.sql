@@ -5,5 +5,7 @@ SELECT ("CONTENT"->>'id')::integer AS id,
 ("CONTENT"->>'movement')::integer AS movement,
 ("CONTENT"->>'id_user')::integer AS id_user,
 ("CONTENT"->>'time_creation')::timestamp without time zone AS time_creation,
-("CONTENT"->>'observation')::character varying AS observation
-FROM {{source('bendito','bdt_raw_saldo_flex_historico')}}
\ No newline at end of file
+("CONTENT"->>'observation')::character varying AS observation,
+"__updated_at"
+FROM {{source('bendito','bdt_raw_saldo_flex_historico')}}
+{{ incremental_filter() }}
\ No newline at end of file
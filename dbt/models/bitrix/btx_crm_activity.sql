@@ -58,5 +58,7 @@ select
 	
 	-- Origem
 	origin_id as id_origem,
-	originator_id as id_originador
-from {{ref('btx_processed_crm_activity')}}
\ No newline at end of file
+	originator_id as id_originador,
+	"__updated_at"
+from {{ref('btx_processed_crm_activity')}}
+{{ incremental_filter() }}
\ No newline at end of file
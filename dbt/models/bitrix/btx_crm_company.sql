@@ -35,6 +35,8 @@ select
 	uf_crm_1726173773647 as cp_qntde_vendida_do_principal_produto,
 	uf_crm_1726940183689 as cp_status_da_empresa,
 	uf_crm_company_1720014986901 as cp_cnpj,
-	uf_crm_company_1738069980122 as cp_ha_quanto_tempo_a_empresa_existe
+	uf_crm_company_1738069980122 as cp_ha_quanto_tempo_a_empresa_existe,
+	"__updated_at"
 from
-	{{ref('btx_processed_crm_company')}}
\ No newline at end of file
+	{{ref('btx_processed_crm_company')}}
+{{ incremental_filter() }}
\ No newline at end of file
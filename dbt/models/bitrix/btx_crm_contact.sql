@@ -56,6 +56,8 @@ select
 	uf_crm_avito_wz,
 	uf_crm_instagram_wz,
 	uf_crm_telegramid_wz,
-	uf_crm_telegramusername_wz
+	uf_crm_telegramusername_wz,
+	"__updated_at"
 from
-	{{ref('btx_processed_crm_contact')}}
\ No newline at end of file
+	{{ref('btx_processed_crm_contact')}}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -117,6 +117,8 @@ SELECT
 	utm_source, --não é usado
 	utm_term, -- não é usado
 	utm_content, -- não é usado
-	utm_campaign -- não é usado
+	utm_campaign, -- não é usado
+	"__updated_at"
 FROM
-	{{ ref('btx_processed_crm_deal') }}
\ No newline at end of file
+	{{ ref('btx_processed_crm_deal') }}
+{{ incremental_filter() }}
\ No newline at end of file
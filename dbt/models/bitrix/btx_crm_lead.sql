@@ -58,5 +58,7 @@ select
 	uf_crm_telegramid_wz as id_telegram_wz,
 	uf_crm_telegramusername_wz as usuario_telegram_wz,
 	"comments" as comentarios,
-	(SELECT array_agg(e->>'VALUE') FROM jsonb_array_elements(link) AS e) as link
-from {{ref('btx_processed_crm_lead')}}
\ No newline at end of file
+	(SELECT array_agg(e->>'VALUE') FROM jsonb_array_elements(link) AS e) as link,
+	"__updated_at"
+from {{ref('btx_processed_crm_lead')}}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -33,6 +33,8 @@ select
 	modified_by as id_modificado_por,
 	
 	-- Campos personalizados
-	property_45 as property_45
+	property_45 as property_45,
+	"__updated_at"
 from
-	{{ref('btx_processed_crm_product')}}
\ No newline at end of file
+	{{ref('btx_processed_crm_product')}}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -58,6 +58,7 @@ SELECT
     
     -- Source and origin
     ("CONTENT"->>'ORIGIN_ID') AS origin_id,
-    ("CONTENT"->>'ORIGINATOR_ID') AS originator_id
+    ("CONTENT"->>'ORIGINATOR_ID') AS originator_id,
+    "__updated_at"
 FROM {{ source('bitrix', 'btx_raw_crm_activity') }}
 WHERE "SUCCESS" = TRUE
\ No newline at end of file
@@ -136,6 +136,7 @@ SELECT
     ("CONTENT"->>'UF_CRM_DEAL_1738069738944')::varchar as uf_crm_deal_1738069738944,
     ("CONTENT"->>'UF_CRM_DEAL_1738069820827')::text as uf_crm_deal_1738069820827,
     ("CONTENT"->>'UF_CRM_DEAL_1722632496832')::varchar as uf_crm_deal_1722632496832,
-    NULLIF("CONTENT"->>'UF_CRM_1744677619','')::int2 as uf_crm_1744677619
+    NULLIF("CONTENT"->>'UF_CRM_1744677619','')::int2 as uf_crm_1744677619,
+    "__updated_at"
 from {{ source('bitrix', 'btx_raw_crm_deal') }}
 WHERE "SUCCESS" = true
\ No newline at end of file
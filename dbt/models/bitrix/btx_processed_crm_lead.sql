@@ -79,5 +79,6 @@ select
     
     -- Additional fields
     ("CONTENT"->>'COMMENTS') AS comments,
-    ("CONTENT"-> 'LINK') AS link
+    ("CONTENT"-> 'LINK') AS link,
+    "__updated_at"
 FROM {{ source('bitrix', 'btx_raw_crm_lead') }}
\ No newline at end of file
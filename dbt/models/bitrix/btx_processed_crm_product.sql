@@ -31,6 +31,7 @@ SELECT
     
     -- User references
     NULLIF("CONTENT"->>'CREATED_BY', '')::int2 AS created_by,
-    NULLIF("CONTENT"->>'MODIFIED_BY', '')::int2 AS modified_by
+    NULLIF("CONTENT"->>'MODIFIED_BY', '')::int2 AS modified_by,
+    "__updated_at"
 FROM {{ source('bitrix', 'btx_raw_crm_product') }}
 WHERE "SUCCESS" = true
\ No newline at end of file
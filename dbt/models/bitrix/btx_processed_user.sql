@@ -36,6 +36,7 @@ SELECT
 	
 	-- Time zone settings
 	("CONTENT"->>'TIME_ZONE')::varchar AS time_zone,
-	NULLIF("CONTENT"->>'TIME_ZONE_OFFSET','')::int4 AS time_zone_offset
+	NULLIF("CONTENT"->>'TIME_ZONE_OFFSET','')::int4 AS time_zone_offset,
+	"__updated_at"
 FROM {{ source('bitrix', 'btx_raw_user') }}
 WHERE "SUCCESS" = true
\ No newline at end of file
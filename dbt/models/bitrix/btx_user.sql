@@ -23,6 +23,8 @@ select
 	time_zone_offset as deslocamento_do_fuso_horario,
 	personal_birthday as data_de_nascimento_pessoal,
 	last_activity_date as data_da_ultima_atividade,
-	uf_employment_date as data_de_contratacao
+	uf_employment_date as data_de_contratacao,
+	"__updated_at"
 from
-	{{ref('btx_processed_user')}}
\ No newline at end of file
+	{{ref('btx_processed_user')}}
+{{ incremental_filter() }}
\ No newline at end of file
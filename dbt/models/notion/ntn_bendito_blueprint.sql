@@ -36,5 +36,7 @@ select
     (tipo -> 'select' ->> 'name') as tipo,
     (secao -> 'select' ->> 'name') as secao,
     (subsecao -> 'select' ->> 'name') as subsecao,
-    (proprietario -> 'select' ->> 'name') as proprietario
-from {{ ref('ntn_processed_bendito_blueprint') }}
\ No newline at end of file
+    (proprietario -> 'select' ->> 'name') as proprietario,
+    "__updated_at"
+from {{ ref('ntn_processed_bendito_blueprint') }}
+{{ incremental_filter() }}
\ No newline at end of file
@@ -71,6 +71,7 @@ select
         FROM jsonb_each("CONTENT" -> 'properties')
         WHERE value ->> 'id' = 'notion%3A%2F%2Fwiki%2Fowner_property'
         LIMIT 1
-    ) as proprietario
+    ) as proprietario,
+    "__updated_at"
 from {{ source('notion', 'ntn_raw_bendito_blueprint') }}
 WHERE "SUCCESS" = TRUE
\ No newline at end of file
@@ -365,6 +365,7 @@ select
         FROM jsonb_each("CONTENT" -> 'properties')
         WHERE value ->> 'id' = 'JI%5DF'
         LIMIT 1
-    ) as soma_de_progresso
+    ) as soma_de_progresso,
+    "__updated_at"
 from {{ source('notion', 'ntn_raw_universal_task_database') }}
 WHERE "SUCCESS" = TRUE
\ No newline at end of file
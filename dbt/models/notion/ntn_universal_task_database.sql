@@ -276,6 +276,7 @@ select
         ) AS tester_item
     ) as tester,
     (soma_de_progresso -> 'rollup' ->> 'number')::numeric as soma_de_progresso,
-    (peso_da_tarefa -> 'rollup' ->> 'number')::numeric as peso_da_tarefa
+    (peso_da_tarefa -> 'rollup' ->> 'number')::numeric as peso_da_tarefa,
+    "__updated_at"
 from {{ ref('ntn_processed_universal_task_database') }}
-
+{{ incremental_filter() }}
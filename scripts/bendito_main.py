@@ -1,12 +1,11 @@
 import os
 import time
+import asyncio
 import logging
-import datetime
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
 
-from sqlalchemy import create_engine
 from sqlalchemy.pool import QueuePool
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -15,7 +14,10 @@ from bdt_data_integration.src.streams.bendito_stream import BenditoStream
 from bdt_data_integration.src.utils.utils import Utils
 from bdt_data_integration.src.utils.notifier import WebhookNotifier
 from metadata.configuration_helper import ConfigurationHelper
+from utils.engine_registry import EngineRegistry
 from bdt_data_integration.src.utils.dbt_runner import DBTRunner
+from bdt_data_integration.src.utils.orchestrator import SyncOrchestrator, AsyncOrchestrator
+from bdt_data_integration.src.extractors.base_extractor import GenericAPIExtractor
 
 
 def main():
@@ -60,6 +62,7 @@ def main():
     user = os.environ["DESTINATION_ROOT_USER"]
     password = os.environ["DESTINATION_ROOT_PASSWORD"]
     db_name = os.environ["DESTINATION_DB_NAME"]
+    destination_url = f"postgresql://{user}:{password}@{host}/{db_name}?sslmode=require"
 
     # Carregando configurações globais do projeto
     start_time = time.time()
@@ -83,64 +86,106 @@ def main():
 
     if args.full_extract.lower() == "true":
         list(map(lambda table: setattr(table, 'days_interval', 0), active_tables))
+        list(map(lambda table: setattr(table, 'use_watermark', False), active_tables))
 
     logger = logging.getLogger("replicate_database")
+    # Reprodução do último spool completo de cada tabela, sem consultar a API
+    replay = args.replay.lower() == "true"
+
+    def load_records(stream, records):
+        try:
+            stream.set_table_definition()
+            stream.set_loader(
+                engine=EngineRegistry.get_engine(destination_url),
+                load_method=args.load_method,
+            )
+            stream.load_stream(
+                records,
+                chunksize=args.chunk_size,
+                mode=args.load_mode,
+            )
+            return 1
+        except Exception as e:
+            logger.error(f"Erro ao carregar dados: {e}")
+            return 0
 
     # @notifier.error_handler
     def replicate_table(table):
         
         if args.extract.lower() == "false":
             return 1
+        stream = BenditoStream(table)
+        stream.set_extractor(max_workers=args.max_workers)
+        if args.spool_dir or replay:
+            stream.set_spool(args.spool_dir, replay=replay)
+
+        if args.streaming.lower() == "true":
+            try:
+                stream.set_table_definition()
+                stream.set_loader(
+                    engine=EngineRegistry.get_engine(destination_url),
+                    load_method=args.load_method,
+                )
+                stream.stream_to_loader(
+                    chunksize=args.chunk_size,
+                    queue_size=args.queue_size,
+                    mode=args.load_mode,
+                    page_size=args.page_size,
+                )
+                return 1
+            except Exception as e:
+                logger.error(f"Erro ao replicar dados: {e}")
+                return 0
+
         try:
-            stream = BenditoStream(table)
-            stream.set_extractor()
             records = stream.extract_stream(page_size=args.page_size)
         except Exception as e:
             logger.error(f"Erro ao extrair dados: {e}")
             return 0
-            
+
+        return load_records(stream, records)
+
+    async def areplicate_table(table):
+        # Extração no event loop compartilhado por todas as tabelas; a carga roda em uma thread auxiliar
+        stream = BenditoStream(table)
+        stream.set_extractor(max_workers=args.max_workers)
+        if args.spool_dir or replay:
+            stream.set_spool(args.spool_dir, replay=replay)
         try:
-            stream.set_table_definition()
-            stream.set_loader(
-                engine=create_engine(
-                    f"postgresql://{user}:{password}@{host}/{db_name}?sslmode=require"
-                )
-            )
-            stream.load_stream(
-                records,
-                chunksize=args.chunk_size,
-            )
-            return 1
+            records = await stream.aextract_stream(page_size=args.page_size)
         except Exception as e:
-            logger.error(f"Erro ao carregar dados: {e}")
+            logger.error(f"Erro ao extrair dados: {e}")
             return 0
+        return await asyncio.to_thread(load_records, stream, records)
 
     total = len(active_tables)
     success = 0
+    # Tabelas recarregadas nesta execução, None quando a extração é pulada
+    loaded_tables = None
 
     if args.extract.lower() == "true":
-        for table in active_tables:
-            config_handler.update_table_configuration(
-                table.id,
-                table.source_name,
-                last_sync_attempt_at=datetime.datetime.now(),
+        # Dados reproduzidos não avançam a marca d'água, que segue a da extração original
+        if args.async_extract.lower() == "true" and args.streaming.lower() != "true":
+            orchestrator = AsyncOrchestrator(
+                areplicate_table,
+                config_handler=None if replay else config_handler,
+                max_concurrency=args.table_concurrency,
+                cleanup=GenericAPIExtractor.close_async_sessions,
             )
-
-            try:
-                check = replicate_table(table) or 0
-                success += check
-
-            except Exception as e:
-                success += 0
-                raise e
-
-            finally:
-                if  check or 0 == 1:
-                    config_handler.update_table_configuration(
-                        table.id,
-                        table.source_name,
-                        last_successful_sync_at=datetime.datetime.now(),
-                    )
+        else:
+            orchestrator = SyncOrchestrator(
+                replicate_table,
+                config_handler=None if replay else config_handler,
+                max_concurrency=args.table_concurrency,
+            )
+        outcomes = orchestrator.run(active_tables)
+        success = sum(outcome.success for outcome in outcomes)
+        loaded_tables = [outcome.table for outcome in outcomes if outcome.success]
+
+        # Falhas não tratadas por replicate_table são propagadas após a conclusão das demais tabelas
+        errors = [outcome.error for outcome in outcomes if outcome.error]
+        if errors:
+            raise errors[0]
     else:
         logger.info("Pulando extração de dados")
 
@@ -175,18 +220,24 @@ def main():
         logger.info(f"Usando schema de destino para transformações: {origin}")
 
         dbt_runner = DBTRunner(
-            project_dir=str(dbt_project_dir), profiles_dir=str(dbt_profiles_dir)
+            project_dir=str(dbt_project_dir),
+            profiles_dir=str(dbt_profiles_dir),
+            in_process=args.dbt_in_process.lower() == "true",
         )
 
         # Atualizar configurações dos modelos antes de executar
         if args.update_dbt_config.lower() == "true":
             logger.info("Atualizando configurações dos modelos DBT...")
             dbt_runner.update_model_configs(tables, origin)
-
-        dbt_runner.run(models=origin, target_schema=origin)
+        if args.dbt_select == "changed" and loaded_tables is not None:
+            dbt_runner.run_changed(loaded_tables, target_schema=origin)
+        else:
+            dbt_runner.run(models=origin, target_schema=origin)
     else:
         logger.info("Pulando transformações dbt")
 
+    EngineRegistry.dispose_all()
+
     elapsed_time_formatted = Utils.format_elapsed_time(time.time() - start_time)
     # Update the notifier.pipeline_end call with the formatted time
     notifier.pipeline_end(
@@ -1,12 +1,11 @@
 import os
 import time
+import asyncio
 import logging
-import datetime
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
 
-from sqlalchemy import create_engine
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -14,7 +13,10 @@ from bdt_data_integration.src.streams.bitrix_stream import BitrixStream
 from bdt_data_integration.src.utils.utils import Utils
 from bdt_data_integration.src.utils.notifier import WebhookNotifier
 from metadata.configuration_helper import ConfigurationHelper
+from utils.engine_registry import EngineRegistry
 from bdt_data_integration.src.utils.dbt_runner import DBTRunner
+from bdt_data_integration.src.utils.orchestrator import SyncOrchestrator, AsyncOrchestrator
+from bdt_data_integration.src.extractors.base_extractor import GenericAPIExtractor
 
 
 def main():
@@ -56,6 +58,7 @@ def main():
     user = os.environ["DESTINATION_ROOT_USER"]
     password = os.environ["DESTINATION_ROOT_PASSWORD"]
     db_name = os.environ["DESTINATION_DB_NAME"]
+    destination_url = f"postgresql://{user}:{password}@{host}/{db_name}?sslmode=require"
     notifier_url = os.environ["DEEPNOTE_BENDITO_BI_WEBHOOK"]
 
     start_time = time.time()
@@ -77,53 +80,96 @@ def main():
     
     if args.full_extract.lower() == "true":
         list(map(lambda table: setattr(table, 'days_interval', 0), active_tables))
+        list(map(lambda table: setattr(table, 'use_watermark', False), active_tables))
 
     logger = logging.getLogger("replicate_database")
+    # Reprodução do último spool completo de cada tabela, sem consultar a API
+    replay = args.replay.lower() == "true"
 
-    # @notifier.error_handler
-    def replicate_table(table):
-        
-        if args.extract.lower() == "false":
-            return 1
-        stream = BitrixStream(table)
-        stream.set_extractor()
-        records = stream.extract_stream()
+    def load_records(stream, records):
         stream.set_table_definition()
         stream.set_loader(
-            engine=create_engine(
-                f"postgresql://{user}:{password}@{host}/{db_name}?sslmode=require"
-            )
+            engine=EngineRegistry.get_engine(destination_url),
+            load_method=args.load_method,
         )
         try:
             stream.load_stream(
                 records,
                 chunksize=args.chunk_size,
+                mode=args.load_mode,
             )
             return 1
         except Exception as e:
             logger.error(f"Erro ao carregar dados: {e}")
             return 0
 
+    # @notifier.error_handler
+    def replicate_table(table):
+        
+        if args.extract.lower() == "false":
+            return 1
+        stream = BitrixStream(table)
+        stream.set_extractor(max_workers=args.max_workers)
+        if args.spool_dir or replay:
+            stream.set_spool(args.spool_dir, replay=replay)
+
+        if args.streaming.lower() == "true":
+            try:
+                stream.set_table_definition()
+                stream.set_loader(
+                    engine=EngineRegistry.get_engine(destination_url),
+                    load_method=args.load_method,
+                )
+                stream.stream_to_loader(
+                    chunksize=args.chunk_size,
+                    queue_size=args.queue_size,
+                    mode=args.load_mode,
+                )
+                return 1
+            except Exception as e:
+                logger.error(f"Erro ao replicar dados: {e}")
+                return 0
+
+        records = stream.extract_stream()
+        return load_records(stream, records)
+
+    async def areplicate_table(table):
+        # Extração no event loop compartilhado por todas as tabelas; a carga roda em uma thread auxiliar
+        stream = BitrixStream(table)
+        stream.set_extractor(max_workers=args.max_workers)
+        if args.spool_dir or replay:
+            stream.set_spool(args.spool_dir, replay=replay)
+        try:
+            records = await stream.aextract_stream()
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados: {e}")
+            return 0
+        return await asyncio.to_thread(load_records, stream, records)
+
     total = len(active_tables)
     success = 0
+    # Tabelas recarregadas nesta execução, None quando a extração é pulada
+    loaded_tables = None
 
     if args.extract.lower() == "true":
 
-        for table in active_tables:
-            config_handler.update_table_configuration(
-                table.id,
-                table.source_name,
-                last_sync_attempt_at=datetime.datetime.now(),
+        # Dados reproduzidos não avançam a marca d'água, que segue a da extração original
+        if args.async_extract.lower() == "true" and args.streaming.lower() != "true":
+            orchestrator = AsyncOrchestrator(
+                areplicate_table,
+                config_handler=None if replay else config_handler,
+                max_concurrency=args.table_concurrency,
+                cleanup=GenericAPIExtractor.close_async_sessions,
             )
-            check = replicate_table(table) or 0
-            success += check
-
-            if check == 1:
-                config_handler.update_table_configuration(
-                    table.id,
-                    table.source_name,
-                    last_successful_sync_at=datetime.datetime.now(),
-                )
+        else:
+            orchestrator = SyncOrchestrator(
+                replicate_table,
+                config_handler=None if replay else config_handler,
+                max_concurrency=args.table_concurrency,
+            )
+        outcomes = orchestrator.run(active_tables)
+        success = sum(outcome.success for outcome in outcomes)
+        loaded_tables = [outcome.table for outcome in outcomes if outcome.success]
     # Execute dbt transformations for bitrix models after all tables have been loaded
     logger = logging.getLogger("dbt_runner")
     logger.info("Executando transformações dbt para os modelos do Bitrix")
@@ -156,7 +202,9 @@ def main():
         logger.info(f"Usando schema de destino para transformações: {origin}")
 
         dbt_runner = DBTRunner(
-            project_dir=str(dbt_project_dir), profiles_dir=str(dbt_profiles_dir)
+            project_dir=str(dbt_project_dir),
+            profiles_dir=str(dbt_profiles_dir),
+            in_process=args.dbt_in_process.lower() == "true",
         )
 
         if args.update_dbt_config.lower() == "true":
@@ -164,7 +212,12 @@ def main():
             dbt_runner.update_model_configs(tables, origin)
 
         # Run only Bitrix models, passando o schema de destino
-        dbt_runner.run(models=origin, target_schema=origin)
+        if args.dbt_select == "changed" and loaded_tables is not None:
+            dbt_runner.run_changed(loaded_tables, target_schema=origin)
+        else:
+            dbt_runner.run(models=origin, target_schema=origin)
+
+    EngineRegistry.dispose_all()
 
     elapsed_time_formatted = Utils.format_elapsed_time(time.time() - start_time)
 
@@ -17,9 +17,11 @@ setup(
         "python-dotenv==1.0.0",
         "numpy==1.26.4",
         "pandas==2.1.4",
+        "pyarrow>=14.0.1",
         "pytz==2025.2",
         "tzdata==2025.2",
         "requests==2.31.0",
+        "aiohttp>=3.9.0",
         "jinja2>=3.1.3,<4",
         "python-dotenv==1.0.0",
         "protobuf",
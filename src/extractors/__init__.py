@@ -6,6 +6,7 @@ This package contains extractor classes for different data sources:
 - NotionDatabaseAPIExtractor: Extracts data from Notion API
 - BenditoAPIExtractor: Extracts data from Bendito API
 - BitrixAPIExtractor: Extracts data from Bitrix API
+- RecordSpool: Local NDJSON spool of extracted batches, replayable without the API
 
 Each extractor class provides methods for:
 - Handling API authentication
@@ -18,10 +19,12 @@ from .base_extractor import GenericAPIExtractor
 from .notion_extractor import NotionDatabaseAPIExtractor
 from .bendito_extractor import BenditoAPIExtractor
 from .bitrix_extractor import BitrixAPIExtractor
+from .spool import RecordSpool
 
 __all__ = [
     'GenericAPIExtractor',
     'NotionDatabaseAPIExtractor',
     'BenditoAPIExtractor',
-    'BitrixAPIExtractor'
+    'BitrixAPIExtractor',
+    'RecordSpool'
 ] 
\ No newline at end of file
@@ -1,8 +1,82 @@
+import json
+import time
+import queue
+import random
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod 
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
 from metadata.data_table import DataTable
+from utils.rate_limiter import AdaptiveRateLimiter, parse_retry_after
 logger = logging.getLogger(__name__)
 
+# Com pyarrow instalado, as colunas ID/SUCCESS/CONTENT são armazenadas em buffers Arrow
+# contíguos ao invés de um objeto str do Python por célula
+try:
+    import pyarrow  # noqa: F401
+
+    RECORD_DTYPE = "string[pyarrow]"
+except ImportError:
+    RECORD_DTYPE = str
+
+RECORD_COLUMNS = ["ID", "SUCCESS", "CONTENT"]
+
+# O aiohttp só é necessário para a extração assíncrona (arun/aiter_batches)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Sentinela que indica o fim dos lotes de iter_batches no caminho assíncrono padrão
+_END_OF_BATCHES = object()
+# Sentinela que indica o fim das páginas de uma tarefa em iter_concurrent/aiter_concurrent
+_END_OF_TASK = object()
+
+
+class BufferedResponse:
+    """
+    Resposta HTTP já lida por completo, com a interface de requests.Response usada pelos extratores.
+
+    Respostas do aiohttp só podem ser lidas dentro do contexto da requisição, então o corpo
+    é copiado para este objeto e os métodos que convertem respostas em registros atendem
+    tanto o caminho síncrono quanto o assíncrono.
+
+    Atributos:
+        status_code (int): Código de status HTTP.
+        content (bytes): Corpo da resposta, já descompactado.
+        headers (dict): Cabeçalhos da resposta.
+        url (str): URL requisitada.
+    """
+
+    def __init__(self, status_code: int, content: bytes, headers=None, url: str = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+
 class GenericExtractor(ABC):
     """
     Classe abstrata que define um extrator de dados e os métodos obrigatórios.
@@ -10,6 +84,23 @@ class GenericExtractor(ABC):
     def __init__(self, table: DataTable):
         self.table = table
 
+    @staticmethod
+    def to_record_frame(data=None):
+        """
+        Monta o DataFrame ID/SUCCESS/CONTENT trocado entre extratores e loader.
+
+        As colunas usam o dtype 'string[pyarrow]' quando o pyarrow está disponível, o que
+        reduz a memória por registro e permite ao PostgresLoader escrever o CSV do COPY
+        diretamente dos buffers Arrow. Sem pyarrow, as colunas são str como antes.
+
+        Args:
+            data (dict | list[dict], optional): Colunas ou registros com as chaves ID, SUCCESS e CONTENT.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        return pd.DataFrame(data, columns=RECORD_COLUMNS, dtype=RECORD_DTYPE)
+
 class GenericAPIExtractor(GenericExtractor):
     """
     Classe abstrata que define um extrator de dados e os métodos obrigatórios.
@@ -22,9 +113,38 @@ class GenericAPIExtractor(GenericExtractor):
     O retorno de um Extractor é um compilado dos dados disponíveis, na sua formatação original, 
     como por exemplo:
         - Uma lista de objetos JSON com todas as entradas de um sistema.
+
+    As requisições HTTP devem ser feitas através de self.session, uma requests.Session
+    compartilhada por todos os extratores da mesma origem, mantendo as conexões TCP/TLS
+    abertas (keep-alive) entre páginas, registros e tabelas.
+
+    A extração assíncrona (arun/aiter_batches) usa self.async_session, uma sessão aiohttp
+    compartilhada da mesma forma dentro de cada event loop, permitindo que um único loop
+    multiplexe as requisições de várias tabelas.
+
+    Os extratores devem requisitar através de _request/_arequest, que passam pelo
+    AdaptiveRateLimiter da origem e repetem as respostas 429/503 respeitando o Retry-After.
     """
+
+    DEFAULT_POOL_SIZE = 10
+
+    # Taxa inicial e máxima de requisições por segundo da origem; None desativa o limitador
+    REQUESTS_PER_SECOND = None
+    MAX_REQUESTS_PER_SECOND = None
+    BURST = 1
+    # Novas tentativas após respostas 429/503, com backoff exponencial limitado a MAX_BACKOFF segundos
+    MAX_RETRIES = 5
+    MAX_BACKOFF = 30
+    RETRY_STATUS_CODES = {429, 503}
+    # Páginas aguardando consumo, por worker, em iter_concurrent/aiter_concurrent
+    CONCURRENT_PAGES_PER_WORKER = 2
+
+    _sessions = {}
+    _async_sessions = {}
+    _sessions_lock = threading.Lock()
+
     def __init__(
-        self, origin: str, token, *args, **kwargs
+        self, origin: str, token, *args, pool_size: int = None, **kwargs
     ) -> None:
         """
         Inicializa um objeto da classe GenericAPIExtractor.
@@ -33,11 +153,226 @@ class GenericAPIExtractor(GenericExtractor):
             identifier (str): String que identifica a API.
             token: O token de autenticação utilizado nesta API.
             writer: O objeto responsável por gravar os dados extraídos.
+            pool_size (int, optional): Quantidade máxima de conexões mantidas abertas com a origem.
             **kwargs: Argumentos adicionais para configuração do extrator.
         """
         super().__init__(origin, *args, **kwargs)
         self.origin = origin
         self.token = token
+        self.pool_size = pool_size or self.DEFAULT_POOL_SIZE
+        self.rate_limiter = self._get_rate_limiter()
+
+    def _get_rate_limiter(self):
+        """
+        Retorna o limitador adaptativo compartilhado pelos extratores da mesma origem.
+
+        Returns:
+            AdaptiveRateLimiter: O limitador da origem, ou None se REQUESTS_PER_SECOND não foi definido.
+        """
+        if not self.REQUESTS_PER_SECOND:
+            return None
+        return AdaptiveRateLimiter.for_origin(
+            self._session_key(),
+            self.REQUESTS_PER_SECOND,
+            self.BURST,
+            max_rate=self.MAX_REQUESTS_PER_SECOND,
+        )
+
+    def _session_key(self) -> str:
+        """
+        Retorna a chave da sessão HTTP compartilhada, a origem da tabela extraída.
+        """
+        return getattr(self.table, "origin", None) or str(self.origin)
+
+    def _get_headers(self) -> dict:
+        """
+        Cabeçalhos padrão da origem, aplicados a todas as requisições da sessão.
+
+        Returns:
+            dict: Os cabeçalhos padrão. Deve ser sobrescrito pelos extratores que exigem autenticação via cabeçalho.
+        """
+        return {}
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Sessão HTTP com pool de conexões compartilhada pelos extratores da mesma origem.
+
+        A sessão é criada no primeiro acesso com os cabeçalhos de _get_headers e
+        negociação de compressão gzip/deflate.
+
+        Returns:
+            requests.Session: A sessão da origem.
+        """
+        key = self._session_key()
+        with GenericAPIExtractor._sessions_lock:
+            session = GenericAPIExtractor._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(
+                    {"Accept-Encoding": "gzip, deflate", **self._get_headers()}
+                )
+                GenericAPIExtractor._sessions[key] = session
+                logger.debug(f"Sessão HTTP criada para {key} (pool_size={self.pool_size})")
+        return session
+
+    @classmethod
+    def close_sessions(cls):
+        """
+        Fecha todas as sessões HTTP compartilhadas e suas conexões.
+        """
+        with GenericAPIExtractor._sessions_lock:
+            for session in GenericAPIExtractor._sessions.values():
+                session.close()
+            GenericAPIExtractor._sessions.clear()
+
+    @property
+    def async_session(self):
+        """
+        Sessão aiohttp com pool de conexões compartilhada pelos extratores da mesma origem no event loop atual.
+
+        Deve ser acessada de dentro de uma corrotina. A sessão é criada no primeiro acesso
+        com os cabeçalhos de _get_headers; o aiohttp negocia e descompacta gzip/deflate.
+
+        Returns:
+            aiohttp.ClientSession: A sessão da origem no event loop atual.
+        """
+        if aiohttp is None:
+            raise ImportError("O pacote aiohttp é necessário para a extração assíncrona")
+        key = (self._session_key(), asyncio.get_running_loop())
+        with GenericAPIExtractor._sessions_lock:
+            session = GenericAPIExtractor._async_sessions.get(key)
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(
+                    headers=self._get_headers(),
+                    connector=aiohttp.TCPConnector(limit=self.pool_size),
+                )
+                GenericAPIExtractor._async_sessions[key] = session
+                logger.debug(f"Sessão HTTP assíncrona criada para {key[0]} (pool_size={self.pool_size})")
+        return session
+
+    @classmethod
+    async def close_async_sessions(cls):
+        """
+        Fecha as sessões aiohttp compartilhadas do event loop atual.
+        """
+        loop = asyncio.get_running_loop()
+        with GenericAPIExtractor._sessions_lock:
+            keys = [key for key in GenericAPIExtractor._async_sessions if key[1] is loop]
+            sessions = [GenericAPIExtractor._async_sessions.pop(key) for key in keys]
+        for session in sessions:
+            await session.close()
+
+    def _retry_wait(self, response, attempt: int):
+        """
+        Registra a resposta no limitador da origem e decide se a requisição deve ser repetida.
+
+        A espera é o Retry-After da resposta ou, na sua ausência, um backoff exponencial com
+        jitter. Com limitador, a espera pausa todas as requisições da origem.
+
+        Args:
+            response: A resposta obtida (requests.Response ou BufferedResponse).
+            attempt (int): Quantidade de tentativas já repetidas.
+
+        Returns:
+            float: Segundos até a nova tentativa, ou None se a resposta deve ser retornada.
+        """
+        if response.status_code not in self.RETRY_STATUS_CODES:
+            if self.rate_limiter:
+                self.rate_limiter.on_success()
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = min(self.MAX_BACKOFF, 2**attempt) + random.uniform(0, 1)
+        if self.rate_limiter:
+            self.rate_limiter.on_throttle(retry_after)
+
+        if attempt >= self.MAX_RETRIES:
+            logger.error(
+                f"Limite de tentativas atingido após erro {response.status_code} em {response.url}"
+            )
+            return None
+        logger.warning(
+            f"Erro {response.status_code} recebido. Nova tentativa em {retry_after:.1f}s "
+            f"(tentativa {attempt + 1}/{self.MAX_RETRIES})"
+        )
+        return retry_after
+
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Realiza uma requisição pela sessão da origem, respeitando o limitador adaptativo.
+
+        Respostas 429/503 são repetidas até MAX_RETRIES vezes, conforme _retry_wait.
+
+        Args:
+            method (str): Método HTTP ('get' ou 'post').
+            url (str): URL da requisição.
+            **kwargs: Argumentos repassados para requests.
+
+        Returns:
+            Response: A última resposta obtida, bem sucedida ou não.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            wait_time = self._retry_wait(response, attempt)
+            if wait_time is None:
+                return response
+            response.close()
+            attempt += 1
+            # Com limitador, a pausa é aplicada no próximo acquire()
+            if not self.rate_limiter:
+                time.sleep(wait_time)
+
+    async def _arequest(self, method: str, url: str, **kwargs) -> BufferedResponse:
+        """
+        Equivalente assíncrono de _request().
+
+        Args:
+            method (str): Método HTTP ('get' ou 'post').
+            url (str): URL da requisição.
+            **kwargs: Argumentos repassados para aiohttp (params, json, data).
+
+        Returns:
+            BufferedResponse: A última resposta obtida, bem sucedida ou não.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+            response = await self._asend(method, url, **kwargs)
+            wait_time = self._retry_wait(response, attempt)
+            if wait_time is None:
+                return response
+            attempt += 1
+            if not self.rate_limiter:
+                await asyncio.sleep(wait_time)
+
+    async def _asend(self, method: str, url: str, **kwargs) -> BufferedResponse:
+        """
+        Realiza uma requisição pela sessão assíncrona e lê a resposta por completo.
+
+        Args:
+            method (str): Método HTTP ('get' ou 'post').
+            url (str): URL da requisição.
+            **kwargs: Argumentos repassados para aiohttp (params, json, data).
+
+        Returns:
+            BufferedResponse: A resposta, com status, corpo e cabeçalhos.
+        """
+        async with self.async_session.request(method.upper(), url, **kwargs) as response:
+            content = await response.read()
+            return BufferedResponse(
+                response.status, content, dict(response.headers), str(response.url)
+            )
 
     @abstractmethod
     def _get_endpoint(self, **kwargs) -> str:
@@ -92,6 +427,152 @@ class GenericAPIExtractor(GenericExtractor):
         """
         pass 
 
+    def iter_batches(self, **kwargs):
+        """
+        Produz os dados extraídos em lotes, à medida que são obtidos da origem.
+
+        Cada lote é um DataFrame no mesmo formato do retorno de run(). A implementação
+        padrão produz um único lote com o resultado de run(); extratores que paginam
+        devem sobrescrevê-la para produzir um lote por página.
+
+        Yields:
+            pd.DataFrame: Lotes com as colunas ID, SUCCESS e CONTENT.
+        """
+        yield self.run(**kwargs)
+
+    async def aiter_batches(self, **kwargs):
+        """
+        Equivalente assíncrono de iter_batches().
+
+        A implementação padrão consome iter_batches() em uma thread auxiliar, um lote por
+        vez, para que extratores sem caminho assíncrono próprio não bloqueiem o event loop.
+        Extratores que paginam devem sobrescrevê-la usando self.async_session.
+
+        Yields:
+            pd.DataFrame: Lotes com as colunas ID, SUCCESS e CONTENT.
+        """
+        batches = self.iter_batches(**kwargs)
+        while True:
+            batch = await asyncio.to_thread(next, batches, _END_OF_BATCHES)
+            if batch is _END_OF_BATCHES:
+                return
+            yield batch
+
+    async def arun(self, **kwargs):
+        """
+        Equivalente assíncrono de run(), consolidando os lotes de aiter_batches().
+
+        Returns:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        batches = [batch async for batch in self.aiter_batches(**kwargs)]
+        if not batches:
+            return self.to_record_frame()
+        return pd.concat(batches, ignore_index=True)
+
+    def iter_concurrent(self, fetch, tasks, max_workers: int, thread_name_prefix: str = ""):
+        """
+        Percorre várias sequências de páginas em paralelo, produzindo as páginas à medida que chegam.
+
+        Cada tarefa executa fetch(task) em uma thread, até max_workers simultâneas, e coloca
+        suas páginas em uma fila limitada a CONCURRENT_PAGES_PER_WORKER páginas por worker.
+        Os workers aguardam enquanto a fila está cheia, de forma que a memória acompanha
+        algumas páginas e não as faixas inteiras. As páginas de tarefas diferentes chegam
+        intercaladas. Se o consumidor parar, os workers são interrompidos na próxima página.
+
+        Args:
+            fetch (Callable): Função que recebe uma tarefa e produz suas páginas.
+            tasks (list): As tarefas, como faixas de chave ou janelas de tempo.
+            max_workers (int): Quantidade máxima de tarefas em andamento.
+            thread_name_prefix (str, optional): Prefixo do nome das threads.
+
+        Yields:
+            As páginas de todas as tarefas.
+
+        Raises:
+            Exception: O primeiro erro de uma tarefa, repassado ao consumidor.
+        """
+        pages = queue.Queue(maxsize=max(1, max_workers) * self.CONCURRENT_PAGES_PER_WORKER)
+        stop = threading.Event()
+        errors = []
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def work(task):
+            try:
+                for page in fetch(task):
+                    if not put(page):
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(_END_OF_TASK)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=thread_name_prefix)
+        try:
+            for task in tasks:
+                executor.submit(work, task)
+            pending = len(tasks)
+            while pending:
+                page = pages.get()
+                if errors:
+                    raise errors[0]
+                if page is _END_OF_TASK:
+                    pending -= 1
+                    continue
+                yield page
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def aiter_concurrent(self, fetch, tasks, max_workers: int):
+        """
+        Equivalente assíncrono de iter_concurrent(), com as tarefas executadas como corrotinas.
+
+        Args:
+            fetch (Callable): Função que recebe uma tarefa e retorna um gerador assíncrono de páginas.
+            tasks (list): As tarefas, como faixas de chave ou janelas de tempo.
+            max_workers (int): Quantidade máxima de tarefas em andamento.
+
+        Yields:
+            As páginas de todas as tarefas.
+        """
+        pages = asyncio.Queue(maxsize=max(1, max_workers) * self.CONCURRENT_PAGES_PER_WORKER)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def work(task):
+            try:
+                async with semaphore:
+                    async for page in fetch(task):
+                        await pages.put(page)
+            except Exception as e:
+                await pages.put(e)
+            # Uma tarefa cancelada não sinaliza o fim, pois o consumidor já parou de ler a fila
+            await pages.put(_END_OF_TASK)
+
+        workers = [asyncio.create_task(work(task)) for task in tasks]
+        try:
+            pending = len(workers)
+            while pending:
+                page = await pages.get()
+                if isinstance(page, Exception):
+                    raise page
+                if page is _END_OF_TASK:
+                    pending -= 1
+                    continue
+                yield page
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
 class GenericDatabaseExtractor(GenericExtractor):
     """
     Classe abstrata que define um extrator de dados e os métodos obrigatórios.
@@ -1,9 +1,9 @@
 import os
 import json
 import logging
-import requests
 import pandas as pd
-from io import StringIO
+import io
+import asyncio
 from dotenv import load_dotenv
 
 from .base_extractor import GenericAPIExtractor
@@ -22,15 +22,33 @@ class BenditoAPIExtractor(GenericAPIExtractor):
         - token (str): Token de autenticação para a API Bendito.
     """
 
-    def __init__(self, table):
+    MAX_WORKERS = 4
+    PARTITIONS_PER_WORKER = 4
+    # A API do BI não publica um limite; a taxa parte de 5 req/s e se ajusta às respostas 429/503
+    REQUESTS_PER_SECOND = 5
+    MAX_REQUESTS_PER_SECOND = 20
+    BURST = MAX_WORKERS
+    # Linhas convertidas por vez ao ler o CSV de uma página
+    CSV_CHUNK_SIZE = 10000
+
+    def __init__(self, table, max_workers: int = None, partitions: int = None):
         """
         Inicializa um extrator para a API do Bendito.
         
         Args:
             table (DataTable): Objeto DataTable com as configurações da fonte
+            max_workers (int, optional): Quantidade de partições extraídas simultaneamente no modo 'partitioned'.
+            partitions (int, optional): Quantidade de faixas de chave no modo 'partitioned'.
         """
+        max_workers = max_workers or self.MAX_WORKERS
         # Definir o source diretamente - não usar kwargs para isso
-        super().__init__(table, token=os.environ.get("BENDITO_BI_TOKEN"))
+        super().__init__(
+            table,
+            token=os.environ.get("BENDITO_BI_TOKEN"),
+            pool_size=max(self.DEFAULT_POOL_SIZE, max_workers),
+        )
+        self.max_workers = max_workers
+        self.partitions = partitions or max_workers * self.PARTITIONS_PER_WORKER
 
     def _get_endpoint(self) -> str:
         """
@@ -53,23 +71,98 @@ class BenditoAPIExtractor(GenericAPIExtractor):
             "Content-Type": "application/json",
         }
 
-    def post_data(self, payload):
+    def post_data(self, payload, stream: bool = False):
         """
         Método para enviar dados para a API.
 
         Args:
             payload: Dados a serem enviados para a API
+            stream (bool): Se True, o corpo da resposta não é baixado de imediato.
 
         Returns:
             Response: Resposta da API
+
+        Raises:
+            requests.HTTPError: Se a API responder com erro, para que o corpo do erro não seja lido como CSV.
         """
         endpoint = self._get_endpoint()
-        headers = self._get_headers()
-        response = requests.post(url=endpoint, headers=headers, data=payload)
+        response = self._request("post", endpoint, data=payload, stream=stream)
         if response.status_code != 200:
             logger.error(f"{__name__}: {response.text}")
+            response.close()
+            response.raise_for_status()
         return response
 
+    def _read_page(self, query_string):
+        """
+        Executa uma consulta na API Bendito e converte a resposta CSV em DataFrame.
+
+        Args:
+            query_string (str): A consulta completa, já paginada.
+
+        Returns:
+            pd.DataFrame: Os registros da página, com todas as colunas como texto.
+        """
+        return self._concat_chunks(self._iter_page_chunks(query_string))
+
+    async def _aread_page(self, query_string):
+        """
+        Equivalente assíncrono de _read_page().
+
+        Args:
+            query_string (str): A consulta completa, já paginada.
+
+        Returns:
+            pd.DataFrame: Os registros da página, com todas as colunas como texto.
+        """
+        payload = json.dumps({"query": query_string, "separator": ";"})
+        response = await self._arequest("post", self._get_endpoint(), data=payload)
+        if response.status_code != 200:
+            logger.error(f"{__name__}: {response.text}")
+            response.raise_for_status()
+        return self._concat_chunks(self._iter_csv_chunks(io.BytesIO(response.content)))
+
+    @staticmethod
+    def _concat_chunks(chunks):
+        chunks = list(chunks)
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
+
+    def _iter_csv_chunks(self, binary_stream):
+        """
+        Lê um CSV da API em blocos a partir de um stream de bytes.
+
+        Os bytes são decodificados uma única vez como UTF-8 enquanto são lidos, sem
+        carregar o corpo inteiro em memória como texto. A quebra de linha "\r\n" da
+        API é normalizada pela leitura em modo de nova linha universal.
+
+        Args:
+            binary_stream: Stream de bytes com o CSV.
+
+        Yields:
+            pd.DataFrame: Blocos de até CSV_CHUNK_SIZE registros.
+        """
+        csv_file = io.TextIOWrapper(binary_stream, encoding="utf-8", newline=None)
+        with pd.read_csv(csv_file, sep=";", dtype=str, chunksize=self.CSV_CHUNK_SIZE) as reader:
+            yield from reader
+
+    def _iter_page_chunks(self, query_string):
+        """
+        Lê a resposta CSV de uma consulta diretamente do stream da resposta, em blocos.
+
+        Args:
+            query_string (str): A consulta completa, já paginada.
+
+        Yields:
+            pd.DataFrame: Blocos de até CSV_CHUNK_SIZE registros da página.
+        """
+        payload = json.dumps({"query": query_string, "separator": ";"})
+        with self.post_data(payload, stream=True) as response:
+            # Descompacta gzip/deflate de forma transparente ao ler o stream
+            response.raw.decode_content = True
+            yield from self._iter_csv_chunks(response.raw)
+
     def fetch_paginated(self, query, page_size):
         """
         Obtém dados paginados da API Bendito.
@@ -90,13 +183,7 @@ class BenditoAPIExtractor(GenericAPIExtractor):
         logger.info(f"{__name__}: Obtendo página {page + 1} de {query}")
         while True:
             query_string = f"{query} LIMIT {page_size} OFFSET {offset}"
-            payload = json.dumps({"query": query_string, "separator": ";"})
-            response = self.post_data(payload)
-            response_text = (
-                response.text.replace("\r", "").encode("latin1").decode("utf-8")
-            )
-            csv_file = StringIO(response_text)
-            dataframe = pd.read_csv(csv_file, sep=";", encoding="utf-8", dtype=str)
+            dataframe = self._read_page(query_string)
 
             response_len = dataframe.shape[0]
             results += response_len
@@ -109,6 +196,222 @@ class BenditoAPIExtractor(GenericAPIExtractor):
             if response_len < page_size:
                 break
 
+    async def afetch_paginated(self, query, page_size):
+        """
+        Equivalente assíncrono de fetch_paginated().
+
+        Args:
+            query (str): A consulta a ser realizada na API.
+            page_size (int): O número de registros por página.
+
+        Yields:
+            pd.DataFrame: Os dados extraídos de cada página.
+        """
+        offset = 0
+        logger.info(f"{__name__}: Obtendo páginas de {query}")
+        while True:
+            dataframe = await self._aread_page(f"{query} LIMIT {page_size} OFFSET {offset}")
+            offset += page_size
+            yield dataframe
+            if dataframe.shape[0] < page_size:
+                break
+
+    def fetch_keyset_paginated(self, page_size, lower=None, upper=None):
+        """
+        Obtém dados paginados da API Bendito usando paginação por chave (seek).
+
+        Ao invés de LIMIT/OFFSET, cada página filtra pelos registros com chave maior
+        que a última chave recebida, evitando que o banco de origem percorra e descarte
+        as linhas das páginas anteriores a cada requisição.
+
+        Args:
+            page_size (int): O número de registros por página.
+            lower (int, optional): Limite inferior (inclusivo) da faixa de chaves.
+            upper (int, optional): Limite superior (exclusivo) da faixa de chaves.
+
+        Yields:
+            pd.DataFrame: Um gerador que produz DataFrames com os dados extraídos de cada página.
+        """
+        key = self.table.unique_id_property
+        last_key = None
+        page = 0
+        while True:
+            query_string = f"{self.get_keyset_query(last_key, lower, upper)} LIMIT {page_size}"
+            logger.info(f"{__name__}: Obtendo página {page + 1} de {self.table.source_name} por {key}")
+            dataframe = self._read_page(query_string)
+
+            if key not in dataframe.columns:
+                raise ValueError(
+                    f"Coluna de chave '{key}' não encontrada em {self.table.source_name}"
+                )
+
+            page += 1
+            yield dataframe
+
+            if dataframe.shape[0] < page_size:
+                break
+            last_key = dataframe[key].iloc[-1]
+
+    async def afetch_keyset_paginated(self, page_size, lower=None, upper=None):
+        """
+        Equivalente assíncrono de fetch_keyset_paginated().
+
+        Args:
+            page_size (int): O número de registros por página.
+            lower (int, optional): Limite inferior (inclusivo) da faixa de chaves.
+            upper (int, optional): Limite superior (exclusivo) da faixa de chaves.
+
+        Yields:
+            pd.DataFrame: Os dados extraídos de cada página.
+        """
+        key = self.table.unique_id_property
+        last_key = None
+        page = 0
+        while True:
+            query_string = f"{self.get_keyset_query(last_key, lower, upper)} LIMIT {page_size}"
+            logger.info(f"{__name__}: Obtendo página {page + 1} de {self.table.source_name} por {key}")
+            dataframe = await self._aread_page(query_string)
+
+            if key not in dataframe.columns:
+                raise ValueError(
+                    f"Coluna de chave '{key}' não encontrada em {self.table.source_name}"
+                )
+
+            page += 1
+            yield dataframe
+
+            if dataframe.shape[0] < page_size:
+                break
+            last_key = dataframe[key].iloc[-1]
+
+    def _get_key_range_query(self):
+        key = self.table.unique_id_property
+        return (
+            f'select min("{key}") as min_key, max("{key}") as max_key '
+            f'from public."{self.table.source_name}" where {self._get_filters()}'
+        )
+
+    @staticmethod
+    def _parse_key_range(dataframe):
+        if dataframe.empty:
+            return None
+        try:
+            return int(dataframe["min_key"].iloc[0]), int(dataframe["max_key"].iloc[0])
+        except (TypeError, ValueError):
+            return None
+
+    def get_key_range(self):
+        """
+        Consulta os valores mínimo e máximo da chave da tabela, respeitando os filtros da extração.
+
+        Returns:
+            tuple[int, int] | None: O intervalo da chave, ou None se a tabela estiver vazia
+            ou a chave não for numérica.
+        """
+        return self._parse_key_range(self._read_page(self._get_key_range_query()))
+
+    async def aget_key_range(self):
+        """
+        Equivalente assíncrono de get_key_range().
+        """
+        return self._parse_key_range(await self._aread_page(self._get_key_range_query()))
+
+    def get_partitions(self, min_key, max_key):
+        """
+        Divide o intervalo de chaves em faixas disjuntas e contíguas.
+
+        Args:
+            min_key (int): Menor chave da tabela.
+            max_key (int): Maior chave da tabela.
+
+        Returns:
+            list[tuple[int, int]]: Faixas no formato (inclusivo, exclusivo).
+        """
+        span = max_key - min_key + 1
+        partitions = max(1, min(self.partitions, span))
+        step = -(-span // partitions)  # Divisão com arredondamento para cima
+        return [
+            (lower, min(lower + step, max_key + 1))
+            for lower in range(min_key, max_key + 1, step)
+        ]
+
+    def fetch_partitioned(self, page_size):
+        """
+        Obtém os dados da tabela em faixas de chave extraídas em paralelo.
+
+        O intervalo [min, max] da chave é dividido em faixas disjuntas, e cada faixa é
+        percorrida com paginação por chave em uma thread própria, até max_workers
+        simultâneas. As páginas são produzidas à medida que as faixas as recebem, através
+        de uma fila limitada (ver iter_concurrent), sem acumular as faixas em memória.
+        Caso a chave não seja numérica, a extração é sequencial.
+
+        Args:
+            page_size (int): O número de registros por página.
+
+        Yields:
+            pd.DataFrame: As páginas de todas as faixas, intercaladas.
+        """
+        key_range = self.get_key_range()
+        if key_range is None:
+            logger.warning(
+                f"{__name__}: Chave {self.table.unique_id_property} de {self.table.source_name} sem intervalo numérico, extraindo sem partições."
+            )
+            yield from self.fetch_keyset_paginated(page_size)
+            return
+
+        partitions = self.get_partitions(*key_range)
+        logger.info(
+            f"{__name__}: Extraindo {self.table.source_name} em {len(partitions)} partições com {self.max_workers} workers"
+        )
+        yield from self.iter_concurrent(
+            lambda bounds: self.fetch_keyset_paginated(page_size, *bounds),
+            partitions,
+            self.max_workers,
+            thread_name_prefix=f"bendito_{self.table.source_name}",
+        )
+
+    async def afetch_partitioned(self, page_size):
+        """
+        Equivalente assíncrono de fetch_partitioned(), com as faixas percorridas como corrotinas.
+
+        No máximo max_workers faixas ficam em andamento ao mesmo tempo.
+
+        Args:
+            page_size (int): O número de registros por página.
+
+        Yields:
+            pd.DataFrame: As páginas de todas as faixas, intercaladas.
+        """
+        key_range = await self.aget_key_range()
+        if key_range is None:
+            logger.warning(
+                f"{__name__}: Chave {self.table.unique_id_property} de {self.table.source_name} sem intervalo numérico, extraindo sem partições."
+            )
+            pages = self.afetch_keyset_paginated(page_size)
+        else:
+            pages = self.aiter_concurrent(
+                lambda bounds: self.afetch_keyset_paginated(page_size, *bounds),
+                self.get_partitions(*key_range),
+                self.max_workers,
+            )
+        async for page in pages:
+            yield page
+
+    def _get_filters(self):
+        """
+        Monta os filtros comuns às consultas da tabela.
+
+        Returns:
+            str: Condições do WHERE, iniciando por 'true'.
+        """
+        filters = "true"
+        watermark = self.table.get_watermark()
+        if watermark and self.table.updated_at_property:
+            filters += f" and {self.table.updated_at_property} >= '{watermark.isoformat(sep=' ', timespec='seconds')}'::timestamptz"
+        elif self.table.days_interval > 0:
+            filters += f" and {self.table.updated_at_property} >= current_date - {self.table.days_interval} days"
+        return filters
+
     def get_query(self):
         """
         Builds the SQL query for the Bendito API.
@@ -116,41 +419,85 @@ class BenditoAPIExtractor(GenericAPIExtractor):
         Returns:
             str: SQL query string
         """
-        query = f'select * from public."{self.table.source_name}" where true'
-        if self.table.days_interval > 0:
-            query += f" and {self.table.updated_at_property} >= current_date - {self.table.days_interval} days"
+        query = f'select * from public."{self.table.source_name}" where {self._get_filters()}'
         query += " order by 1 asc"
         return query
 
-    def run(self, page_size=1000):
+    def get_keyset_query(self, last_key=None, lower=None, upper=None):
         """
-        Executa a rotina principal do extrator, consolidando os dados extraídos.
+        Builds the keyset paginated SQL query for the Bendito API, ordered by unique_id_property.
+
+        Args:
+            last_key (str, optional): Last key received on the previous page
+            lower (int, optional): Inclusive lower bound of the key range
+            upper (int, optional): Exclusive upper bound of the key range
+
+        Returns:
+            str: SQL query string, without LIMIT
+        """
+        key = self.table.unique_id_property
+        query = f'select * from public."{self.table.source_name}" where {self._get_filters()}'
+        if lower is not None:
+            query += f' and "{key}" >= {int(lower)}'
+        if upper is not None:
+            query += f' and "{key}" < {int(upper)}'
+        if last_key is not None:
+            quoted_key = str(last_key).replace("'", "''")
+            query += f' and "{key}" > \'{quoted_key}\''
+        query += f' order by "{key}" asc'
+        return query
+
+    def _get_pages(self, page_size):
+        """
+        Seleciona a estratégia de paginação conforme a configuração da tabela.
 
         Args:
             page_size (int): Page size for pagination
 
         Returns:
-            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+            Iterable[pd.DataFrame]: As páginas da tabela.
         """
-        query = self.get_query()
-        records = list(
-            self.fetch_paginated(query, page_size)
-        )
+        # Paginação por chave quando a tabela possui chave única configurada
+        if self.table.unique_id_property and self.table.extraction_strategy == "partitioned":
+            return self.fetch_partitioned(page_size)
+        elif self.table.unique_id_property:
+            return self.fetch_keyset_paginated(page_size)
+        return self.fetch_paginated(self.get_query(), page_size)
+
+    async def _aget_pages(self, page_size):
+        """
+        Equivalente assíncrono de _get_pages().
 
-        if not records:
-            return pd.DataFrame(columns=["ID", "SUCCESS", "CONTENT"])
-            
-        df = pd.concat(records, ignore_index=True)
+        Yields:
+            pd.DataFrame: As páginas da tabela.
+        """
+        if self.table.unique_id_property and self.table.extraction_strategy == "partitioned":
+            pages = self.afetch_partitioned(page_size)
+        elif self.table.unique_id_property:
+            pages = self.afetch_keyset_paginated(page_size)
+        else:
+            pages = self.afetch_paginated(self.get_query(), page_size)
+        async for page in pages:
+            yield page
 
-        logger.info(f"{__name__}: Fim da extração.")
+    def _to_records(self, df, start=0):
+        """
+        Converte uma página da API no formato ID/SUCCESS/CONTENT.
+
+        Args:
+            df (pd.DataFrame): Página com as colunas da tabela de origem.
+            start (int): Posição da página na extração, usada como ID quando não há coluna 'id'.
 
+        Returns:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
         # Verificando se existe uma coluna 'id' no DataFrame
         if "id" in df.columns:
             # Usando a coluna 'id' como ID
             id_column = df["id"].astype(str)
         else:
-            # Se não existir coluna 'id', usar o índice
-            id_column = df.index.astype(str)
+            # Se não existir coluna 'id', usar a posição do registro na extração
+            id_column = (df.index + start).astype(str)
 
         # Abordagem altamente otimizada usando to_json
         # Convertendo o DataFrame para JSON em formato de registros
@@ -171,8 +518,61 @@ class BenditoAPIExtractor(GenericAPIExtractor):
             id_column = id_column[:min_length]
 
         # Criando o DataFrame de resultado com operações vetorizadas
-        result_df = pd.DataFrame(
-            {"ID": id_column, "SUCCESS": True, "CONTENT": json_records}
+        return self.to_record_frame(
+            {"ID": list(id_column), "SUCCESS": "True", "CONTENT": json_records}
         )
 
-        return result_df.astype(str)
+    def iter_batches(self, page_size=1000):
+        """
+        Produz os dados da tabela página a página, já no formato ID/SUCCESS/CONTENT.
+
+        Args:
+            page_size (int): Page size for pagination
+
+        Yields:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        extracted = 0
+        for page in self._get_pages(page_size):
+            if page.empty:
+                continue
+            yield self._to_records(page.reset_index(drop=True), start=extracted)
+            extracted += len(page)
+
+        logger.info(f"{__name__}: Fim da extração.")
+
+    async def aiter_batches(self, page_size=1000):
+        """
+        Equivalente assíncrono de iter_batches().
+
+        Args:
+            page_size (int): Page size for pagination
+
+        Yields:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        extracted = 0
+        async for page in self._aget_pages(page_size):
+            if page.empty:
+                continue
+            yield self._to_records(page.reset_index(drop=True), start=extracted)
+            extracted += len(page)
+
+        logger.info(f"{__name__}: Fim da extração.")
+
+    def run(self, page_size=1000):
+        """
+        Executa a rotina principal do extrator, consolidando os dados extraídos.
+
+        Args:
+            page_size (int): Page size for pagination
+
+        Returns:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        records = list(self.iter_batches(page_size))
+
+        if not records:
+            return self.to_record_frame()
+
+        return pd.concat(records, ignore_index=True)
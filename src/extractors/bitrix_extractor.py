@@ -3,12 +3,12 @@ import datetime
 import json
 import logging
 import os
-import requests
 import pandas as pd
+from urllib.parse import quote
 from dotenv import load_dotenv
-import time
-import random
-from bdt_data_integration.src.extractors.base_extractor import GenericAPIExtractor
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .base_extractor import GenericAPIExtractor
 
 load_dotenv()
 
@@ -25,18 +25,32 @@ class BitrixAPIExtractor(GenericAPIExtractor):
         - bitrix_user_id (str): ID do usuário Bitrix.
     """
 
-    def __init__(self, table):
+    # Limite de sub-comandos aceitos pelo endpoint batch.json do Bitrix24
+    BATCH_SIZE = 50
+    # O Bitrix24 drena 2 requisições por segundo de um balde de 50; planos Enterprise permitem até 5
+    REQUESTS_PER_SECOND = 2
+    MAX_REQUESTS_PER_SECOND = 5
+    BURST = 50
+    MAX_WORKERS = 4
+
+    def __init__(self, table, max_workers: int = None):
         """
         Inicializa um extrator para a API do Bitrix24.
 
         Args:
-            *args: Argumentos posicionais para a classe pai.
-            **kwargs: Argumentos nomeados, incluindo 'token', 'bitrix_url', 'bitrix_user_id' e 'writer'.
+            table (DataTable): Objeto DataTable com as configurações da fonte
+            max_workers (int, optional): Quantidade de requisições de detalhe simultâneas.
         """
         # Forçar que o source seja sempre 'bitrix', independente do que foi passado
-        super().__init__(table, token=os.environ.get("BITRIX_TOKEN"))
+        max_workers = max_workers or self.MAX_WORKERS
+        super().__init__(
+            table,
+            token=os.environ.get("BITRIX_TOKEN"),
+            pool_size=max(self.DEFAULT_POOL_SIZE, max_workers),
+        )
         self.base_url = os.environ.get("BITRIX_URL")
         self.user_id = os.environ.get("BITRIX_USER_ID")
+        self.max_workers = max_workers
 
     def _get_endpoint(self):
         return None
@@ -56,11 +70,50 @@ class BitrixAPIExtractor(GenericAPIExtractor):
     def _raw_url(self) -> str:
         return self._base_endpoint() + f"{self.table.source_identifier}"
 
+    def _batch_url(self) -> str:
+        return self._base_endpoint() + "batch.json"
+
+    def _get_command(self, object_id) -> str:
+        return f"{self.table.source_identifier}.get?ID={object_id}"
+
+    def _map_concurrently(self, func, items):
+        """
+        Aplica func a cada item usando um pool de até max_workers threads.
+
+        A taxa de requisições é controlada pelo rate_limiter compartilhado, então
+        o pool apenas mantém várias requisições em andamento ao mesmo tempo.
+
+        Returns:
+            list: Os resultados, na mesma ordem dos itens.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"bitrix_{self.table.source_name}",
+        ) as executor:
+            return list(executor.map(func, items))
+
+    async def _amap_concurrently(self, func, items):
+        """
+        Equivalente assíncrono de _map_concurrently(), com até max_workers corrotinas em andamento.
+
+        Returns:
+            list: Os resultados, na mesma ordem dos itens.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*map(call, items))
+
     def fetch_paginated(self, url, start=0):
         start = 0
         while True:
             params = {"start": start}
-            response = requests.get(url, params=params)
+            response = self._request("get", url, params=params)
             response.raise_for_status
             if response.status_code != 200:
                 raise Exception(
@@ -73,140 +126,408 @@ class BitrixAPIExtractor(GenericAPIExtractor):
             else:
                 break
 
-    def fetch_list(self):
-        records = []
+    async def afetch_paginated(self, url, start=0):
+        """
+        Equivalente assíncrono de fetch_paginated().
+
+        Yields:
+            list: O campo 'result' de cada página.
+        """
+        start = 0
+        while True:
+            response = await self._arequest("get", url, params={"start": start})
+            if response.status_code != 200:
+                raise Exception(
+                    f"Error: {response.status_code} - {response.text} for {url}"
+                )
+            data = response.json()
+            yield data.get("result")
+            if data.get("next"):
+                start = data.get("next")
+            else:
+                break
+
+    def _filtered_list_url(self):
+        """
+        Monta a URL do endpoint '<entidade>.list' com o filtro da extração incremental.
+        """
         url = self._list_url()
         days = self.table.days_interval
-        if days > 0 and self.table.updated_at_property:
+        watermark = self.table.get_watermark()
+        if watermark and self.table.updated_at_property:
+            # ISO 8601 com o offset explícito; o '+' do offset precisa ser codificado na URL
+            url += f"?FILTER[>{self.table.updated_at_property}]={quote(watermark.isoformat(timespec='seconds'))}"
+        elif days > 0 and self.table.updated_at_property:
             url += f"?FILTER[>{self.table.updated_at_property}]={(datetime.datetime.now() - datetime.timedelta(days)).strftime('%Y-%m-%d')}"
+        return url
 
-        for response in self.fetch_paginated(url, start=0):
-            if isinstance(response, list):
-                if len(response) > 0:
-                    if isinstance(response[0], dict):
-                        records.extend(response)
-                    else:
-                        raise Exception("Invalid Result Format")
-                else:
-                    logger.info(
-                        f"Nenhum dado foi encontrado em {self.table.source_identifier}"
-                    )
-                    break
-            else:
-                print(type(response))
-                raise Exception("Invalid Result Format")
+    def _is_list_page(self, response):
+        """
+        Valida o 'result' de uma página do endpoint '<entidade>.list'.
+
+        Returns:
+            bool: True se a página contém registros, False se está vazia.
+        """
+        if not isinstance(response, list):
+            raise Exception("Invalid Result Format")
+        if len(response) == 0:
+            logger.info(
+                f"Nenhum dado foi encontrado em {self.table.source_identifier}"
+            )
+            return False
+        if not isinstance(response[0], dict):
+            raise Exception("Invalid Result Format")
+        return True
+
+    def iter_list_pages(self):
+        """
+        Produz os registros do endpoint '<entidade>.list' página a página, como retornados pela API.
+
+        Yields:
+            list[dict]: Os registros de uma página, com seus valores originais.
+        """
+        for response in self.fetch_paginated(self._filtered_list_url(), start=0):
+            if not self._is_list_page(response):
+                break
+            yield response
+
+    async def aiter_list_pages(self):
+        """
+        Equivalente assíncrono de iter_list_pages().
+
+        Yields:
+            list[dict]: Os registros de uma página, com seus valores originais.
+        """
+        async for response in self.afetch_paginated(self._filtered_list_url(), start=0):
+            if not self._is_list_page(response):
+                break
+            yield response
+
+    def fetch_list(self):
+        records = []
+        for page in self.iter_list_pages():
+            records.extend(page)
+        return pd.DataFrame(records, dtype=str)
+
+    async def afetch_list(self):
+        records = []
+        async for page in self.aiter_list_pages():
+            records.extend(page)
         return pd.DataFrame(records, dtype=str)
 
+    def _list_page_to_records(self, page, start=0):
+        """
+        Converte uma página do endpoint '<entidade>.list' no formato ID/SUCCESS/CONTENT.
+
+        O CONTENT é serializado diretamente de cada dicionário da API, preservando os
+        tipos originais dos valores.
+
+        Args:
+            page (list[dict]): Registros da página.
+            start (int): Posição da página na extração, usada como ID quando o registro não tem 'ID'.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns ID, SUCCESS, and CONTENT
+        """
+        return self.to_record_frame(
+            {
+                "ID": [str(record.get("ID", start + i)) for i, record in enumerate(page)],
+                "SUCCESS": "True",
+                "CONTENT": [json.dumps(record) for record in page],
+            }
+        )
+
+    def _iter_list_batches(self):
+        start = 0
+        for page in self.iter_list_pages():
+            yield self._list_page_to_records(page, start)
+            start += len(page)
+
+    async def _aiter_list_batches(self):
+        start = 0
+        async for page in self.aiter_list_pages():
+            yield self._list_page_to_records(page, start)
+            start += len(page)
+
+    def fetch_detail(self, object_id):
+        """
+        Obtém o detalhe de um registro através do endpoint '<entidade>.get.json'.
+
+        Args:
+            object_id: ID do registro.
+
+        Returns:
+            dict: Registro no formato ID/SUCCESS/CONTENT.
+        """
+        url = self._get_url(object_id)
+        return self._detail_to_record(object_id, url, self._request("get", url))
+
+    async def afetch_detail(self, object_id):
+        """
+        Equivalente assíncrono de fetch_detail().
+
+        Returns:
+            dict: Registro no formato ID/SUCCESS/CONTENT.
+        """
+        url = self._get_url(object_id)
+        return self._detail_to_record(
+            object_id, url, await self._arequest("get", url)
+        )
+
+    def _detail_to_record(self, object_id, url, response):
+        """
+        Converte a resposta do endpoint '<entidade>.get.json' em um registro ID/SUCCESS/CONTENT.
+
+        Args:
+            object_id: ID do registro.
+            url (str): URL requisitada.
+            response: Resposta da API (requests.Response ou BufferedResponse).
+
+        Returns:
+            dict: Registro no formato ID/SUCCESS/CONTENT.
+        """
+        try:
+            # Tenta converter a resposta em JSON
+            json_data = response.json()
+
+            # Verifica se a chave 'result' existe na resposta JSON
+            if "result" in json_data:
+                return {
+                    "ID": object_id,
+                    "SUCCESS": True,
+                    "CONTENT": json.dumps(json_data["result"]),
+                }
+            # Caso não tenha a chave 'result', armazena um erro estruturado
+            return {
+                "ID": object_id,
+                "SUCCESS": False,
+                "CONTENT": json.dumps(
+                    {
+                        "ERROR": 'Chave "result" não encontrada na resposta',
+                        "URL": f"{url}",
+                        "STATUS_CODE": response.status_code,
+                    }
+                ),
+            }
+        except ValueError:
+            # Caso o conteúdo não seja um JSON válido, armazena um erro estruturado
+            return {
+                "ID": object_id,
+                "SUCCESS": False,
+                "CONTENT": json.dumps({"ERROR": "JSON Inválido", "DATA": response.text}),
+            }
+
+    def _fetch_details(self, object_ids):
+        """
+        Obtém o detalhe de uma lista de IDs com uma chamada por ID.
+
+        Returns:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        records = self._map_concurrently(self.fetch_detail, object_ids)
+        return self.to_record_frame(records)
+
+    async def _afetch_details(self, object_ids):
+        records = await self._amap_concurrently(self.afetch_detail, object_ids)
+        return self.to_record_frame(records)
+
     def extract_as_table(self):
         list_data = self.fetch_list()
         if list_data.empty:
-            return pd.DataFrame(columns=["ID", "SUCCESS", "CONTENT"])
-        results = pd.DataFrame(list_data["ID"])
-        results["SUCCESS"] = None
-        results["CONTENT"] = None
-
-        max_retries = 5
-        for i, object_id in enumerate(results["ID"]):
-            url = self._get_url(object_id)
-
-            retry_count = 0
-            backoff_time = 1  # Initial backoff time in seconds
-
-            while True:
-                response = requests.get(url)
-
-                # Check for rate limiting (429) or service unavailable (503)
-                if response.status_code in {429, 503}:
-
-                    retry_count += 1
-                    if retry_count <= max_retries:
-                        # Log the retry attempt
-                        logger.warning(
-                            f"Received {response.status_code} error. Retrying in {backoff_time} seconds (attempt {retry_count}/{max_retries})..."
-                        )
-                        time.sleep(backoff_time)
-                        # Exponential backoff with jitter
-                        backoff_time = min(30, backoff_time * 2) + random.uniform(0, 1)
-                        continue
-                    else:
-                        # Max retries reached - log and continue with the error response
-                        logger.error(
-                            f"Max retries reached after {response.status_code} errors for URL: {url}"
-                        )
-
-                # Break the retry loop once we have a response (either successful or failed after max retries)
-                break
+            return self.to_record_frame()
+
+        return self._fetch_details(list_data["ID"].tolist())
+
+    def fetch_batch(self, object_ids):
+        """
+        Obtém o detalhe de até BATCH_SIZE registros em uma única chamada ao batch.json.
+
+        Cada ID gera um sub-comando '<entidade>.get?ID=<id>'. Os resultados são
+        distribuídos de volta por ID, preservando os erros individuais de cada registro.
+
+        Args:
+            object_ids (list): IDs dos registros a serem obtidos.
+
+        Returns:
+            list[dict]: Registros no formato ID/SUCCESS/CONTENT.
+        """
+        url = self._batch_url()
+        commands = self._batch_commands(object_ids)
+        response = self._request("post", url, json={"halt": 0, "cmd": commands})
+        return self._batch_to_records(commands, url, response)
+
+    async def afetch_batch(self, object_ids):
+        """
+        Equivalente assíncrono de fetch_batch().
+
+        Returns:
+            list[dict]: Registros no formato ID/SUCCESS/CONTENT.
+        """
+        url = self._batch_url()
+        commands = self._batch_commands(object_ids)
+        response = await self._arequest(
+            "post", url, json={"halt": 0, "cmd": commands}
+        )
+        return self._batch_to_records(commands, url, response)
+
+    def _batch_commands(self, object_ids):
+        return {str(object_id): self._get_command(object_id) for object_id in object_ids}
+
+    def _batch_to_records(self, commands, url, response):
+        """
+        Distribui a resposta do batch.json entre os IDs dos sub-comandos.
+
+        Args:
+            commands (dict): Sub-comandos enviados, indexados pelo ID.
+            url (str): URL requisitada.
+            response: Resposta da API (requests.Response ou BufferedResponse).
+
+        Returns:
+            list[dict]: Registros no formato ID/SUCCESS/CONTENT.
+        """
+        try:
+            json_data = response.json()
+        except ValueError:
+            json_data = None
+
+        batch_result = json_data.get("result") if isinstance(json_data, dict) else None
+        if not isinstance(batch_result, dict):
+            # A chamada inteira falhou, todos os IDs do lote recebem o mesmo erro
+            error = {
+                "ERROR": "Resposta inválida do batch.json",
+                "URL": url,
+                "STATUS_CODE": response.status_code,
+                "DATA": response.text,
+            }
+            return [
+                {"ID": key, "SUCCESS": False, "CONTENT": json.dumps({**error, "COMMAND": command})}
+                for key, command in commands.items()
+            ]
 
-            try:
-                # Tenta converter a resposta em JSON
-                json_data = response.json()
-
-                # Verifica se a chave 'result' existe na resposta JSON
-                if "result" in json_data:
-                    results.at[i, "CONTENT"] = json.dumps(json_data["result"])
-                    results.at[i, "SUCCESS"] = True
-                else:
-                    # Caso não tenha a chave 'result', armazena um erro estruturado
-                    results.at[i, "SUCCESS"] = False
-                    results.at[i, "CONTENT"] = json.dumps(
-                        {
-                            "ERROR": 'Chave "result" não encontrada na resposta',
-                            "URL": f"{url}",
-                            "STATUS_CODE": response.status_code,
-                        }
-                    )
-            except ValueError:
-                # Caso o conteúdo não seja um JSON válido, armazena um erro estruturado
-                results.at[i, "CONTENT"] = json.dumps(
-                    {"ERROR": "JSON Inválido", "DATA": response.text}
+        # O Bitrix retorna listas vazias no lugar de objetos quando não há itens
+        results = batch_result.get("result") or {}
+        errors = batch_result.get("result_error") or {}
+
+        records = []
+        for key, command in commands.items():
+            if key in results and results[key] is not None:
+                records.append(
+                    {"ID": key, "SUCCESS": True, "CONTENT": json.dumps(results[key])}
+                )
+            else:
+                records.append(
+                    {
+                        "ID": key,
+                        "SUCCESS": False,
+                        "CONTENT": json.dumps(
+                            {
+                                "ERROR": errors.get(key, 'Chave "result" não encontrada na resposta'),
+                                "COMMAND": command,
+                                "STATUS_CODE": response.status_code,
+                            }
+                        ),
+                    }
                 )
-                results.at[i, "SUCCESS"] = False
+        return records
 
-        return pd.DataFrame(results, dtype=str)
+    def _batch_chunks(self, object_ids):
+        return [
+            object_ids[start : start + self.BATCH_SIZE]
+            for start in range(0, len(object_ids), self.BATCH_SIZE)
+        ]
+
+    def _fetch_batches(self, object_ids):
+        """
+        Obtém o detalhe de uma lista de IDs agrupando-os em chamadas ao batch.json.
+
+        Returns:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        chunks = self._batch_chunks(object_ids)
+        records = [
+            record
+            for chunk_records in self._map_concurrently(self.fetch_batch, chunks)
+            for record in chunk_records
+        ]
+        logger.debug(
+            f"{self.table.source_identifier}: {len(records)} registros obtidos em {len(chunks)} chamadas ao batch.json"
+        )
+
+        return self.to_record_frame(records)
+
+    async def _afetch_batches(self, object_ids):
+        chunks = self._batch_chunks(object_ids)
+        records = [
+            record
+            for chunk_records in await self._amap_concurrently(self.afetch_batch, chunks)
+            for record in chunk_records
+        ]
+        return self.to_record_frame(records)
+
+    def extract_as_batch(self):
+        """
+        Extrai os registros da tabela agrupando as chamadas de detalhe via batch.json.
+
+        Equivalente ao modo 'table', porém com uma chamada HTTP a cada BATCH_SIZE IDs
+        ao invés de uma chamada por ID.
+
+        Returns:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        list_data = self.fetch_list()
+        if list_data.empty:
+            return self.to_record_frame()
+
+        return self._fetch_batches(list_data["ID"].tolist())
 
     def extract_as_enum(self):  # We don't need /updated_at here
         url = self._raw_url()
-        response = requests.get(url)
+        response = self._request("get", url)
+        response.raise_for_status()
+        return self._enum_to_records(url, response.json())
+
+    async def aextract_as_enum(self):
+        url = self._raw_url()
+        response = await self._arequest("get", url)
         response.raise_for_status()
-        if response.json().get("result"):
+        return self._enum_to_records(url, response.json())
+
+    def _enum_to_records(self, url, json_data):
+        if json_data.get("result"):
             results = [
                 {
                     "ID": result.get("ID") or i,
                     "SUCCESS": True,
                     "CONTENT": json.dumps(result),
                 }
-                for i, result in enumerate(response.json()["result"])
+                for i, result in enumerate(json_data["result"])
             ]
-            return pd.DataFrame(results)
+            return self.to_record_frame(results)
         else:
             logger.warning(f"WARNING: Nenhum dado presente em {url}")
-            return pd.DataFrame(columns=["ID", "SUCCESS", "CONTENT"], dtype=str)
+            return self.to_record_frame()
 
     def extract_as_list(self):
-        list_data = self.fetch_list()
-
-        # Converter o DataFrame inteiro para JSON com tratamento de NaN
-        list_json = list_data.replace({pd.NA: None}).to_json(orient="records")
-        # Parsear de volta para ter uma lista de dicionários Python
-        list_records = json.loads(list_json)
-
-        data = [
-            {
-                "ID": str(record.get("ID", i)),
-                "CONTENT": json.dumps(record),
-                "SUCCESS": True,
-            }
-            for i, record in enumerate(list_records)
-        ]
-
-        return pd.DataFrame(data, dtype=str)
+        batches = list(self._iter_list_batches())
+        if not batches:
+            return self.to_record_frame()
+        return pd.concat(batches, ignore_index=True)
 
     def extract_as_fields(
         self
     ):  # We don't need days/updated_at here
-        url = self._base_endpoint() + "crm." + self.table.source_identifier
-        list_data = requests.get(url).json().get("result")
+        url = self._fields_url()
+        list_data = self._request("get", url).json().get("result")
+        return self._fields_to_records(list_data)
 
+    async def aextract_as_fields(self):
+        response = await self._arequest("get", self._fields_url())
+        return self._fields_to_records(response.json().get("result"))
+
+    def _fields_url(self):
+        return self._base_endpoint() + "crm." + self.table.source_identifier
+
+    def _fields_to_records(self, list_data):
         data = [
             {
                 "ID": int(key) if key.isdigit() else i,
@@ -216,14 +537,16 @@ class BitrixAPIExtractor(GenericAPIExtractor):
             for i, key in enumerate(list_data.keys())
         ]
 
-        return pd.DataFrame(data, dtype=str)
+        return self.to_record_frame(data)
 
     def get_extract_function(
-        self, extraction_stategy=("table", "enum", "endpoint", "list", "fields")
+        self, extraction_stategy=("table", "batch", "enum", "endpoint", "list", "fields")
     ):
         # sourcery skip: assign-if-exp, remove-redundant-if
         if extraction_stategy == "table":
             return self.extract_as_table
+        elif extraction_stategy == "batch":
+            return self.extract_as_batch
         elif extraction_stategy in ["endpoint", "enum"]:
             return self.extract_as_enum
         elif extraction_stategy == "list":
@@ -233,13 +556,78 @@ class BitrixAPIExtractor(GenericAPIExtractor):
         else:
             raise ValueError(f"Modo de extração inválido: {extraction_stategy}")
 
+    def iter_batches(self):
+        """
+        Produz os dados extraídos em lotes, à medida que são obtidos.
+
+        Nos modos 'table' e 'batch' os detalhes são obtidos e produzidos em blocos de
+        IDs, e no modo 'list' cada página da API é produzida assim que obtida, permitindo
+        que a carga comece antes do fim da extração. Os demais modos produzem um único lote.
+
+        Yields:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        strategy = self.table.extraction_strategy
+        if strategy == "table":
+            fetch_chunk, chunk_size = self._fetch_details, self.max_workers * 10
+        elif strategy == "batch":
+            fetch_chunk, chunk_size = self._fetch_batches, self.max_workers * self.BATCH_SIZE
+        elif strategy == "list":
+            yield from self._iter_list_batches()
+            return
+        else:
+            yield self.run()
+            return
+
+        list_data = self.fetch_list()
+        if list_data.empty:
+            return
+        object_ids = list_data["ID"].tolist()
+        for start in range(0, len(object_ids), chunk_size):
+            yield fetch_chunk(object_ids[start : start + chunk_size])
+
+    async def aiter_batches(self):
+        """
+        Equivalente assíncrono de iter_batches().
+
+        As requisições de detalhe de cada bloco de IDs são corrotinas concorrentes, até
+        max_workers em andamento, sempre limitadas pelo rate_limiter da origem.
+
+        Yields:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        strategy = self.table.extraction_strategy
+        if strategy == "table":
+            fetch_chunk, chunk_size = self._afetch_details, self.max_workers * 10
+        elif strategy == "batch":
+            fetch_chunk, chunk_size = self._afetch_batches, self.max_workers * self.BATCH_SIZE
+        elif strategy == "list":
+            async for batch in self._aiter_list_batches():
+                yield batch
+            return
+        elif strategy in ["endpoint", "enum"]:
+            yield await self.aextract_as_enum()
+            return
+        elif strategy == "fields":
+            yield await self.aextract_as_fields()
+            return
+        else:
+            raise ValueError(f"Modo de extração inválido: {strategy}")
+
+        list_data = await self.afetch_list()
+        if list_data.empty:
+            return
+        object_ids = list_data["ID"].tolist()
+        for start in range(0, len(object_ids), chunk_size):
+            yield await fetch_chunk(object_ids[start : start + chunk_size])
+
     def run(self):
         """
         Run the extraction with the specified mode.
 
         Args:
             endpoint_id: The Bitrix endpoint ID
-            mode: Extraction mode ('table', 'enum', 'endpoint', 'list', 'fields')
+            mode: Extraction mode ('table', 'batch', 'enum', 'endpoint', 'list', 'fields')
             days: Number of days to look back (optional)
             updated_at: Name of the updated_at column in Bitrix (optional)
 
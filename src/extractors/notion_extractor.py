@@ -1,16 +1,23 @@
 import os
+import re
 import json
 import logging
-import requests
 import pandas as pd
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from .base_extractor import GenericAPIExtractor
+from utils.utils import Utils
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Propriedades lidas pelos modelos dbt através de: WHERE value ->> 'id' = '<id>'
+_PROPERTY_ID_PATTERN = re.compile(r"value\s*->>\s*'id'\s*=\s*'([^']+)'")
+_PROPERTIES_EACH_PATTERN = re.compile(r"jsonb_each\s*\(\s*\"CONTENT\"\s*->\s*'properties'\s*\)")
+# Propriedades lidas pelo nome, que não podem ser convertidas em IDs
+_PROPERTY_NAME_PATTERN = re.compile(r"'properties'\s*->>?\s*'")
+
 
 class NotionDatabaseAPIExtractor(GenericAPIExtractor):
     """
@@ -22,16 +29,102 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
         - token (str): Bearer Token da conta conectada à integração.
     """
 
-    def __init__(self, table):
+    # O Notion permite em média 3 requisições por segundo por integração
+    REQUESTS_PER_SECOND = 3
+    BURST = 3
+    MAX_WORKERS = 3
+    SLICES_PER_WORKER = 4
+    # Maior page_size aceito pelo endpoint de consulta do Notion
+    MAX_PAGE_SIZE = 100
+    NOTION_VERSION = os.environ.get("NOTION_VERSION", "2021-08-16")
+
+    def __init__(self, table, max_workers: int = None, slices: int = None):
         """
         Inicializa um extrator para a API do Notion.
 
         Args:
             table (DataTable): Objeto DataTable com as configurações da fonte
+            max_workers (int, optional): Quantidade de janelas extraídas simultaneamente no modo 'sliced'.
+            slices (int, optional): Quantidade de janelas de created_time no modo 'sliced'.
         """
         token = os.environ.get("NOTION_APIKEY")
-        super().__init__(table, token=token)
+        max_workers = max_workers or self.MAX_WORKERS
+        super().__init__(
+            table, token=token, pool_size=max(self.DEFAULT_POOL_SIZE, max_workers)
+        )
         self.base_url = "https://api.notion.com/v1/databases"
+        self.max_workers = max_workers
+        self.slices = slices or max_workers * self.SLICES_PER_WORKER
+        self.page_size = min(self.MAX_PAGE_SIZE, table.page_size or self.MAX_PAGE_SIZE)
+        self.filter_properties = self.get_filter_properties()
+
+    def get_filter_properties(self):
+        """
+        Obtém os IDs das propriedades retornadas pela API, a partir de table.filter_properties.
+
+        Aceita uma lista de IDs separados por vírgula, ou 'auto' para usar as propriedades
+        lidas pelos modelos dbt que consultam a tabela raw.
+
+        Returns:
+            list[str]: Os IDs das propriedades, ou None para retornar todas.
+        """
+        value = self.table.filter_properties
+        if not value:
+            return None
+        if isinstance(value, str):
+            if value.strip().lower() == "auto":
+                return self.get_model_property_ids()
+            value = value.split(",")
+        return [item.strip() for item in value if item.strip()] or None
+
+    def get_model_property_ids(self, models_dir=None):
+        """
+        Levanta os IDs das propriedades lidas pelos modelos dbt da tabela raw.
+
+        Considera os modelos que referenciam source('<origem>', '<tabela raw>'). Se algum
+        deles percorre todas as propriedades ou as lê pelo nome, a projeção não é segura
+        e todas as propriedades continuam sendo extraídas.
+
+        Args:
+            models_dir (Path, optional): Diretório dos modelos da origem.
+
+        Returns:
+            list[str]: Os IDs das propriedades, ou None se não for possível restringi-las.
+        """
+        models_dir = models_dir or Utils.get_dbt_project_dir() / "models" / self.table.origin
+        source_pattern = re.compile(
+            r"source\(\s*['\"]%s['\"]\s*,\s*['\"]%s['\"]\s*\)"
+            % (re.escape(self.table.origin), re.escape(self.table.raw_model_name))
+        )
+        property_ids = []
+        for model_path in sorted(models_dir.glob("*.sql")):
+            sql = model_path.read_text()
+            if not source_pattern.search(sql):
+                continue
+            ids = _PROPERTY_ID_PATTERN.findall(sql)
+            if len(_PROPERTIES_EACH_PATTERN.findall(sql)) > len(ids) or _PROPERTY_NAME_PATTERN.search(sql):
+                logger.warning(
+                    f"{model_path.name} lê todas as propriedades de {self.table.raw_model_name}, extraindo sem filter_properties"
+                )
+                return None
+            property_ids.extend(ids)
+        return list(dict.fromkeys(property_ids)) or None
+
+    def _get_query_endpoint(self) -> str:
+        """
+        Obtém o endpoint de consulta com a projeção de propriedades, quando configurada.
+
+        Os IDs de propriedades já são codificados para URL, então são anexados sem nova codificação.
+
+        Returns:
+            str: O endpoint da consulta.
+        """
+        endpoint = self._get_endpoint()
+        if not self.filter_properties:
+            return endpoint
+        return endpoint + "?" + "&".join(
+            f"filter_properties={property_id}" for property_id in self.filter_properties
+        )
 
     def _get_endpoint(self) -> str:
         """
@@ -51,7 +144,7 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
         """
         return {
             "Authorization": f"Bearer {self.token}",
-            "Notion-Version": "2021-08-16",
+            "Notion-Version": self.NOTION_VERSION,
             "Content-Type": "application/json"
         }
 
@@ -66,7 +159,7 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
         Returns:
             dict: O payload para a próxima requisição.
         """
-        payload = {}
+        payload = {"page_size": self.page_size}
         if next_cursor:
             payload["start_cursor"] = next_cursor
 
@@ -97,9 +190,8 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
             tuple[int, any]: Um tupla contendo o código de status e os dados retornados.
         """
         endpoint = self._get_endpoint()
-        headers = self._get_headers()
         logger.info(f"Enviando requisição GET para {endpoint}")
-        response = requests.get(url=endpoint, headers=headers)
+        response = self._request("get", endpoint)
         response.raise_for_status()
         return response.status_code, response.json()
 
@@ -115,14 +207,27 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
         """
         if payload is None:
             payload = {}
-        endpoint = self._get_endpoint()
-        headers = self._get_headers()
+        endpoint = self._get_query_endpoint()
 
-        response = requests.post(url=endpoint, headers=headers, json=payload)
+        response = self._request("post", endpoint, json=payload)
         response.raise_for_status()
 
         return response.json()
 
+    async def apost_data(self, payload=None):
+        """
+        Equivalente assíncrono de post_data().
+
+        Args:
+            payload (dict, optional): O corpo da requisição em formato JSON.
+
+        Returns:
+            dict: Os dados retornados pela API.
+        """
+        response = await self._arequest("post", self._get_query_endpoint(), json=payload or {})
+        response.raise_for_status()
+        return response.json()
+
     def fetch_paginated(self, query_filter=None):
         """
         Obtém dados paginados da API do Notion.
@@ -146,33 +251,251 @@ class NotionDatabaseAPIExtractor(GenericAPIExtractor):
             if not next_cursor:
                 break
 
-    def run(self):
+    async def afetch_paginated(self, query_filter=None):
         """
-        Executa a rotina principal do extrator, consolidando os dados extraídos.
+        Equivalente assíncrono de fetch_paginated().
+
+        Args:
+            query_filter (dict, optional): Filtro de consulta a ser aplicado.
+
+        Yields:
+            list: Os resultados de cada página.
+        """
+        successful_requests = 0
+        next_cursor = None
+        logger.info(f"Tentando obter dados de {self._get_endpoint()}")
+        while True:
+            payload = self._get_next_payload(next_cursor, query_filter)
+            response = await self.apost_data(payload=payload)
+            successful_requests += 1
+            logger.info(f"Página {successful_requests} obtida.")
+            yield response["results"]
+            next_cursor = self._extract_next_cursor(response)
+            if not next_cursor:
+                break
+
+    def _get_query_filter(self):
+        """
+        Monta o filtro de consulta da extração incremental.
+
+        Com watermark, filtra a partir da última sincronização bem-sucedida menos a sobreposição
+        configurada, em UTC com o offset explícito; caso contrário, a partir de days_interval dias atrás.
 
         Returns:
-            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+            dict: O filtro por last_edited_time, ou None para extrações completas.
         """
-        query_filter = None
+        watermark = self.table.get_watermark()
+        if watermark:
+            return {
+                "filter": {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": watermark.isoformat(timespec="seconds")},
+                }
+            }
         if self.table.days_interval > 0:
             start_date = datetime.now() - timedelta(days=self.table.days_interval)
-            query_filter = {
+            return {
                 "filter": {
                     "timestamp": "last_edited_time",
                     "last_edited_time": {"on_or_after": start_date.strftime("%Y-%m-%d")},
                 }
             }
-        data = [
-            {
-                "ID": record.get("id"),
-                "SUCCESS": True,
-                "CONTENT": json.dumps(record),
-            }
-            for page in self.fetch_paginated(query_filter)
-            for record in page
+        return None
+
+    def _get_first_created_time_payload(self, query_filter=None):
+        """
+        Monta a consulta da página criada há mais tempo, que inicia a primeira janela do modo 'sliced'.
+        """
+        payload = {
+            "page_size": 1,
+            "sorts": [{"timestamp": "created_time", "direction": "ascending"}],
+        }
+        if query_filter:
+            payload |= query_filter
+        return payload
+
+    @staticmethod
+    def _parse_created_time(response):
+        results = response.get("results") or []
+        if not results:
+            return None
+        return datetime.fromisoformat(results[0]["created_time"].replace("Z", "+00:00"))
+
+    def get_slices(self, first_created_time, now=None):
+        """
+        Divide o intervalo entre a primeira página criada e o momento atual em janelas disjuntas.
+
+        A primeira janela não tem limite inferior e a última não tem limite superior, de forma
+        que páginas criadas durante a extração não fiquem de fora.
+
+        Args:
+            first_created_time (datetime): created_time da página criada há mais tempo.
+            now (datetime, optional): Fim do intervalo, por padrão o momento atual.
+
+        Returns:
+            list[tuple[str, str]]: Janelas no formato (inclusivo, exclusivo), em ISO 8601.
+        """
+        now = now or datetime.now(timezone.utc)
+        span = now - first_created_time
+        slices = max(1, self.slices)
+        if span <= timedelta(0) or slices == 1:
+            return [(None, None)]
+        step = span / slices
+        bounds = [
+            (first_created_time + step * i).isoformat(timespec="seconds")
+            for i in range(1, slices)
+        ]
+        return list(zip([None] + bounds, bounds + [None]))
+
+    def _get_slice_filter(self, lower, upper, query_filter=None):
+        """
+        Combina o filtro da extração com os limites de created_time de uma janela.
+
+        Args:
+            lower (str): Início da janela (inclusivo), ou None.
+            upper (str): Fim da janela (exclusivo), ou None.
+            query_filter (dict, optional): Filtro da extração incremental.
+
+        Returns:
+            dict: O filtro da janela, ou query_filter se a janela não tiver limites.
+        """
+        conditions = []
+        if lower:
+            conditions.append({"timestamp": "created_time", "created_time": {"on_or_after": lower}})
+        if upper:
+            conditions.append({"timestamp": "created_time", "created_time": {"before": upper}})
+        if query_filter:
+            conditions.append(query_filter["filter"])
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return {"filter": conditions[0]}
+        return {"filter": {"and": conditions}}
+
+    def _get_query_slices(self, first_created_time, query_filter):
+        if first_created_time is None:
+            return []
+        return [
+            self._get_slice_filter(lower, upper, query_filter)
+            for lower, upper in self.get_slices(first_created_time)
         ]
+
+    def fetch_sliced(self, query_filter=None):
+        """
+        Obtém os dados do banco de dados em janelas de created_time extraídas em paralelo.
+
+        Cada janela percorre sua própria cadeia de cursores em uma thread, até max_workers
+        simultâneas, dentro do limite de requisições da origem. As páginas são produzidas à
+        medida que chegam, através de uma fila limitada (ver iter_concurrent), sem acumular
+        as janelas em memória; páginas de janelas diferentes chegam intercaladas.
+
+        Args:
+            query_filter (dict, optional): Filtro de consulta a ser aplicado.
+
+        Yields:
+            list: Os resultados de cada página.
+        """
+        first_created_time = self._parse_created_time(
+            self.post_data(self._get_first_created_time_payload(query_filter))
+        )
+        slices = self._get_query_slices(first_created_time, query_filter)
+        logger.info(
+            f"Extraindo {self.table.source_name} em {len(slices)} janelas com {self.max_workers} workers"
+        )
+        yield from self.iter_concurrent(
+            self.fetch_paginated,
+            slices,
+            self.max_workers,
+            thread_name_prefix=f"notion_{self.table.source_name}",
+        )
+
+    async def afetch_sliced(self, query_filter=None):
+        """
+        Equivalente assíncrono de fetch_sliced(), com as janelas percorridas como corrotinas.
+
+        Args:
+            query_filter (dict, optional): Filtro de consulta a ser aplicado.
+
+        Yields:
+            list: Os resultados de cada página.
+        """
+        first_created_time = self._parse_created_time(
+            await self.apost_data(self._get_first_created_time_payload(query_filter))
+        )
+        slices = self._get_query_slices(first_created_time, query_filter)
+        async for page in self.aiter_concurrent(self.afetch_paginated, slices, self.max_workers):
+            yield page
+
+    def _page_to_records(self, page, seen=None):
+        """
+        Converte uma página de resultados no formato ID/SUCCESS/CONTENT.
+
+        Args:
+            page (list[dict]): Os resultados da página.
+            seen (set, optional): IDs já produzidos; registros repetidos entre janelas são descartados.
+
+        Returns:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        if seen is not None:
+            page = [record for record in page if record.get("id") not in seen]
+            seen.update(record.get("id") for record in page)
+        return self.to_record_frame(
+            [
+                {
+                    "ID": record.get("id"),
+                    "SUCCESS": True,
+                    "CONTENT": json.dumps(record),
+                }
+                for record in page
+            ]
+        )
+
+    def iter_batches(self):
+        """
+        Produz os dados do banco de dados página a página, no formato ID/SUCCESS/CONTENT.
+
+        No modo 'sliced' as janelas de created_time são extraídas em paralelo e os
+        registros são de-duplicados pelo ID da página.
+
+        Yields:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        query_filter = self._get_query_filter()
+        if self.table.extraction_strategy == "sliced":
+            pages, seen = self.fetch_sliced(query_filter), set()
+        else:
+            pages, seen = self.fetch_paginated(query_filter), None
+        for page in pages:
+            if page:
+                yield self._page_to_records(page, seen)
+
+    async def aiter_batches(self):
+        """
+        Equivalente assíncrono de iter_batches().
+
+        Yields:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        query_filter = self._get_query_filter()
+        if self.table.extraction_strategy == "sliced":
+            pages, seen = self.afetch_sliced(query_filter), set()
+        else:
+            pages, seen = self.afetch_paginated(query_filter), None
+        async for page in pages:
+            if page:
+                yield self._page_to_records(page, seen)
+
+    def run(self):
+        """
+        Executa a rotina principal do extrator, consolidando os dados extraídos.
+
+        Returns:
+            DataFrame: Um DataFrame com as colunas ID, SUCCESS e CONTENT
+        """
+        data = list(self.iter_batches())
         
         if not data:
-            return pd.DataFrame(columns=["ID", "SUCCESS", "CONTENT"])
+            return self.to_record_frame()
             
-        return pd.DataFrame(data, dtype=str)
+        return pd.concat(data, ignore_index=True)
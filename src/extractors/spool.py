@@ -0,0 +1,202 @@
+import os
+import json
+import gzip
+import shutil
+import logging
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+from .base_extractor import GenericExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class RecordSpool:
+    """
+    Spool local dos lotes extraídos de uma tabela, em arquivos NDJSON compactados com gzip.
+
+    Cada execução grava os lotes no formato ID/SUCCESS/CONTENT em
+    <spool_dir>/<origem>/<tabela raw>/<run_id>/part-00000.ndjson.gz e, ao fim da
+    extração, um manifest.json com as partes, a quantidade de registros e se a extração
+    foi incremental. Apenas execuções com manifesto estão completas e podem ser
+    reproduzidas, permitindo repetir uma carga que falhou sem consultar a API novamente.
+
+    Atributos:
+        table (DataTable): A tabela extraída.
+        run_id (str): Identificador da execução, também o nome do seu diretório.
+        run_dir (Path): Diretório dos arquivos da execução.
+    """
+
+    MANIFEST = "manifest.json"
+    # Execuções completas mantidas por tabela; as mais antigas são removidas a cada nova execução
+    KEEP_RUNS = 3
+
+    def __init__(self, spool_dir, table, run_id: str = None):
+        """
+        Inicializa o spool de uma execução.
+
+        Args:
+            spool_dir (str | Path): Diretório raiz dos spools.
+            table (DataTable): A tabela extraída.
+            run_id (str, optional): Identificador de uma execução existente; por padrão uma nova execução.
+        """
+        self.table = table
+        self.table_dir = Path(spool_dir) / table.origin / table.raw_model_name
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        self.run_dir = self.table_dir / self.run_id
+        self.parts = []
+        self.records = 0
+        self.started_at = None
+        self.manifest = None
+
+    @classmethod
+    def latest(cls, spool_dir, table):
+        """
+        Retorna a execução completa mais recente da tabela.
+
+        Args:
+            spool_dir (str | Path): Diretório raiz dos spools.
+            table (DataTable): A tabela extraída.
+
+        Returns:
+            RecordSpool: O spool da execução, ou None se não houver execução completa.
+        """
+        table_dir = Path(spool_dir) / table.origin / table.raw_model_name
+        if not table_dir.is_dir():
+            return None
+        for run_dir in sorted(table_dir.iterdir(), reverse=True):
+            manifest_path = run_dir / cls.MANIFEST
+            if manifest_path.is_file():
+                spool = cls(spool_dir, table, run_id=run_dir.name)
+                spool.manifest = json.loads(manifest_path.read_text())
+                spool.parts = spool.manifest["parts"]
+                spool.records = spool.manifest["records"]
+                return spool
+        return None
+
+    @property
+    def incremental(self) -> bool:
+        """
+        Indica se a extração gravada foi incremental, para resolver o modo de carga na reprodução.
+        """
+        if self.manifest is not None:
+            return self.manifest.get("incremental", False)
+        return self.table.is_incremental
+
+    def open(self):
+        """
+        Cria o diretório da execução e registra o início da extração.
+        """
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.started_at = datetime.now()
+
+    def write(self, batch: pd.DataFrame):
+        """
+        Grava um lote como uma nova parte da execução.
+
+        Args:
+            batch (pd.DataFrame): Lote com as colunas ID, SUCCESS e CONTENT.
+        """
+        if batch.empty:
+            return
+        name = f"part-{len(self.parts):05d}.ndjson.gz"
+        with gzip.open(self.run_dir / name, "wt", encoding="utf-8") as file:
+            batch.to_json(file, orient="records", lines=True, force_ascii=False)
+        self.parts.append(name)
+        self.records += len(batch)
+
+    def commit(self):
+        """
+        Grava o manifesto da execução, marcando-a como completa, e remove as execuções antigas.
+        """
+        self.manifest = {
+            "origin": self.table.origin,
+            "table": self.table.raw_model_name,
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": datetime.now().isoformat(),
+            "incremental": self.table.is_incremental,
+            "parts": self.parts,
+            "records": self.records,
+        }
+        # Escrita atômica: um manifesto parcial nunca é lido como execução completa
+        manifest_path = self.run_dir / self.MANIFEST
+        temp_path = manifest_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(temp_path, manifest_path)
+        logger.info(
+            f"Spool de {self.table.raw_model_name} gravado em {self.run_dir}: {self.records} registros em {len(self.parts)} partes"
+        )
+        self.cleanup()
+
+    def discard(self):
+        """
+        Remove os arquivos de uma execução incompleta.
+        """
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def cleanup(self, keep: int = None):
+        """
+        Remove as execuções completas mais antigas, mantendo as keep mais recentes.
+        """
+        keep = self.KEEP_RUNS if keep is None else keep
+        completed = sorted(
+            (run_dir for run_dir in self.table_dir.iterdir() if (run_dir / self.MANIFEST).is_file()),
+            reverse=True,
+        )
+        for run_dir in completed[keep:]:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    def tee(self, batches):
+        """
+        Grava os lotes à medida que são produzidos, repassando-os adiante.
+
+        A execução só é marcada como completa quando todos os lotes foram produzidos;
+        se a extração falhar, os arquivos parciais são removidos.
+
+        Args:
+            batches (Iterable[pd.DataFrame]): Lotes produzidos pelo extrator.
+
+        Yields:
+            pd.DataFrame: Os mesmos lotes.
+        """
+        self.open()
+        try:
+            for batch in batches:
+                self.write(batch)
+                yield batch
+        except BaseException:
+            self.discard()
+            raise
+        self.commit()
+
+    async def atee(self, batches):
+        """
+        Equivalente assíncrono de tee(), para os lotes de aiter_batches().
+        """
+        self.open()
+        try:
+            async for batch in batches:
+                self.write(batch)
+                yield batch
+        except BaseException:
+            self.discard()
+            raise
+        self.commit()
+
+    def iter_batches(self):
+        """
+        Lê os lotes gravados na execução, na ordem em que foram extraídos.
+
+        Yields:
+            pd.DataFrame: Lotes com as colunas ID, SUCCESS e CONTENT.
+        """
+        logger.info(
+            f"Reproduzindo spool de {self.table.raw_model_name} de {self.run_dir}: {self.records} registros"
+        )
+        for name in self.parts:
+            with gzip.open(self.run_dir / name, "rt", encoding="utf-8") as file:
+                records = [json.loads(line) for line in file if line.strip()]
+            yield GenericExtractor.to_record_frame(records)
@@ -1,5 +1,6 @@
 import csv
 import logging
+import tempfile
 import psycopg2
 from typing import Literal
 
@@ -14,6 +15,7 @@ from sqlalchemy.exc import (
 )
 
 from utils import Utils
+from utils.engine_registry import EngineRegistry
 from loaders.base_loader import BaseLoader
 from metadata.data_table import DataTable
 
@@ -32,23 +34,47 @@ class PostgresLoader(BaseLoader):
         engine (Engine): O engine do SQLAlchemy para conectar ao banco de dados PostgreSQL.
         schema_file_path (str): Caminho para o arquivo de esquema de tabela.
         schema_file_type (Literal["template", "info_schema", "schema"]): Tipo de arquivo de esquema.
+        load_method (Literal["copy", "insert"]): Método de inserção dos registros.
     """
 
+    # Tamanho máximo do buffer CSV mantido em memória antes de ser despejado em disco
+    COPY_BUFFER_SIZE = 64 * 1024 * 1024
+    # Catálogo, em cada schema de origem, das chaves JSON encontradas no CONTENT das tabelas raw
+    KEY_CATALOG_TABLE = "_raw_key_catalog"
+    # Dias sem aparecer em nenhuma carga incremental após os quais uma chave sai do catálogo
+    KEY_CATALOG_RETENTION_DAYS = 30
+
     def __init__(
         self,
-        engine: Engine = None,
-        table: DataTable = None
+        engine: Engine | str = None,
+        table: DataTable = None,
+        load_method: Literal["copy", "insert"] = "copy",
     ):
         """
         Inicializa o PostgresLoader com os parâmetros de conexão do banco de dados.
 
         Args:
-            engine (Engine): O engine do SQLAlchemy para conectar ao banco de dados PostgreSQL.
-            schema_file_path (str): Caminho para o arquivo de esquema de tabela.
-            schema_file_type (Literal["template", "info_schema", "schema"]): Tipo de arquivo de esquema.
+            engine (Engine | str): O engine do SQLAlchemy, ou a URL do banco de dados, resolvida
+                pelo EngineRegistry para reutilizar o pool de conexões do processo.
+            table (DataTable): A tabela de destino.
+            load_method (Literal["copy", "insert"]): Método de inserção padrão, 'copy' usa COPY FROM STDIN
+                e 'insert' usa DataFrame.to_sql. A configuração load_method da tabela tem precedência.
         """
-        self.engine = engine
+        self.engine = EngineRegistry.get_engine(engine) if isinstance(engine, str) else engine
         self.table = table
+        self.table_definition = None
+        self.load_method = getattr(table, "load_method", None) or load_method
+        # Tabela que recebe os lotes da carga em andamento, a própria tabela raw ou sua staging
+        self.load_target = None
+        # Horário do banco no início de uma carga 'append', que delimita os registros carregados
+        self.load_started_at = None
+
+    @property
+    def staging_table_name(self):
+        """
+        Nome da tabela sombra usada pelos modos de carga 'swap' e 'upsert'.
+        """
+        return f"{self.table.raw_model_name}__staging"
 
     def close_connections(self):
         """
@@ -157,6 +183,52 @@ class PostgresLoader(BaseLoader):
             except Exception as e:
                 raise e
 
+    def create_metadata_columns(self):
+        """
+        Adiciona as colunas HASH e __updated_at à tabela de destino, caso ainda não existam.
+
+        HASH é uma coluna gerada com o md5 do CONTENT em sua forma canônica (a representação
+        textual do jsonb independe da ordem das chaves e espaços do JSON extraído) e permite
+        ao modo 'upsert' ignorar registros inalterados sem comparar o jsonb completo.
+        __updated_at registra quando cada registro foi carregado ou alterado na camada raw e
+        é usada pelos modelos incrementais do dbt para processar apenas as linhas novas.
+        A criação de HASH reescreve a tabela uma única vez.
+
+        As colunas existentes são consultadas antes, pois o ALTER TABLE obtém um bloqueio
+        ACCESS EXCLUSIVE mesmo com IF NOT EXISTS, o que enfileiraria cada carga atrás dos
+        leitores da tabela raw e os leitores seguintes atrás da carga.
+        """
+        definitions = {
+            "HASH": 'varchar GENERATED ALWAYS AS (md5("CONTENT"::text)) STORED',
+            "__updated_at": "timestamptz NOT NULL DEFAULT now()",
+        }
+        columns_query = text(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = :schema AND table_name = :table_name
+            """
+        )
+        with self.engine.connect() as connection:
+            existing = {
+                row[0]
+                for row in connection.execute(
+                    columns_query, {"schema": self.table.origin, "table_name": self.table.raw_model_name}
+                )
+            }
+
+        missing = [column for column in definitions if column not in existing]
+        if not missing:
+            return
+        with self.engine.begin() as connection:
+            for column in missing:
+                connection.execute(
+                    text(
+                        f'ALTER TABLE {self.table.origin}.{self.table.raw_model_name} '
+                        f'ADD COLUMN IF NOT EXISTS "{column}" {definitions[column]}'
+                    )
+                )
+
     def create_update_updated_at_function(self):
         """
         Cria uma função para atualizar a coluna de data de modificação.
@@ -247,26 +319,18 @@ class PostgresLoader(BaseLoader):
 
             return schema_exists
 
-    def load_data(
-        self,
-        df: pd.DataFrame,
-        mode="replace",
-        chunksize=1000,
-    ):
+    def prepare_load(self, mode="replace"):
         """
-        Carrega os dados de um DataFrame na tabela de destino.
+        Prepara a tabela de destino para receber os dados de uma carga.
 
-        Este método verifica se a tabela existe e, se não existir, cria o esquema SQL.
-        Em seguida, carrega os dados do DataFrame na tabela, podendo substituir os dados existentes.
+        Cria o schema e a tabela caso não existam e, no modo 'replace', trunca a tabela.
+        Nos modos 'swap' e 'upsert', a tabela raw é mantida intacta e os lotes são direcionados
+        para uma tabela sombra, trocada pela tabela raw ou mesclada nela em finalize_load.
 
         Args:
-            df (pd.DataFrame): O DataFrame contendo os dados a serem carregados.
-            target_table (str): O nome da tabela de destino.
-            target_schema (str): O esquema de destino onde a tabela está localizada.
-            mode (str): O modo de carregamento ('append' para adicionar, 'replace' para substituir).
-            **kwargs: Argumentos adicionais:
-                - chunksize (int): Tamanho dos blocos para carregamento em lotes.
-                - table_definition (str): Definição SQL da tabela quando schema_file_type='schema'.
+            mode (str): O modo de carregamento ('append' para adicionar, 'replace' para substituir
+                truncando a tabela, 'swap' para substituir através da tabela sombra, 'upsert' para
+                inserir ou atualizar por "ID" a partir da tabela sombra).
         """
         logger.debug(
             f"Iniciando load_data para {self.table.raw_model_name} em {self.table.origin}, modo: {self.table.extraction_strategy}"
@@ -277,7 +341,7 @@ class PostgresLoader(BaseLoader):
         # Se o schema não existe, cria o schema
         if schema_exists == False:
             logger.debug(f"Schema {self.table.origin} não existe, criando agora")
-            self.create_schema(self.table.origin)
+            self.create_schema()
 
         # Verifica se a tabela existe no schema
         tables = inspect(self.engine).get_table_names(schema=self.table.origin)
@@ -286,6 +350,9 @@ class PostgresLoader(BaseLoader):
         if self.table.raw_model_name in tables:
             logger.debug(f"Tabela {self.table.raw_model_name} encontrada em {self.table.origin}")
 
+            # Tabelas criadas antes das colunas HASH e __updated_at recebem as colunas
+            self.create_metadata_columns()
+
             # Se o modo é replace, trunca a tabela para limpar os dados antes do insert
             if mode == "replace":
                 logger.debug(f"Truncando dados de {self.table.raw_model_name}.")
@@ -303,18 +370,576 @@ class PostgresLoader(BaseLoader):
             logger.debug(f"Criando tabela {self.table.raw_model_name} em {self.table.origin}")
             self.create_sql_schema()
 
-        loaded_rows = 0
-        logger.debug(f"Inserindo dados em {self.table.raw_model_name}")
+        self.load_target = self.table.raw_model_name
+        if mode == "append":
+            with self.engine.connect() as connection:
+                self.load_started_at = connection.execute(text("SELECT now()")).scalar()
+        elif mode == "swap":
+            self.create_staging_table()
+            self.load_target = self.staging_table_name
+        elif mode == "upsert":
+            self.create_unique_id_index()
+            self.create_staging_table(unlogged=True)
+            self.load_target = self.staging_table_name
+
+    def _insert_batch(self, df: pd.DataFrame, chunksize=1000):
+        """
+        Insere um lote de registros com INSERTs de múltiplas linhas via DataFrame.to_sql.
 
+        Returns:
+            int: Quantidade de linhas inseridas.
+        """
         loaded_rows = df.to_sql(
-            self.table.raw_model_name,
+            self.load_target or self.table.raw_model_name,
             con=self.engine,
             if_exists="append",
             schema=self.table.origin,
             index=False,
             chunksize=chunksize,
         )
+        return loaded_rows if loaded_rows is not None else len(df)
+
+    @staticmethod
+    def _is_arrow_backed(df: pd.DataFrame):
+        """
+        Verifica se todas as colunas do DataFrame são armazenadas em buffers Arrow.
+        """
+        return len(df.columns) > 0 and all(
+            isinstance(dtype, pd.ArrowDtype) or getattr(dtype, "storage", None) == "pyarrow"
+            for dtype in df.dtypes
+        )
+
+    def _write_copy_buffer(self, df: pd.DataFrame):
+        """
+        Serializa o DataFrame no buffer CSV enviado ao COPY.
+
+        DataFrames com colunas Arrow (ver GenericExtractor.to_record_frame) são escritos
+        pelo writer CSV do pyarrow diretamente dos buffers Arrow, sem materializar um str
+        do Python por célula. Os demais usam DataFrame.to_csv.
+
+        Returns:
+            SpooledTemporaryFile: O buffer posicionado no início.
+        """
+        if self._is_arrow_backed(df):
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+
+            buffer = tempfile.SpooledTemporaryFile(max_size=self.COPY_BUFFER_SIZE, mode="w+b")
+            pa_csv.write_csv(
+                pa.Table.from_pandas(df, preserve_index=False),
+                buffer,
+                write_options=pa_csv.WriteOptions(include_header=False),
+            )
+        else:
+            buffer = tempfile.SpooledTemporaryFile(
+                max_size=self.COPY_BUFFER_SIZE, mode="w+", newline="", encoding="utf-8"
+            )
+            df.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+        buffer.seek(0)
+        return buffer
+
+    def _copy_batch(self, df: pd.DataFrame):
+        """
+        Insere um lote de registros com COPY FROM STDIN no formato CSV.
+
+        O DataFrame é serializado em um buffer CSV (em memória até COPY_BUFFER_SIZE e em
+        disco a partir daí), cujo escape de aspas e quebras de linha preserva os payloads
+        JSON, e enviado ao PostgreSQL com copy_expert.
+
+        Returns:
+            int: Quantidade de linhas inseridas.
+        """
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        target = self.load_target or self.table.raw_model_name
+        copy_query = f"COPY {self.table.origin}.{target} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+        with self._write_copy_buffer(df) as buffer:
+            connection = self.engine.raw_connection()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.copy_expert(copy_query, buffer)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                connection.close()
+
+        return len(df)
+
+    def load_batch(self, df: pd.DataFrame, chunksize=1000):
+        """
+        Insere um lote de registros na tabela de destino já preparada.
+
+        Args:
+            df (pd.DataFrame): O DataFrame contendo os dados a serem carregados.
+            chunksize (int): Tamanho dos blocos para carregamento em lotes, usado apenas pelo método 'insert'.
+
+        Returns:
+            int: Quantidade de linhas inseridas.
+        """
+        logger.debug(
+            f"Inserindo {len(df)} registros em {self.load_target or self.table.raw_model_name} via {self.load_method}"
+        )
+
+        if df.empty:
+            return 0
+
+        if self.load_method == "copy":
+            return self._copy_batch(df)
+        return self._insert_batch(df, chunksize)
+
+    def create_staging_table(self, unlogged=False):
+        """
+        Recria a tabela sombra a partir da estrutura da tabela raw.
+
+        Args:
+            unlogged (bool): Cria uma tabela UNLOGGED apenas com as colunas e valores padrão,
+                usada como área de passagem do modo 'upsert'. Uma tabela temporária não serve,
+                pois os lotes COPY são enviados por conexões diferentes do pool. A coluna
+                __load_order numera os registros na ordem em que foram carregados. Caso contrário,
+                copia também índices e restrições, para que a tabela possa substituir a raw.
+        """
+        live = f"{self.table.origin}.{self.table.raw_model_name}"
+        staging = f"{self.table.origin}.{self.staging_table_name}"
+        if unlogged:
+            create_query = (
+                f"CREATE UNLOGGED TABLE {staging} (LIKE {live} INCLUDING DEFAULTS, "
+                f'"__load_order" bigint GENERATED ALWAYS AS IDENTITY)'
+            )
+        else:
+            create_query = f"CREATE TABLE {staging} (LIKE {live} INCLUDING ALL)"
+        with self.engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            connection.execute(text(create_query))
+        logger.debug(f"Tabela sombra {staging} criada.")
+
+    def create_unique_id_index(self):
+        """
+        Garante o índice único em "ID" exigido pelo ON CONFLICT do modo 'upsert'.
+
+        As cargas 'replace' nunca exigiram IDs únicos, então uma tabela raw pode conter IDs
+        repetidos (por exemplo, da antiga paginação por LIMIT/OFFSET). Na primeira carga
+        'upsert' da tabela, as repetições são removidas antes da criação do índice, mantendo
+        a versão carregada por último de cada ID.
+
+        Returns:
+            int: Quantidade de registros repetidos removidos.
+        """
+        schema = self.table.origin
+        live = self.table.raw_model_name
+        index = f"{live}__id_unique"
+        with self.engine.begin() as connection:
+            index_exists = connection.execute(
+                text("SELECT 1 FROM pg_indexes WHERE schemaname = :schema AND indexname = :index"),
+                {"schema": schema, "index": index},
+            ).fetchone()
+            if index_exists:
+                return 0
+
+            removed = connection.execute(
+                text(
+                    f"""
+                    DELETE FROM {schema}.{live} AS live
+                    USING (
+                        SELECT ctid, row_number() OVER (
+                            PARTITION BY "ID" ORDER BY "__updated_at" DESC, ctid DESC
+                        ) AS position
+                        FROM {schema}.{live}
+                    ) AS ranked
+                    WHERE live.ctid = ranked.ctid AND ranked.position > 1
+                    """
+                )
+            ).rowcount
+            if removed:
+                logger.warning(
+                    f"{removed} registros com ID repetido removidos de {schema}.{live} antes da criação do índice único."
+                )
+            connection.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {schema}.{live} ("ID")'))
+        return removed
+
+    def merge_staging_table(self):
+        """
+        Mescla a tabela sombra na tabela raw com INSERT ... ON CONFLICT ("ID") DO UPDATE.
+
+        Apenas registros novos ou cujo hash do conteúdo mudou são escritos, de forma que uma
+        carga incremental grava proporcionalmente ao delta. IDs repetidos na tabela sombra são
+        reduzidos a um único registro, pois o ON CONFLICT não aceita atualizar a mesma
+        linha duas vezes no mesmo comando; prevalece a última versão extraída, pela ordem
+        de carga em __load_order.
+
+        A tabela sombra é mantida para a atualização do catálogo de chaves e removida
+        por finalize_load.
+
+        Returns:
+            int: Quantidade de linhas inseridas ou atualizadas.
+        """
+        schema = self.table.origin
+        live = self.table.raw_model_name
+        staging = self.staging_table_name
+        merge_query = text(
+            f"""
+            INSERT INTO {schema}.{live} AS live ("ID", "SUCCESS", "CONTENT")
+            SELECT DISTINCT ON ("ID") "ID", "SUCCESS", "CONTENT"
+            FROM {schema}.{staging}
+            ORDER BY "ID", "__load_order" DESC
+            ON CONFLICT ("ID") DO UPDATE
+            SET "SUCCESS" = EXCLUDED."SUCCESS", "CONTENT" = EXCLUDED."CONTENT", "__updated_at" = now()
+            WHERE live."HASH" IS DISTINCT FROM md5(EXCLUDED."CONTENT"::text)
+               OR live."SUCCESS" IS DISTINCT FROM EXCLUDED."SUCCESS"
+            """
+        )
+
+        with self.engine.begin() as connection:
+            merged_rows = connection.execute(merge_query).rowcount
+        logger.info(f"{merged_rows} registros inseridos ou atualizados em {schema}.{live}.")
+        return merged_rows
+
+    def get_dependent_views(self, connection):
+        """
+        Lista as views que dependem, direta ou indiretamente, da tabela raw.
+
+        Views referenciam a tabela pelo OID, então continuariam apontando para a tabela
+        antiga após a troca por renomeação. As definições são lidas antes da troca, quando
+        ainda referenciam a tabela pelo nome atual.
+
+        Returns:
+            list[dict]: Schema, nome, tipo ('v' ou 'm') e definição de cada view, na ordem
+            em que podem ser recriadas.
+        """
+        query = text(
+            """
+            WITH RECURSIVE dependents AS (
+                SELECT r.ev_class AS oid, 1 AS depth
+                FROM pg_depend d
+                JOIN pg_rewrite r ON r.oid = d.objid
+                WHERE d.refobjid = CAST(:relation AS regclass)
+                  AND r.ev_class <> d.refobjid
+                UNION
+                SELECT r.ev_class, dependents.depth + 1
+                FROM dependents
+                JOIN pg_depend d ON d.refobjid = dependents.oid
+                JOIN pg_rewrite r ON r.oid = d.objid
+                WHERE r.ev_class <> d.refobjid
+            )
+            SELECT n.nspname AS schema, c.relname AS name, c.relkind AS kind,
+                   pg_get_viewdef(c.oid) AS definition, max(dependents.depth) AS depth
+            FROM dependents
+            JOIN pg_class c ON c.oid = dependents.oid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            GROUP BY c.oid, n.nspname, c.relname, c.relkind
+            ORDER BY depth, n.nspname, c.relname
+            """
+        )
+        relation = f"{self.table.origin}.{self.table.raw_model_name}"
+        return [dict(row._mapping) for row in connection.execute(query, {"relation": relation})]
+
+    def get_indexes(self, connection, table_name):
+        """
+        Lista os índices de uma tabela do schema de origem.
+
+        Returns:
+            list[tuple[str, tuple]]: Nome de cada índice e sua assinatura (definição sem o
+            nome do índice e da tabela, unicidade e chave primária), usada para associar os
+            índices da tabela sombra aos da tabela raw.
+        """
+        query = text(
+            """
+            SELECT c.relname AS name,
+                   regexp_replace(pg_get_indexdef(i.indexrelid), '^.* USING ', '') AS definition,
+                   i.indisunique AS is_unique,
+                   i.indisprimary AS is_primary
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = CAST(:relation AS regclass)
+            ORDER BY c.relname
+            """
+        )
+        rows = connection.execute(query, {"relation": f"{self.table.origin}.{table_name}"})
+        return [(row.name, (row.definition, row.is_unique, row.is_primary)) for row in rows]
+
+    def get_privileges(self, connection, relation):
+        """
+        Lê o dono, os privilégios, o comentário e as opções de armazenamento de uma relação.
+
+        CREATE TABLE ... (LIKE ... INCLUDING ALL) e CREATE VIEW não copiam esses atributos,
+        então eles são lidos antes da troca e reaplicados por apply_privileges.
+
+        Args:
+            relation (str): Nome qualificado da relação.
+
+        Returns:
+            dict: owner, comment, options (reloptions) e grants, uma lista de tuplas
+            (grantee, privilégio, com grant option) lida de pg_class.relacl.
+        """
+        params = {"relation": relation}
+        attributes = connection.execute(
+            text(
+                """
+                SELECT quote_ident(pg_get_userbyid(c.relowner)) AS owner,
+                       obj_description(c.oid, 'pg_class') AS comment,
+                       c.reloptions AS options
+                FROM pg_class c
+                WHERE c.oid = CAST(:relation AS regclass)
+                """
+            ),
+            params,
+        ).fetchone()
+        grants = connection.execute(
+            text(
+                """
+                SELECT CASE WHEN a.grantee = 0 THEN 'PUBLIC'
+                            ELSE quote_ident(pg_get_userbyid(a.grantee)) END AS grantee,
+                       a.privilege_type, a.is_grantable
+                FROM pg_class c
+                CROSS JOIN LATERAL aclexplode(c.relacl) a
+                WHERE c.oid = CAST(:relation AS regclass)
+                  AND a.grantee <> c.relowner
+                ORDER BY 1, 2
+                """
+            ),
+            params,
+        )
+        return {
+            "owner": attributes.owner,
+            "comment": attributes.comment,
+            "options": list(attributes.options or []),
+            "grants": [(row.grantee, row.privilege_type, row.is_grantable) for row in grants],
+        }
+
+    @staticmethod
+    def apply_privileges(connection, relation, kind, privileges):
+        """
+        Reaplica a uma relação recriada os atributos lidos por get_privileges.
+
+        Args:
+            relation (str): Nome qualificado da relação.
+            kind (str): Tipo da relação no DDL ('TABLE', 'VIEW' ou 'MATERIALIZED VIEW').
+            privileges (dict): O retorno de get_privileges.
+        """
+        connection.execute(text(f"ALTER {kind} {relation} OWNER TO {privileges['owner']}"))
+        if privileges["options"]:
+            connection.execute(text(f"ALTER {kind} {relation} SET ({', '.join(privileges['options'])})"))
+        for grantee, privilege, grantable in privileges["grants"]:
+            grant_option = " WITH GRANT OPTION" if grantable else ""
+            connection.execute(text(f"GRANT {privilege} ON {relation} TO {grantee}{grant_option}"))
+        if privileges["comment"] is not None:
+            connection.execute(
+                text(f"COMMENT ON {kind} {relation} IS :comment"), {"comment": privileges["comment"]}
+            )
+
+    def swap_staging_table(self):
+        """
+        Substitui a tabela raw pela tabela sombra em uma única transação curta.
+
+        As tabelas são trocadas por renomeação, de forma que a transação só altera o
+        catálogo e o bloqueio exclusivo da tabela raw dura milissegundos, sem copiar dados.
+        Os índices da tabela sombra recebem os nomes dos índices equivalentes da tabela
+        raw, para que create_unique_id_index não crie um índice duplicado depois. Views
+        dependentes (como os modelos processed do dbt) são removidas e recriadas na mesma
+        transação, passando a referenciar a nova tabela. O dono, os GRANTs, o comentário e as
+        opções da tabela raw e de cada view são reaplicados na mesma transação (ver
+        get_privileges). Os leitores veem a versão anterior completa até o commit.
+        """
+        schema = self.table.origin
+        live = self.table.raw_model_name
+        staging = self.staging_table_name
+        old = f"{live}__old"
+
+        with self.engine.begin() as connection:
+            connection.execute(text("SET LOCAL lock_timeout = '60s'"))
+            views = self.get_dependent_views(connection)
+            live_indexes = self.get_indexes(connection, live)
+            staging_indexes = self.get_indexes(connection, staging)
+            table_privileges = self.get_privileges(connection, f"{schema}.{live}")
+            for view in views:
+                view["relation"] = f'"{view["schema"]}"."{view["name"]}"'
+                view["ddl_kind"] = "MATERIALIZED VIEW" if view["kind"] == "m" else "VIEW"
+                view["privileges"] = self.get_privileges(connection, view["relation"])
+
+            # Views dependentes de outras views são removidas junto pelo CASCADE e recriadas abaixo
+            for view in views:
+                connection.execute(text(f'DROP {view["ddl_kind"]} IF EXISTS {view["relation"]} CASCADE'))
+
+            connection.execute(text(f"DROP TABLE IF EXISTS {schema}.{old}"))
+            connection.execute(text(f"ALTER TABLE {schema}.{live} RENAME TO {old}"))
+            connection.execute(text(f"ALTER TABLE {schema}.{staging} RENAME TO {live}"))
+            connection.execute(text(f"DROP TABLE {schema}.{old}"))
+            self.apply_privileges(connection, f"{schema}.{live}", "TABLE", table_privileges)
+
+            for staging_index, signature in staging_indexes:
+                live_index = next((name for name, other in live_indexes if other == signature), None)
+                if live_index and live_index != staging_index:
+                    live_indexes.remove((live_index, signature))
+                    connection.execute(text(f'ALTER INDEX {schema}."{staging_index}" RENAME TO "{live_index}"'))
+
+            for view in views:
+                connection.execute(text(f'CREATE {view["ddl_kind"]} {view["relation"]} AS {view["definition"]}'))
+                self.apply_privileges(connection, view["relation"], view["ddl_kind"], view["privileges"])
+        logger.info(f"Tabela {schema}.{live} substituída por {staging}.")
+
+    def update_key_catalog(self, mode="replace"):
+        """
+        Registra no catálogo de chaves as chaves JSON dos registros carregados.
+
+        Apenas os registros da carga são lidos: a tabela sombra nos modos 'swap' e 'upsert',
+        a tabela raw truncada no modo 'replace' e, no modo 'append', as linhas da tabela raw
+        com __updated_at a partir do início da carga. O catálogo é lido pela macro
+        process_jsonb_fields do dbt no lugar de uma varredura completa da tabela raw.
+
+        Nos modos incrementais, a primeira carga de uma tabela ainda sem chaves no catálogo
+        varre a tabela raw inteira, já que os registros da carga não contêm as chaves das
+        linhas carregadas antes.
+
+        Nos modos 'replace' e 'swap' a carga contém a tabela inteira, então as chaves que
+        não apareceram nela são removidas. Nos modos incrementais são removidas apenas as
+        chaves não vistas há mais de KEY_CATALOG_RETENTION_DAYS dias que também não existem
+        mais em nenhuma linha da tabela raw. Falhas são registradas sem interromper a carga.
+
+        Args:
+            mode (str): O modo de carregamento utilizado em prepare_load.
+        """
+        schema = self.table.origin
+        catalog = f"{schema}.{self.KEY_CATALOG_TABLE}"
+        live_table = f"{schema}.{self.table.raw_model_name}"
+        source = f"{schema}.{self.load_target or self.table.raw_model_name}"
+        params = {"table_name": self.table.raw_model_name}
+        full_load = mode in ("replace", "swap")
+
+        loaded_filter = ""
+        if mode == "append" and self.load_started_at is not None:
+            loaded_filter = 'AND "__updated_at" >= :loaded_since'
+            params["loaded_since"] = self.load_started_at
+
+        if full_load:
+            # now() é o início da transação, o mesmo last_seen_at das chaves registradas abaixo
+            prune_query = f"DELETE FROM {catalog} WHERE table_name = :table_name AND last_seen_at < now()"
+        else:
+            prune_query = f"""
+                DELETE FROM {catalog} AS catalog
+                WHERE catalog.table_name = :table_name
+                AND catalog.last_seen_at < now() - make_interval(days => {int(self.KEY_CATALOG_RETENTION_DAYS)})
+                AND NOT EXISTS (SELECT 1 FROM {live_table} AS raw WHERE raw."CONTENT" ? catalog.key)
+            """
+
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {catalog} (
+                            table_name varchar NOT NULL,
+                            key varchar NOT NULL,
+                            last_seen_at timestamptz NOT NULL DEFAULT now(),
+                            PRIMARY KEY (table_name, key)
+                        )
+                        """
+                    )
+                )
+                if not full_load:
+                    cataloged = connection.execute(
+                        text(f"SELECT 1 FROM {catalog} WHERE table_name = :table_name LIMIT 1"),
+                        {"table_name": self.table.raw_model_name},
+                    ).fetchone()
+                    if cataloged is None:
+                        source = live_table
+                        loaded_filter = ""
+                        params.pop("loaded_since", None)
+                connection.execute(
+                    text(
+                        f"""
+                        INSERT INTO {catalog} (table_name, key)
+                        SELECT DISTINCT :table_name, jsonb_object_keys("CONTENT")
+                        FROM {source}
+                        WHERE jsonb_typeof("CONTENT") = 'object' {loaded_filter}
+                        ON CONFLICT (table_name, key) DO UPDATE SET last_seen_at = now()
+                        """
+                    ),
+                    params,
+                )
+                connection.execute(text(prune_query), {"table_name": self.table.raw_model_name})
+        except SQLAlchemyError as e:
+            logger.warning(f"Não foi possível atualizar o catálogo de chaves de {source}: {e}")
+
+    def finalize_load(self, mode="replace"):
+        """
+        Conclui uma carga iniciada por prepare_load.
+
+        O catálogo de chaves só é atualizado depois da troca ou da mesclagem, para que uma
+        carga que falhe nesse ponto não altere o catálogo. Se a conclusão falhar, a carga é
+        descartada por abort_load, removendo a tabela sombra.
+
+        Args:
+            mode (str): O modo de carregamento utilizado em prepare_load.
+        """
+        try:
+            if mode == "swap":
+                self.swap_staging_table()
+                # A tabela sombra agora é a própria tabela raw
+                self.load_target = self.table.raw_model_name
+            elif mode == "upsert":
+                self.merge_staging_table()
+            self.update_key_catalog(mode)
+            if mode == "upsert":
+                with self.engine.begin() as connection:
+                    connection.execute(text(f"DROP TABLE {self.table.origin}.{self.staging_table_name}"))
+        except Exception:
+            self.abort_load(mode)
+            raise
+        self.load_target = None
+        self.load_started_at = None
+        logger.debug(f"Fim do carregamento de dados em {self.table.raw_model_name}, modo: {mode}")
+
+    def abort_load(self, mode="replace"):
+        """
+        Descarta uma carga que falhou após prepare_load.
+
+        Nos modos 'swap' e 'upsert' a tabela sombra é removida e a tabela raw permanece inalterada.
+
+        Args:
+            mode (str): O modo de carregamento utilizado em prepare_load.
+        """
+        if mode in ("swap", "upsert"):
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text(f"DROP TABLE IF EXISTS {self.table.origin}.{self.staging_table_name}")
+                )
+        self.load_target = None
+        self.load_started_at = None
+        logger.warning(f"Carga de {self.table.raw_model_name} descartada, modo: {mode}")
+
+    def load_data(
+        self,
+        df: pd.DataFrame,
+        mode="replace",
+        chunksize=1000,
+    ):
+        """
+        Carrega os dados de um DataFrame na tabela de destino.
+
+        Este método verifica se a tabela existe e, se não existir, cria o esquema SQL.
+        Em seguida, carrega os dados do DataFrame na tabela, podendo substituir os dados existentes.
+
+        Args:
+            df (pd.DataFrame): O DataFrame contendo os dados a serem carregados.
+            target_table (str): O nome da tabela de destino.
+            target_schema (str): O esquema de destino onde a tabela está localizada.
+            mode (str): O modo de carregamento ('append', 'replace', 'swap' ou 'upsert', ver prepare_load).
+            **kwargs: Argumentos adicionais:
+                - chunksize (int): Tamanho dos blocos para carregamento em lotes.
+                - table_definition (str): Definição SQL da tabela quando schema_file_type='schema'.
+        """
+        self.prepare_load(mode)
+
+        try:
+            loaded_rows = self.load_batch(df, chunksize)
+        except Exception:
+            self.abort_load(mode)
+            raise
+
+        self.finalize_load(mode)
 
         logger.debug(
             f"Fim do carregamento de dados em {self.table.raw_model_name}, {loaded_rows} linhas inseridas."
         )
+        return loaded_rows
@@ -2,13 +2,15 @@ import logging
 import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from sqlalchemy import create_engine
-from sqlalchemy.pool import QueuePool
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 from .data_table import DataTable
+from utils.engine_registry import EngineRegistry
+
+# Scoped to the transaction, so the other connections of the shared pool keep their time zone
+UTC_SESSION = "SET LOCAL TIME ZONE 'UTC'"
 
 
 class ConfigurationHelper:
@@ -17,16 +19,20 @@ class ConfigurationHelper:
         self.origin = origin
 
     def get_table_configuration(self):
-        """Loads sync metadata information into a Pandas DataFrame."""
+        """
+        Loads sync metadata information into a Pandas DataFrame.
+
+        The session time zone is set to UTC for the read, so the sync timestamps are
+        returned in UTC whether the columns are timestamp or timestamptz.
+        """
         query = f"""SELECT *
         FROM public.table_configuration ct
         where ct.origin = '{self.origin}'"""
 
-        engine = create_engine(
-            self.db_url, poolclass=QueuePool, pool_size=5, max_overflow=10
-        )
-        with engine.connect() as connection:
+        engine = EngineRegistry.get_engine(self.db_url)
+        with engine.begin() as connection:
             try:
+                connection.execute(text(UTC_SESSION))
                 result = connection.execute(text(query))
                 result_dataframe = pd.DataFrame(
                     result.fetchall(), columns=result.keys()
@@ -44,13 +50,34 @@ class ConfigurationHelper:
                         extraction_strategy=row["extraction_strategy"],
                         materialization_strategy=row["materialization_strategy"],
                         days_interval= int(row["days_interval"]),
-                        last_successful_sync_at=row["last_successful_sync_at"],
+                        last_successful_sync_at=(
+                            None
+                            if pd.isna(row["last_successful_sync_at"])
+                            else row["last_successful_sync_at"]
+                        ),
                         last_sync_attempt_at=row["last_sync_attempt_at"],
                         created_at=row["created_at"],
                         updated_at=row["updated_at"],
                         run_dbt_processed=bool(row["run_dbt_processed"]),
                         run_dbt_curated=bool(row["run_dbt_curated"]),
                         index_columns=row["index_columns"],
+                        load_method=row.get("load_method"),
+                        use_watermark=bool(row.get("use_watermark") or False),
+                        watermark_overlap=(
+                            None
+                            if pd.isna(row.get("watermark_overlap"))
+                            else int(row["watermark_overlap"])
+                        ),
+                        page_size=(
+                            None
+                            if pd.isna(row.get("page_size"))
+                            else int(row["page_size"])
+                        ),
+                        filter_properties=(
+                            None
+                            if pd.isna(row.get("filter_properties"))
+                            else row["filter_properties"]
+                        ),
                     )
                     for row in result_dataframe.to_dict('records')
                 ]
@@ -64,11 +91,14 @@ class ConfigurationHelper:
         """
         Update the table metadata with sync information.
 
+        The timestamps are written with the session time zone set to UTC, so a
+        timestamp without time zone column stores them as UTC as well.
+
         Args:
             id: The ID of the table configuration record
             source_name: Source name for logging purposes
-            last_successful_sync_at: Last successful sync timestamp
-            last_sync_attempt_at: Last attempt timestamp
+            last_successful_sync_at: Last successful sync timestamp, timezone-aware
+            last_sync_attempt_at: Last attempt timestamp, timezone-aware
 
         Returns:
             bool: True on success, False on failure
@@ -76,8 +106,8 @@ class ConfigurationHelper:
         query = """
             UPDATE public.table_configuration
             SET
-                last_successful_sync_at = COALESCE(:last_successful_sync_at, last_successful_sync_at),
-                last_sync_attempt_at = COALESCE(:last_sync_attempt_at, last_sync_attempt_at)
+                last_successful_sync_at = COALESCE(CAST(:last_successful_sync_at AS timestamptz), last_successful_sync_at),
+                last_sync_attempt_at = COALESCE(CAST(:last_sync_attempt_at AS timestamptz), last_sync_attempt_at)
             WHERE id = :id
         """
 
@@ -93,16 +123,15 @@ class ConfigurationHelper:
             "last_sync_attempt_at": last_sync_attempt_at,
         }
 
-        engine = create_engine(
-            self.db_url, poolclass=QueuePool, pool_size=5, max_overflow=10
-        )
-        with engine.connect() as connection:
-            try:
+        engine = EngineRegistry.get_engine(self.db_url)
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(UTC_SESSION))
                 connection.execute(text(query), params)
-                logger.info(
-                    f"Successfully updated metadata for {self.origin}.{source_name}"
-                )
-                return True
-            except SQLAlchemyError as e:
-                logger.error(f"Error updating metadata: {e}")
-                return False
+            logger.info(
+                f"Successfully updated metadata for {self.origin}.{source_name}"
+            )
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating metadata: {e}")
+            return False
@@ -1,3 +1,9 @@
+from datetime import datetime, timedelta, timezone
+
+# Minutos subtraídos da última sincronização para cobrir registros gravados durante a extração anterior
+DEFAULT_WATERMARK_OVERLAP = 10
+
+
 class DataTable:
     def __init__(
         self,
@@ -19,6 +25,11 @@ class DataTable:
         run_dbt_processed: bool = True,
         run_dbt_curated: bool = True,
         index_columns: list = None,
+        load_method: str = None,
+        use_watermark: bool = False,
+        watermark_overlap: int = None,
+        page_size: int = None,
+        filter_properties: str = None,
     ):
         self.id = id
         self.origin = origin
@@ -38,7 +49,36 @@ class DataTable:
         self.run_dbt_processed = run_dbt_processed
         self.run_dbt_curated = run_dbt_curated
         self.index_columns = index_columns
+        self.load_method = load_method
+        self.use_watermark = use_watermark
+        self.watermark_overlap = watermark_overlap
+        self.page_size = page_size
+        self.filter_properties = filter_properties
+
+    @property
+    def is_incremental(self):
+        return self.get_watermark() is not None or (
+            bool(self.days_interval) and self.days_interval > 0
+        )
+    def get_watermark(self):
+        """
+        Start of the watermark sync window: last successful sync minus the overlap in minutes, as an aware UTC datetime.
 
+        Values without an offset come from a timestamp without time zone column, which
+        ConfigurationHelper reads and writes in UTC, and are taken as UTC.
+        """
+        if not self.use_watermark or not self.last_successful_sync_at:
+            return None
+        last_sync = self.last_successful_sync_at
+        if isinstance(last_sync, str):
+            last_sync = datetime.fromisoformat(last_sync)
+        elif hasattr(last_sync, "to_pydatetime"):
+            last_sync = last_sync.to_pydatetime()
+        if last_sync.tzinfo is None:
+            last_sync = last_sync.replace(tzinfo=timezone.utc)
+        last_sync = last_sync.astimezone(timezone.utc)
+        overlap = DEFAULT_WATERMARK_OVERLAP if self.watermark_overlap is None else self.watermark_overlap
+        return last_sync - timedelta(minutes=overlap)
     @property
     def raw_model_name(self):
         return (
@@ -55,7 +95,9 @@ class DataTable:
         return f"""CREATE TABLE IF NOT EXISTS {self.origin}.{self.raw_model_name}(
                     "ID" varchar NOT NULL,
                     "SUCCESS" bool,
-                    "CONTENT" jsonb
+                    "CONTENT" jsonb,
+                    "HASH" varchar GENERATED ALWAYS AS (md5("CONTENT"::text)) STORED,
+                    "__updated_at" timestamptz NOT NULL DEFAULT now()
                     );"""
 
     def get_suffix(self, origin):
@@ -1,11 +1,20 @@
+import queue
 import logging
+import threading
 from abc import ABC, abstractmethod
 
+import pandas as pd
+
 from metadata.data_table import DataTable
+from extractors.base_extractor import GenericExtractor
+from extractors.spool import RecordSpool
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Sentinela que indica o fim dos lotes produzidos pelo extrator
+_END_OF_STREAM = object()
+
 
 class Stream(ABC):
     """
@@ -13,6 +22,9 @@ class Stream(ABC):
     Defines the interface that all stream classes must implement.
     """
 
+    spool = None
+    replay = False
+
     @abstractmethod
     def __init__(self, table: DataTable):
         """
@@ -63,3 +75,224 @@ class Stream(ABC):
             **kwargs: Additional arguments for loading
         """
         pass
+
+    def set_spool(self, spool_dir, replay=False):
+        """
+        Spool the extracted batches to local files, or replay a previous spool.
+
+        When spooling, every batch is written to a gzip NDJSON part and the run is
+        marked complete by a manifest once the extraction finishes. When replaying,
+        the latest complete run is read from disk and the API is not called.
+
+        Args:
+            spool_dir (str): Root directory of the spools
+            replay (bool): Load the latest complete spool instead of extracting
+
+        Raises:
+            ValueError: If spool_dir is not set
+            FileNotFoundError: If replay is requested and there is no complete spool for the table
+        """
+        if not spool_dir:
+            raise ValueError("A spool directory is required to spool or replay extractions")
+        if replay:
+            self.spool = RecordSpool.latest(spool_dir, self.table)
+            if self.spool is None:
+                raise FileNotFoundError(
+                    f"No complete spool for {self.table.origin}.{self.table.raw_model_name} in {spool_dir}"
+                )
+        else:
+            self.spool = RecordSpool(spool_dir, self.table)
+        self.replay = replay
+
+    def iter_extracted_batches(self, **extract_kwargs):
+        """
+        Batches of the table, from the extractor or from the spool being replayed.
+
+        Args:
+            **extract_kwargs: Arguments for the extractor's iter_batches()
+
+        Returns:
+            Iterable[DataFrame]: Batches with columns ID, SUCCESS and CONTENT
+        """
+        if self.replay:
+            return self.spool.iter_batches()
+        if not getattr(self, "extractor", None):
+            self.set_extractor()
+        batches = self.extractor.iter_batches(**extract_kwargs)
+        return self.spool.tee(batches) if self.spool else batches
+
+    @staticmethod
+    def _concat_batches(batches):
+        if not batches:
+            return GenericExtractor.to_record_frame()
+        return pd.concat(batches, ignore_index=True)
+
+    def extract_records(self, **extract_kwargs):
+        """
+        Extract the whole table, spooling or replaying it when a spool is set.
+
+        Args:
+            **extract_kwargs: Arguments for the extractor's run()
+
+        Returns:
+            DataFrame: The extracted data
+        """
+        if not self.spool:
+            if not getattr(self, "extractor", None):
+                self.set_extractor()
+            return self.extractor.run(**extract_kwargs)
+        return self._concat_batches(list(self.iter_extracted_batches(**extract_kwargs)))
+
+    async def aextract_stream(self, **kwargs):
+        """
+        Asynchronous counterpart of extract_stream(), using the extractor's arun().
+
+        Lets many tables be extracted concurrently on a single event loop.
+
+        Args:
+            **kwargs: Arguments for the extractor's arun()
+
+        Returns:
+            DataFrame: The extracted data
+        """
+        if self.replay:
+            return self._concat_batches(list(self.spool.iter_batches()))
+        if not getattr(self, "extractor", None):
+            self.set_extractor()
+        if self.spool:
+            return self._concat_batches(
+                [batch async for batch in self.spool.atee(self.extractor.aiter_batches(**kwargs))]
+            )
+        return await self.extractor.arun(**kwargs)
+
+    def resolve_load_mode(self, mode):
+        """
+        Resolve the "auto" load mode for this table.
+
+        Incremental tables (days_interval > 0) only extract the recent delta, so
+        they are merged into the raw table by "ID" instead of replacing it; full
+        extractions replace the table through the shadow table swap. A replayed
+        spool is resolved by how it was extracted, not by the current settings.
+        Tables whose extractor may fall back to positional IDs (see
+        has_positional_ids()) are always replaced, since those IDs do not identify
+        a record across runs.
+
+        Args:
+            mode (str): Requested load mode
+
+        Returns:
+            str: Load mode passed to the loader
+        """
+        if mode != "auto":
+            return mode
+        incremental = self.spool.incremental if self.replay else self.table.is_incremental
+        if incremental and self.has_positional_ids():
+            logger.warning(
+                f"{self.table.source_name} may have positional IDs, replacing instead of upserting"
+            )
+            return "swap"
+        return "upsert" if incremental else "swap"
+
+    def has_positional_ids(self):
+        """
+        Whether the extractor may use a record's position in the extraction as its ID.
+
+        Returns:
+            bool: False by default, streams whose extractors have a positional fallback override it
+        """
+        return False
+
+    def stream_to_loader(self, chunksize=None, mode="replace", queue_size=4, **extract_kwargs):
+        """
+        Extract and load the table concurrently, one batch at a time.
+
+        The extractor runs on a background thread and puts each batch from
+        iter_batches() in a bounded queue consumed by the loader, so network and
+        database time overlap and memory is bounded by queue_size batches instead
+        of the whole table. When a spool is set and the load fails, the extraction
+        still runs to the end so that the spool is complete and can be replayed.
+
+        Args:
+            chunksize (int, optional): Chunk size for batch loading
+            mode (str): Load mode passed to the loader, "auto" is resolved by resolve_load_mode()
+            queue_size (int): Maximum number of extracted batches waiting to be loaded
+            **extract_kwargs: Arguments for the extractor's iter_batches()
+
+        Returns:
+            int: Number of loaded records
+        """
+        if not getattr(self, "loader", None):
+            raise ValueError("Loader not set. Call set_loader() first.")
+        if not self.replay and not getattr(self, "extractor", None):
+            self.set_extractor()
+        mode = self.resolve_load_mode(mode)
+
+        batches = queue.Queue(maxsize=max(1, queue_size))
+        stop = threading.Event()
+        errors = []
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                extracted = iter(self.iter_extracted_batches(**extract_kwargs))
+                for batch in extracted:
+                    if not put(batch):
+                        if self.spool and not self.replay:
+                            # A carga falhou: a extração segue até o fim para completar o spool,
+                            # que pode ser reproduzido com --replay sem consultar a API novamente
+                            logger.warning(
+                                f"Load of {self.table.raw_model_name} failed, finishing the extraction into the spool"
+                            )
+                            for _ in extracted:
+                                pass
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(_END_OF_STREAM)
+
+        producer = threading.Thread(
+            target=produce, name=f"extract_{self.table.source_name}", daemon=True
+        )
+        producer.start()
+
+        loaded = 0
+        prepared = False
+        failure = None
+        try:
+            while True:
+                batch = batches.get()
+                if batch is _END_OF_STREAM:
+                    break
+                if not prepared:
+                    self.loader.prepare_load(mode)
+                    prepared = True
+                loaded += self.loader.load_batch(batch, chunksize)
+                logger.info(
+                    f"Loaded {loaded} records into {self.table.origin}.{self.table.raw_model_name}"
+                )
+        except Exception as e:
+            failure = e
+        finally:
+            stop.set()
+            producer.join()
+
+        failure = failure or (errors[0] if errors else None)
+        if failure:
+            # A carga incompleta é descartada, no modo 'swap' a tabela raw fica intacta
+            if prepared:
+                self.loader.abort_load(mode)
+            raise failure
+
+        if not prepared:
+            self.loader.prepare_load(mode)
+        self.loader.finalize_load(mode)
+        return loaded
@@ -22,11 +22,14 @@ class BenditoStream(Stream):
         self.extractor = None
         self.loader = None
 
-    def set_extractor(self):
+    def set_extractor(self, max_workers=None):
         """
         Set up the BenditoAPIExtractor for this stream.
+
+        Args:
+            max_workers (int, optional): Concurrent key range partitions for 'partitioned' tables
         """
-        self.extractor = BenditoAPIExtractor(self.table)
+        self.extractor = BenditoAPIExtractor(self.table, max_workers=max_workers)
         logger.info(f"BenditoAPIExtractor set for {self.table.source_name}")
 
     def extract_stream(self, page_size: int = 1000):
@@ -44,7 +47,13 @@ class BenditoStream(Stream):
             logger.info("Extractor not set, setting it now")
             self.set_extractor()
 
-        return self.extractor.run(page_size=page_size)
+        return self.extract_records(page_size=page_size)
+
+    def has_positional_ids(self):
+        """
+        Without a unique_id_property the extractor uses the row position when the table has no 'id' column.
+        """
+        return not self.table.unique_id_property
 
     def set_table_definition(self, table_definition=None):
         """
@@ -59,24 +68,26 @@ class BenditoStream(Stream):
         self.table_definition = table_definition
         logger.info(f"Table definition set for {self.table.source_name}")
 
-    def set_loader(self, engine):
+    def set_loader(self, engine, load_method="copy"):
         """
         Set up the PostgreSQLLoader for this stream.
 
         Args:
             engine (sqlalchemy.engine.Engine): SQLAlchemy engine for database connection
+            load_method (str): Default insert method ('copy' or 'insert'), overridden by the table's load_method
         """
-        self.loader = PostgresLoader(engine, self.table)
+        self.loader = PostgresLoader(engine, self.table, load_method=load_method)
         self.loader.table_definition = self.table.schemaless_ddl
         logger.info(f"PostgreSQLLoader set for {self.table.source_name}")
 
-    def load_stream(self, records, chunksize=None):
+    def load_stream(self, records, chunksize=None, mode="replace"):
         """
         Load the data into the target database.
 
         Args:
             records (pd.DataFrame): DataFrame with records to be loaded
             chunksize (int, optional): Chunk size for batch loading
+            mode (str): Load mode ("auto", "upsert", "swap", "replace" or "append")
         """
         if not self.loader:
             raise ValueError("Loader not set. Call set_loader() first.")
@@ -88,4 +99,4 @@ class BenditoStream(Stream):
             f"Loading {len(records)} records into {self.table.origin}.{self.table.raw_model_name}"
         )
 
-        self.loader.load_data(df=records, chunksize=chunksize, mode="replace")
+        self.loader.load_data(df=records, chunksize=chunksize, mode=self.resolve_load_mode(mode))
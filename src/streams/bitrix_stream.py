@@ -22,11 +22,14 @@ class BitrixStream(Stream):
         self.loader = None
         self.ddl = None
 
-    def set_extractor(self):
+    def set_extractor(self, max_workers=None):
         """
         Configura o BitrixAPIExtractor para esta stream.
+
+        Args:
+            max_workers (int, optional): Quantidade de requisições de detalhe simultâneas
         """
-        self.extractor = BitrixAPIExtractor(self.table)
+        self.extractor = BitrixAPIExtractor(self.table, max_workers=max_workers)
 
     def extract_stream(self):
         """
@@ -48,7 +51,14 @@ class BitrixStream(Stream):
         logger.info("Extracting data from Bitrix API")
         if not self.extractor:
             self.set_extractor()
-        return self.extractor.run()
+        return self.extract_records()
+
+    def has_positional_ids(self):
+        """
+        Nos modos 'list', 'enum', 'endpoint' e 'fields' o extrator usa a posição do registro
+        como ID quando a API não retorna um.
+        """
+        return self.table.extraction_strategy in ("list", "enum", "endpoint", "fields")
 
     def set_table_definition(self, table_definition=None):
         """
@@ -63,24 +73,26 @@ class BitrixStream(Stream):
         self.table_definition = table_definition
         logger.info(f"Table definition set for {self.table.source_name}")
 
-    def set_loader(self, engine):
+    def set_loader(self, engine, load_method="copy"):
         """
         Set up the PostgreSQLLoader for this stream.
 
         Args:
             engine (sqlalchemy.engine.Engine): SQLAlchemy engine for database connection
+            load_method (str): Default insert method ('copy' or 'insert'), overridden by the table's load_method
         """
-        self.loader = PostgresLoader(engine, self.table)
+        self.loader = PostgresLoader(engine, self.table, load_method=load_method)
         self.loader.table_definition = self.table.schemaless_ddl
         logger.info(f"PostgreSQLLoader set for {self.table.source_name}")
 
-    def load_stream(self, records, chunksize=None):
+    def load_stream(self, records, chunksize=None, mode="replace"):
         """
         Carrega os dados na camada staging no banco de dados de destino.
 
         Args:
             records (pd.DataFrame): DataFrame com os registros a serem carregados
             chunksize (int, optional): Tamanho do chunk para carregamento em lotes
+            mode (str): Modo de carga ("auto", "upsert", "swap", "replace" ou "append")
         """
         
         if not self.loader:
@@ -95,4 +107,4 @@ class BitrixStream(Stream):
             f"Loading {len(records)} records into {self.table.origin}.{self.table.raw_model_name}"
         )
 
-        self.loader.load_data(df=records, chunksize=chunksize, mode="replace")
+        self.loader.load_data(df=records, chunksize=chunksize, mode=self.resolve_load_mode(mode))
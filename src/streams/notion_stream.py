@@ -15,9 +15,14 @@ class NotionStream(Stream):
         """Initialize NotionStream with the DataTable object containing configuration"""
         super().__init__(table)
 
-    def set_extractor(self):
-        """Set the extractor for Notion API"""
-        self.extractor = NotionDatabaseAPIExtractor(self.table)
+    def set_extractor(self, max_workers=None):
+        """
+        Set the extractor for Notion API
+
+        Args:
+            max_workers (int, optional): Concurrent created_time windows for 'sliced' tables
+        """
+        self.extractor = NotionDatabaseAPIExtractor(self.table, max_workers=max_workers)
 
     def extract_stream(self):
         """Extract data from Notion API and write to raw_layer
@@ -28,7 +33,7 @@ class NotionStream(Stream):
         logger.info("Extracting data from Notion API")
         if not self.extractor:
             self.set_extractor()
-        return self.extractor.run()
+        return self.extract_records()
     
     def set_table_definition(self, table_definition=None):
         """
@@ -43,22 +48,24 @@ class NotionStream(Stream):
         self.table_definition = table_definition
         logger.info(f"Table definition set for {self.table.source_name}")
 
-    def set_loader(self, engine):
+    def set_loader(self, engine, load_method="copy"):
         """
         Set up the PostgresLoader for this stream.
 
         Args:
             engine (sqlalchemy.engine.Engine): SQLAlchemy engine for database connection
+            load_method (str): Default insert method ('copy' or 'insert'), overridden by the table's load_method
         """
-        self.loader = PostgresLoader(engine, self.table)
+        self.loader = PostgresLoader(engine, self.table, load_method=load_method)
         self.loader.table_definition = self.table.schemaless_ddl
         logger.info(f"PostgreSQLLoader set for {self.table.source_name}")
 
-    def load_stream(self, records, chunksize=None):
+    def load_stream(self, records, chunksize=None, mode="replace"):
         """Load data into the target schema and table
 
         Args:
             data (DataFrame): DataFrame containing the data to be loaded
+            mode (str): Load mode ("auto", "upsert", "swap", "replace" or "append")
         """
         if not self.loader:
             raise ValueError("Loader not set. Call set_loader() first.")
@@ -69,4 +76,4 @@ class NotionStream(Stream):
         logger.info(
             f"Loading {len(records)} records into {self.table.origin}.{self.table.raw_model_name}"
         )
-        self.loader.load_data(df=records, chunksize=chunksize, mode="replace")
+        self.loader.load_data(df=records, chunksize=chunksize, mode=self.resolve_load_mode(mode))
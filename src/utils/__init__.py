@@ -5,10 +5,16 @@ This package provides utility classes and functions for:
 - Common utility functions for file operations, date handling, and configuration
 - Webhook and Discord notifications for pipeline events
 - DBT runner for model transformations
+- Token bucket and adaptive (AIMD) rate limiters shared by concurrent API requests
+- Orchestrators that replicate several tables concurrently, on threads or on one event loop
+- Process-wide SQLAlchemy engine registry
 """
 
 from .utils import Utils
 from .notifier import WebhookNotifier, DiscordNotifier
-from .dbt_runner import DBTRunner
+from .dbt_runner import DBTRunner, NodeResult
+from .rate_limiter import TokenBucket, AdaptiveRateLimiter
+from .orchestrator import SyncOrchestrator, AsyncOrchestrator, TableOutcome
+from .engine_registry import EngineRegistry
 
-__all__ = ['Utils', 'WebhookNotifier', 'DiscordNotifier', 'DBTRunner'] 
\ No newline at end of file
+__all__ = ['Utils', 'WebhookNotifier', 'DiscordNotifier', 'DBTRunner', 'NodeResult', 'TokenBucket', 'AdaptiveRateLimiter', 'SyncOrchestrator', 'AsyncOrchestrator', 'TableOutcome', 'EngineRegistry'] 
\ No newline at end of file
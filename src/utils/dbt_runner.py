@@ -8,23 +8,62 @@ import shutil  # Adicionar import para shutil
 logger = logging.getLogger(__name__)
 
 
+class NodeResult:
+    """
+    Resultado da execução de um nó (modelo, teste, seed) do dbt.
+
+    Atributos:
+        name (str): Nome do nó
+        unique_id (str): Identificador único do nó no manifest
+        status (str): Status final (success, error, skipped, pass, fail...)
+        execution_time (float): Duração da execução em segundos
+        rows_affected (int): Linhas afetadas informadas pelo adapter, quando disponível
+        message (str): Mensagem do adapter ou do erro
+    """
+
+    def __init__(self, name, unique_id, status, execution_time=None, rows_affected=None, message=None):
+        self.name = name
+        self.unique_id = unique_id
+        self.status = status
+        self.execution_time = execution_time
+        self.rows_affected = rows_affected
+        self.message = message
+
+    def __repr__(self):
+        return f"NodeResult({self.name}, {self.status}, {self.execution_time or 0:.2f}s)"
+
+
 class DBTRunner:
     """
     Utilitário para executar comandos dbt a partir do código Python.
+
+    No modo in_process os comandos são executados com o dbtRunner do dbt-core no próprio
+    processo, reaproveitando o manifest entre as chamadas de run/test/build e publicando
+    o resultado de cada nó assim que ele termina. Caso contrário, o executável dbt é
+    chamado em um subprocesso.
     """
 
-    def __init__(self, project_dir=None, profiles_dir=None):
+    def __init__(self, project_dir=None, profiles_dir=None, in_process=False, on_result=None):
         """
         Inicializa o executador de dbt.
 
         Args:
             project_dir (str): Diretório do projeto dbt
             profiles_dir (str): Diretório onde está o profiles.yml
+            in_process (bool): Executa o dbt no próprio processo em vez de um subprocesso
+            on_result (Callable, optional): Chamado com um NodeResult a cada nó concluído no modo in_process
         """
         self.project_dir = project_dir
         self.profiles_dir = profiles_dir
+        self.in_process = in_process
+        self.on_result = on_result
         # Encontrar o caminho do executável dbt
         self.dbt_path = shutil.which("dbt")
+        # Manifest reaproveitado entre os comandos in-process e as vars usadas no parse
+        self.manifest = None
+        self.manifest_vars = None
+        # Resultados por nó do último comando executado in-process
+        self.last_results = []
 
     def get_suffix(self, origin):
         """
@@ -41,7 +80,7 @@ class DBTRunner:
             raise ValueError(f"Unsupported origin: {origin}")
         return origin_suffixes[origin]
 
-    def run_command(
+    def _build_args(
         self,
         command,
         select=None,
@@ -52,40 +91,15 @@ class DBTRunner:
         full_refresh=False,
     ):
         """
-        Executa um comando dbt.
-
-        Args:
-            command (str): O comando dbt a ser executado (run, test, build, etc.)
-            select (str, optional): String de seleção de modelos
-            models (str, optional): String de modelos a serem incluídos
-            exclude (str, optional): String de modelos a serem excluídos
-            selector (str, optional): Seletor a ser usado
-            vars_dict (dict, optional): Variáveis a serem passadas para o dbt
-            full_refresh (bool, optional): Se deve fazer um refresh completo
+        Monta os argumentos de linha de comando do dbt, sem o executável.
 
         Returns:
-            bool: True se o comando for bem-sucedido, False caso contrário
+            list: O comando seguido de suas opções
         """
-        # Verifica se o dbt está instalado
-        if not self.dbt_path:
-            self.dbt_path = shutil.which("dbt")  # Tentar novamente localizar o dbt
-
-        if not self.dbt_path:
-            logger.error(
-                "Executável dbt não encontrado. Por favor, instale o dbt: pip install dbt-core dbt-postgres"
-            )
-            return False
-
-        # Prepara o comando base usando o caminho completo do dbt
-        cmd = [self.dbt_path, command]
+        cmd = [command]
 
-        # Adiciona opções de diretório do projeto
-        if self.project_dir:
-            cmd.extend(["--project-dir", str(self.project_dir)])
-
-        # Adiciona opções de diretório do profiles
-        if self.profiles_dir:
-            cmd.extend(["--profiles-dir", str(self.profiles_dir)])
+        # Adiciona opções de diretório do projeto e do profiles
+        cmd.extend(self._project_args())
 
         # Adiciona opções de modelos
         if models:
@@ -109,7 +123,156 @@ class DBTRunner:
             cmd.extend(["--select", str(select)])
 
         if full_refresh:
-            cmd.extend(["--full-refresh", "true"])
+            cmd.append("--full-refresh")
+
+        return cmd
+
+    def _project_args(self):
+        """Opções de diretório do projeto e do profiles."""
+        args = []
+        if self.project_dir:
+            args.extend(["--project-dir", str(self.project_dir)])
+        if self.profiles_dir:
+            args.extend(["--profiles-dir", str(self.profiles_dir)])
+        return args
+
+    def _create_dbt_runner(self, manifest=None, callbacks=None):
+        """Cria um dbtRunner do dbt-core, importado apenas quando o modo in_process é usado."""
+        from dbt.cli.main import dbtRunner
+
+        return dbtRunner(manifest=manifest, callbacks=callbacks or [])
+
+    def _get_manifest(self, vars_dict=None):
+        """
+        Retorna o manifest do projeto, executando 'dbt parse' apenas na primeira chamada
+        ou quando as vars mudam, já que elas podem alterar o resultado do parse.
+        """
+        vars_json = json.dumps(vars_dict, sort_keys=True) if vars_dict else None
+        if self.manifest is not None and self.manifest_vars == vars_json:
+            return self.manifest
+
+        args = ["parse", *self._project_args()]
+        if vars_json:
+            args.extend(["--vars", vars_json])
+
+        logger.info("Executando parse do projeto dbt")
+        result = self._create_dbt_runner().invoke(args)
+        if not result.success:
+            raise RuntimeError(f"Falha no parse do projeto dbt: {result.exception}")
+
+        self.manifest = result.result
+        self.manifest_vars = vars_json
+        return self.manifest
+
+    def _on_event(self, event):
+        """
+        Callback de eventos do dbt, converte cada NodeFinished em um NodeResult.
+        """
+        if event.info.name != "NodeFinished":
+            return
+
+        node_info = event.data.node_info
+        run_result = event.data.run_result
+        try:
+            adapter_response = dict(run_result.adapter_response)
+        except (TypeError, ValueError):
+            adapter_response = {}
+        rows_affected = adapter_response.get("rows_affected")
+
+        result = NodeResult(
+            name=node_info.node_name,
+            unique_id=node_info.unique_id,
+            status=run_result.status or node_info.node_status,
+            execution_time=run_result.execution_time,
+            rows_affected=int(rows_affected) if rows_affected is not None else None,
+            message=run_result.message,
+        )
+        self.last_results.append(result)
+        logger.info(f"Nó dbt concluído: {result}")
+        if self.on_result:
+            self.on_result(result)
+
+    def _invoke(self, args, vars_dict=None):
+        """
+        Executa um comando dbt no próprio processo com o manifest reaproveitado.
+
+        Args:
+            args (list): Argumentos montados por _build_args
+            vars_dict (dict, optional): Variáveis passadas ao dbt, usadas para validar o manifest
+
+        Returns:
+            bool: True se o comando for bem-sucedido, False caso contrário
+        """
+        logger.info(f"Executando comando dbt in-process: {' '.join(args)}")
+        self.last_results = []
+
+        try:
+            manifest = self._get_manifest(vars_dict)
+            result = self._create_dbt_runner(
+                manifest=manifest, callbacks=[self._on_event]
+            ).invoke(args)
+        except ImportError:
+            logger.error(
+                "dbt-core não encontrado. Por favor, instale o dbt: pip install dbt-core dbt-postgres"
+            )
+            return False
+        except Exception as e:
+            logger.error(f"Erro ao executar o comando dbt: {e}")
+            return False
+
+        if not result.success:
+            if result.exception:
+                logger.error(f"Comando dbt falhou: {result.exception}")
+            failed = [node.name for node in self.last_results if node.status in ("error", "fail")]
+            logger.error(f"Comando dbt falhou, nós com erro: {failed}")
+            return False
+
+        return True
+
+    def run_command(
+        self,
+        command,
+        select=None,
+        models=None,
+        exclude=None,
+        selector=None,
+        vars_dict=None,
+        full_refresh=False,
+    ):
+        """
+        Executa um comando dbt.
+
+        Args:
+            command (str): O comando dbt a ser executado (run, test, build, etc.)
+            select (str, optional): String de seleção de modelos
+            models (str, optional): String de modelos a serem incluídos
+            exclude (str, optional): String de modelos a serem excluídos
+            selector (str, optional): Seletor a ser usado
+            vars_dict (dict, optional): Variáveis a serem passadas para o dbt
+            full_refresh (bool, optional): Se deve fazer um refresh completo
+
+        Returns:
+            bool: True se o comando for bem-sucedido, False caso contrário
+        """
+        args = self._build_args(
+            command, select, models, exclude, selector, vars_dict, full_refresh
+        )
+
+        if self.in_process:
+            return self._invoke(args, vars_dict)
+
+        # Verifica se o dbt está instalado
+        if not self.dbt_path:
+            self.dbt_path = shutil.which("dbt")  # Tentar novamente localizar o dbt
+
+        if not self.dbt_path:
+            logger.error(
+                "Executável dbt não encontrado. Por favor, instale o dbt: pip install dbt-core dbt-postgres"
+            )
+            return False
+
+        # Prepara o comando usando o caminho completo do dbt
+        cmd = [self.dbt_path, *args]
 
         # Log do comando
         logger.info(f"Executando comando dbt: {' '.join(cmd)}")
@@ -185,7 +348,14 @@ class DBTRunner:
             bool: True se o comando for bem-sucedido, False caso contrário
         """
         vars_dict = {"target_schema": target_schema} if target_schema else None
-        return self.run_command("test", models, exclude, selector, vars_dict, select)
+        return self.run_command(
+            command="test",
+            models=models,
+            exclude=exclude,
+            selector=selector,
+            vars_dict=vars_dict,
+            select=select,
+        )
 
     def build(
         self, models=None, exclude=None, selector=None, target_schema=None, select=None
@@ -203,7 +373,51 @@ class DBTRunner:
             bool: True se o comando for bem-sucedido, False caso contrário
         """
         vars_dict = {"target_schema": target_schema} if target_schema else None
-        return self.run_command("build", models, exclude, selector, vars_dict, select)
+        return self.run_command(
+            command="build",
+            models=models,
+            exclude=exclude,
+            selector=selector,
+            vars_dict=vars_dict,
+            select=select,
+        )
+
+    def get_source_selector(self, tables):
+        """
+        Monta o seletor dos modelos que dependem das tabelas raw informadas.
+
+        Args:
+            tables (list[DataTable]): Tabelas recarregadas na execução
+
+        Returns:
+            str: Seletor 'source:<origin>.<raw_model_name>+' de cada tabela, separados por espaço
+        """
+        return " ".join(
+            f"source:{table.origin}.{table.raw_model_name}+" for table in tables
+        )
+
+    def run_changed(self, tables, target_schema=None, full_refresh=False):
+        """
+        Executa 'dbt run' apenas para os modelos afetados pelas tabelas recarregadas
+        e seus descendentes.
+
+        Args:
+            tables (list[DataTable]): Tabelas recarregadas com sucesso
+            target_schema (str, optional): Schema de destino para os modelos
+            full_refresh (bool, optional): Se deve fazer um refresh completo
+
+        Returns:
+            bool: True se o comando for bem-sucedido ou não houver modelos afetados
+        """
+        if not tables:
+            logger.info("Nenhuma tabela recarregada, pulando transformações dbt")
+            return True
+
+        return self.run(
+            select=self.get_source_selector(tables),
+            target_schema=target_schema,
+            full_refresh=full_refresh,
+        )
 
     def update_model_configs(self, tables, origin):
         """
@@ -224,6 +438,8 @@ class DBTRunner:
             bool: Success status of the update operation
         """
         try:
+            # Os arquivos de configuração mudam, o manifest precisa de um novo parse
+            self.manifest = None
             models_dir = self._ensure_models_directory(origin)
             model_configs = self._generate_model_configs(tables)
             new_schema = {"version": 2, "models": model_configs}
@@ -322,6 +538,10 @@ class DBTRunner:
                 }
                 if table.unique_id_property and table.materialization_strategy in ["incremental", "table"]:
                     curated_model["config"]["unique_key"] = table.unique_id_property
+                if table.materialization_strategy == "incremental":
+                    # Modelos incrementais filtram pela coluna __updated_at (macro incremental_filter),
+                    # adicionada ao destino quando ainda não existe
+                    curated_model["config"]["on_schema_change"] = "append_new_columns"
                     
                 model_configs.append(curated_model)
 
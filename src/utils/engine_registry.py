@@ -0,0 +1,76 @@
+import logging
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class EngineRegistry:
+    """
+    Registro de engines do SQLAlchemy compartilhados pelo processo, um por URL.
+
+    Criar um engine a cada chamada abre um novo pool e paga novamente o handshake SSL
+    de cada conexão. Com o registro, ConfigurationHelper, PostgresLoader e os scripts
+    reutilizam o mesmo pool durante toda a execução do pipeline.
+    """
+
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 10
+    # Conexões mais antigas que isso são recriadas, evitando conexões encerradas pelo servidor
+    POOL_RECYCLE = 1800
+
+    _engines = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_engine(cls, url: str, pool_size: int = None, max_overflow: int = None) -> Engine:
+        """
+        Retorna o engine da URL, criando-o na primeira chamada.
+
+        O tamanho do pool só é considerado na criação do engine; chamadas seguintes
+        para a mesma URL recebem o engine já existente.
+
+        Args:
+            url (str): URL de conexão do banco de dados.
+            pool_size (int): Conexões mantidas abertas no pool.
+            max_overflow (int): Conexões adicionais permitidas acima de pool_size.
+
+        Returns:
+            Engine: O engine compartilhado da URL.
+        """
+        with cls._lock:
+            engine = cls._engines.get(url)
+            if engine is None:
+                engine = create_engine(
+                    url,
+                    pool_size=pool_size or cls.DEFAULT_POOL_SIZE,
+                    max_overflow=cls.DEFAULT_MAX_OVERFLOW if max_overflow is None else max_overflow,
+                    pool_pre_ping=True,
+                    pool_recycle=cls.POOL_RECYCLE,
+                )
+                cls._engines[url] = engine
+                logger.debug(f"Engine criado para {engine.url.host}/{engine.url.database}")
+            return engine
+
+    @classmethod
+    def dispose(cls, url: str):
+        """
+        Fecha as conexões do engine da URL e o remove do registro.
+        """
+        with cls._lock:
+            engine = cls._engines.pop(url, None)
+        if engine is not None:
+            engine.dispose()
+
+    @classmethod
+    def dispose_all(cls):
+        """
+        Fecha as conexões de todos os engines registrados, ao final do pipeline.
+        """
+        with cls._lock:
+            engines = list(cls._engines.values())
+            cls._engines.clear()
+        for engine in engines:
+            engine.dispose()
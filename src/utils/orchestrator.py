@@ -0,0 +1,261 @@
+import time
+import asyncio
+import logging
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class TableOutcome:
+    """
+    Resultado da replicação de uma tabela pelo SyncOrchestrator.
+
+    Atributos:
+        table (DataTable): A tabela replicada.
+        success (bool): True se a replicação foi concluída com sucesso.
+        started_at (datetime): Início da tentativa em UTC, registrado como marca d'água em caso de sucesso.
+        elapsed (float): Duração da replicação em segundos.
+        error (Exception): Exceção não tratada pela função de replicação, se houver.
+    """
+
+    def __init__(self, table, success, started_at, elapsed, error=None):
+        self.table = table
+        self.success = success
+        self.started_at = started_at
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self):
+        status = "ok" if self.success else "falha"
+        return f"TableOutcome({self.table.origin}.{self.table.source_name}, {status}, {self.elapsed:.1f}s)"
+
+
+class SyncOrchestrator:
+    """
+    Executa a replicação de várias tabelas em paralelo, com limite de concorrência por origem.
+
+    Cada tabela roda em uma thread própria, mas no máximo max_concurrency tabelas de uma
+    mesma origem ficam ativas ao mesmo tempo. O limite de requisições da API continua
+    garantido pelo limitador compartilhado da origem, já que todos os extratores do
+    processo consomem o mesmo balde.
+
+    Atributos:
+        replicate (Callable): Função que replica uma tabela e retorna 1 em caso de sucesso.
+        config_handler (ConfigurationHelper): Registra last_sync_attempt_at e last_successful_sync_at.
+        max_concurrency (int): Tabelas simultâneas por origem, ou None para o padrão da origem.
+    """
+
+    # Tabelas simultâneas por origem quando max_concurrency não é informado
+    DEFAULT_CONCURRENCY = {"bendito": 4, "bitrix": 2, "notion": 2}
+
+    _semaphores = {}
+    _semaphores_lock = threading.Lock()
+
+    def __init__(self, replicate, config_handler=None, max_concurrency=None):
+        """
+        Inicializa o orquestrador.
+
+        Args:
+            replicate (Callable): Função que recebe um DataTable e retorna 1 em caso de sucesso.
+            config_handler (ConfigurationHelper): Helper usado para registrar as datas de sincronização.
+            max_concurrency (int): Tabelas simultâneas por origem.
+        """
+        self.replicate = replicate
+        self.config_handler = config_handler
+        self.max_concurrency = max_concurrency
+
+    def get_concurrency(self, origin):
+        """
+        Retorna o limite de tabelas simultâneas da origem.
+        """
+        return max(1, self.max_concurrency or self.DEFAULT_CONCURRENCY.get(origin, 1))
+
+    def get_semaphore(self, origin):
+        """
+        Retorna o semáforo compartilhado da origem, criando-o na primeira chamada.
+        """
+        with self._semaphores_lock:
+            key = (origin, self.get_concurrency(origin))
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(key[1])
+            return self._semaphores[key]
+
+    def record_attempt(self, table, started_at):
+        """
+        Registra o início da tentativa de sincronização da tabela.
+        """
+        if self.config_handler:
+            self.config_handler.update_table_configuration(
+                table.id,
+                table.source_name,
+                last_sync_attempt_at=started_at,
+            )
+
+    def record_success(self, table, started_at):
+        """
+        Registra o início da tentativa como marca d'água da última sincronização bem-sucedida.
+        """
+        if self.config_handler:
+            self.config_handler.update_table_configuration(
+                table.id,
+                table.source_name,
+                last_successful_sync_at=started_at,
+            )
+
+    def run_table(self, table):
+        """
+        Replica uma tabela respeitando o limite da origem e registra as datas de sincronização.
+
+        Args:
+            table (DataTable): A tabela a ser replicada.
+
+        Returns:
+            TableOutcome: O resultado da replicação.
+        """
+        with self.get_semaphore(table.origin):
+            # O início da tentativa é a próxima marca d'água, cobrindo alterações feitas durante a extração
+            started_at = datetime.datetime.now(datetime.timezone.utc)
+            start_time = time.time()
+            self.record_attempt(table, started_at)
+
+            error = None
+            try:
+                success = (self.replicate(table) or 0) == 1
+            except Exception as e:
+                logger.error(f"Erro ao replicar {table.origin}.{table.source_name}: {e}")
+                success = False
+                error = e
+
+            if success:
+                self.record_success(table, started_at)
+
+        outcome = TableOutcome(table, success, started_at, time.time() - start_time, error)
+        logger.info(f"Replicação concluída: {outcome}")
+        return outcome
+
+    def run(self, tables):
+        """
+        Replica as tabelas em paralelo.
+
+        Args:
+            tables (list[DataTable]): As tabelas a serem replicadas.
+
+        Returns:
+            list[TableOutcome]: Os resultados, na mesma ordem das tabelas.
+        """
+        if not tables:
+            return []
+
+        origins = {table.origin for table in tables}
+        max_workers = min(len(tables), sum(self.get_concurrency(origin) for origin in origins))
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="replicate") as executor:
+            outcomes = list(executor.map(self.run_table, tables))
+
+        succeeded = sum(outcome.success for outcome in outcomes)
+        logger.info(f"{succeeded} de {len(outcomes)} tabelas replicadas com sucesso.")
+        return outcomes
+
+
+class AsyncOrchestrator(SyncOrchestrator):
+    """
+    Executa a replicação de várias tabelas como corrotinas em um único event loop.
+
+    Equivalente assíncrono do SyncOrchestrator: replicate é uma corrotina, no máximo
+    max_concurrency tabelas de uma mesma origem ficam ativas ao mesmo tempo, e as
+    chamadas síncronas ao config_handler rodam em threads auxiliares para não bloquear
+    o loop. Todas as requisições das tabelas são multiplexadas pelo mesmo loop.
+
+    Atributos:
+        replicate (Callable): Corrotina que replica uma tabela e retorna 1 em caso de sucesso.
+        config_handler (ConfigurationHelper): Registra last_sync_attempt_at e last_successful_sync_at.
+        max_concurrency (int): Tabelas simultâneas por origem, ou None para o padrão da origem.
+        cleanup (Callable): Corrotina executada ao final, como o fechamento das sessões HTTP do loop.
+    """
+
+    def __init__(self, replicate, config_handler=None, max_concurrency=None, cleanup=None):
+        """
+        Inicializa o orquestrador.
+
+        Args:
+            replicate (Callable): Corrotina que recebe um DataTable e retorna 1 em caso de sucesso.
+            config_handler (ConfigurationHelper): Helper usado para registrar as datas de sincronização.
+            max_concurrency (int): Tabelas simultâneas por origem.
+            cleanup (Callable): Corrotina sem argumentos executada após todas as tabelas.
+        """
+        super().__init__(replicate, config_handler, max_concurrency)
+        self.cleanup = cleanup
+
+    async def arun_table(self, table, semaphore):
+        """
+        Replica uma tabela respeitando o semáforo da origem e registra as datas de sincronização.
+
+        Args:
+            table (DataTable): A tabela a ser replicada.
+            semaphore (asyncio.Semaphore): Semáforo da origem da tabela.
+
+        Returns:
+            TableOutcome: O resultado da replicação.
+        """
+        async with semaphore:
+            started_at = datetime.datetime.now(datetime.timezone.utc)
+            start_time = time.time()
+            await asyncio.to_thread(self.record_attempt, table, started_at)
+
+            error = None
+            try:
+                success = (await self.replicate(table) or 0) == 1
+            except Exception as e:
+                logger.error(f"Erro ao replicar {table.origin}.{table.source_name}: {e}")
+                success = False
+                error = e
+
+            if success:
+                await asyncio.to_thread(self.record_success, table, started_at)
+
+        outcome = TableOutcome(table, success, started_at, time.time() - start_time, error)
+        logger.info(f"Replicação concluída: {outcome}")
+        return outcome
+
+    async def arun(self, tables):
+        """
+        Replica as tabelas concorrentemente no event loop atual.
+
+        Args:
+            tables (list[DataTable]): As tabelas a serem replicadas.
+
+        Returns:
+            list[TableOutcome]: Os resultados, na mesma ordem das tabelas.
+        """
+        # Semáforos do asyncio pertencem ao loop, então são criados a cada execução
+        semaphores = {
+            origin: asyncio.Semaphore(self.get_concurrency(origin))
+            for origin in {table.origin for table in tables}
+        }
+        try:
+            outcomes = await asyncio.gather(
+                *(self.arun_table(table, semaphores[table.origin]) for table in tables)
+            )
+        finally:
+            if self.cleanup:
+                await self.cleanup()
+
+        succeeded = sum(outcome.success for outcome in outcomes)
+        logger.info(f"{succeeded} de {len(outcomes)} tabelas replicadas com sucesso.")
+        return list(outcomes)
+
+    def run(self, tables):
+        """
+        Replica as tabelas em um novo event loop, bloqueando até o fim de todas.
+
+        Args:
+            tables (list[DataTable]): As tabelas a serem replicadas.
+
+        Returns:
+            list[TableOutcome]: Os resultados, na mesma ordem das tabelas.
+        """
+        if not tables:
+            return []
+        return asyncio.run(self.arun(tables))
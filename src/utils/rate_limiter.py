@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Limitador de taxa do tipo token bucket, seguro para uso entre threads.
+
+    O balde acumula tokens a uma taxa constante (rate por segundo) até o limite
+    de capacity, permitindo rajadas curtas sem ultrapassar a taxa sustentada.
+    Cada requisição consome um token e aguarda caso o balde esteja vazio.
+
+    Atributos:
+        rate (float): Tokens adicionados por segundo (taxa sustentada).
+        capacity (int): Quantidade máxima de tokens acumulados (tamanho da rajada).
+    """
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Inicializa o limitador com o balde cheio.
+
+        Args:
+            rate (float): Tokens adicionados por segundo.
+            capacity (int): Quantidade máxima de tokens acumulados.
+        """
+        if rate <= 0:
+            raise ValueError(f"A taxa do limitador deve ser positiva: {rate}")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_origin(cls, origin: str, rate: float, capacity: int = 1, **kwargs):
+        """
+        Retorna o limitador compartilhado de uma origem, criando-o na primeira chamada.
+
+        Todos os extratores de uma mesma origem dentro do processo dividem o mesmo
+        balde, de forma que o limite da API é respeitado mesmo com várias tabelas
+        sendo extraídas ao mesmo tempo.
+
+        Args:
+            origin (str): Identificador da origem ('bitrix', 'notion', 'bendito').
+            rate (float): Tokens adicionados por segundo.
+            capacity (int): Quantidade máxima de tokens acumulados.
+            **kwargs: Argumentos adicionais do construtor da classe do limitador.
+
+        Returns:
+            TokenBucket: O limitador da origem, sempre uma instância da classe chamada.
+        """
+        # A chave inclui a classe para que TokenBucket e suas subclasses não troquem limitadores entre si
+        key = (cls, origin)
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls(rate, capacity, **kwargs)
+            return cls._registry[key]
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _try_acquire(self, tokens: int):
+        """
+        Consome os tokens se estiverem disponíveis.
+
+        Returns:
+            float: 0 se os tokens foram consumidos, ou o tempo em segundos até estarem disponíveis.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """
+        Consome tokens do balde, bloqueando a thread até que estejam disponíveis.
+
+        Args:
+            tokens (int): Quantidade de tokens a consumir.
+        """
+        while True:
+            wait_time = self._try_acquire(tokens)
+            if not wait_time:
+                return
+            time.sleep(wait_time)
+
+    async def aacquire(self, tokens: int = 1):
+        """
+        Consome tokens do balde, suspendendo a corrotina até que estejam disponíveis.
+
+        Equivalente assíncrono de acquire(): o balde é o mesmo, então extrações
+        síncronas e assíncronas da mesma origem dividem o limite da API.
+
+        Args:
+            tokens (int): Quantidade de tokens a consumir.
+        """
+        while True:
+            wait_time = self._try_acquire(tokens)
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+
+def parse_retry_after(value):
+    """
+    Converte o cabeçalho Retry-After em segundos de espera.
+
+    Args:
+        value (str): Valor do cabeçalho, em segundos ou como data HTTP.
+
+    Returns:
+        float: Segundos até a próxima tentativa, ou None se o cabeçalho estiver ausente ou inválido.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket cuja taxa se ajusta às respostas da API em AIMD (aumento aditivo, redução multiplicativa).
+
+    Cada resposta bem-sucedida aumenta a taxa em increase / rate, ou seja, cerca de
+    increase requisições por segundo a cada segundo sem erros, até max_rate. Uma resposta
+    429/503 multiplica a taxa por decrease e pausa todas as requisições da origem pelo
+    tempo indicado no Retry-After, de forma que a taxa converge para o limite sustentável
+    observado sem tempestades de 429 nem esperas desnecessárias.
+
+    Atributos:
+        rate (float): Taxa atual, em requisições por segundo.
+        min_rate (float): Taxa mínima após reduções.
+        max_rate (float): Taxa máxima após aumentos.
+        increase (float): Aumento da taxa, em req/s, por segundo de respostas bem-sucedidas.
+        decrease (float): Fator aplicado à taxa a cada resposta 429/503.
+    """
+
+    # Respostas 429/503 recebidas nesse intervalo após uma redução não reduzem a taxa novamente,
+    # já que vêm de requisições enviadas antes da redução
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        min_rate: float = None,
+        max_rate: float = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ):
+        """
+        Inicializa o limitador com o balde cheio.
+
+        Args:
+            rate (float): Taxa inicial, em requisições por segundo.
+            capacity (int): Quantidade máxima de tokens acumulados.
+            min_rate (float, optional): Taxa mínima, por padrão um décimo da taxa inicial.
+            max_rate (float, optional): Taxa máxima, por padrão a taxa inicial.
+            increase (float): Aumento da taxa por segundo de respostas bem-sucedidas.
+            decrease (float): Fator de redução da taxa, entre 0 e 1.
+        """
+        super().__init__(rate, capacity)
+        self.min_rate = min(rate, min_rate or rate / 10)
+        self.max_rate = max(rate, max_rate or rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")
+
+    def _try_acquire(self, tokens: int):
+        with self.lock:
+            wait_time = self.paused_until - time.monotonic()
+        if wait_time > 0:
+            return wait_time
+        return super()._try_acquire(tokens)
+
+    def on_success(self):
+        """
+        Registra uma resposta bem-sucedida, aumentando a taxa de forma aditiva.
+        """
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, pause: float = None):
+        """
+        Registra uma resposta 429/503, reduzindo a taxa e pausando a origem.
+
+        Args:
+            pause (float, optional): Segundos em que nenhuma requisição da origem é liberada,
+                como o Retry-After da resposta.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill()
+            if now - self.decreased_at >= self.DECREASE_COOLDOWN:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.decreased_at = now
+            if pause:
+                self.paused_until = max(self.paused_until, now + pause)
+                self.tokens = 0.0
+            rate = self.rate
+        logger.warning(
+            f"Limite da API atingido, taxa reduzida para {rate:.2f} req/s"
+            + (f" e requisições pausadas por {pause:.1f}s" if pause else "")
+        )
@@ -1,3 +1,4 @@
+import os
 import logging
 import sqlparse
 import argparse
@@ -75,12 +76,87 @@ class Utils:
             help="Chunk size for data loading (default: 1000)",
         )
         
+        # Estratégia de carga da tabela raw
+        parser.add_argument(
+            "--load-mode",
+            type=str,
+            default="auto",
+            choices=["auto", "upsert", "swap", "replace"],
+            help="Raw table load strategy: merge by ID, load a shadow table and swap it in, or truncate then insert; auto upserts incremental tables and swaps full ones (default: auto)",
+        )
+
+        # Método de inserção na camada raw
+        parser.add_argument(
+            "--load-method",
+            type=str,
+            default="copy",
+            choices=["copy", "insert"],
+            help="Insert method for raw tables, COPY FROM STDIN or to_sql INSERTs (default: copy)",
+        )
+
         parser.add_argument(
             "--page_size",
             type=int,
             default=5000,
             help="Page size for data extraction (default: 1000)",
         )
+
+        # Concorrência de requisições durante a extração de uma tabela
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=4,
+            help="Concurrent API requests per table during extraction (default: 4)",
+        )
+
+        # Tabelas replicadas simultaneamente por origem
+        parser.add_argument(
+            "--table-concurrency",
+            type=int,
+            default=None,
+            help="Number of tables replicated concurrently per origin (default: origin specific)",
+        )
+
+        # Extração assíncrona, com todas as tabelas em um único event loop
+        parser.add_argument(
+            "--async-extract",
+            type=str,
+            default="false",
+            choices=["true", "false"],
+            help="Extracts all tables on a single asyncio event loop, not used with --streaming (default: False)",
+        )
+
+        # Spool local dos lotes extraídos, para repetir cargas sem consultar a API
+        parser.add_argument(
+            "--spool-dir",
+            type=str,
+            default=os.environ.get("SPOOL_DIR"),
+            help="Directory where extracted batches are spooled as gzip NDJSON (default: $SPOOL_DIR, disabled if unset)",
+        )
+
+        parser.add_argument(
+            "--replay",
+            type=str,
+            default="false",
+            choices=["true", "false"],
+            help="Loads the latest complete spool of each table instead of calling the API (default: False)",
+        )
+
+        # Carga em streaming, sobrepondo extração e carregamento
+        parser.add_argument(
+            "--streaming",
+            type=str,
+            default="false",
+            choices=["true", "false"],
+            help="Loads each extracted page while the next ones are fetched (default: False)",
+        )
+
+        parser.add_argument(
+            "--queue-size",
+            type=int,
+            default=4,
+            help="Extracted pages buffered ahead of the loader in streaming mode (default: 4)",
+        )
         # Controle de extração
         parser.add_argument(
             "--extract",
@@ -116,6 +192,22 @@ class Utils:
             help="Update DBT model configurations before running (default: True)",
         )
         
+        parser.add_argument(
+            "--dbt-select",
+            type=str,
+            default="changed",
+            choices=["changed", "all"],
+            help="Run only the models downstream of the raw tables loaded in this execution, or every model of the origin (default: changed)",
+        )
+
+        parser.add_argument(
+            "--dbt-in-process",
+            type=str,
+            default="true",
+            choices=["true", "false"],
+            help="Run dbt in-process with dbt-core's dbtRunner, reusing the parsed manifest (default: True)",
+        )
+
         parser.add_argument(
             "--full-extract",
             type=str,
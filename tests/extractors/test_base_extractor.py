@@ -11,6 +11,18 @@ class TestGenericExtractor:
         extractor = GenericExtractor("test_source")
         assert extractor.source == "test_source"
 
+    def test_to_record_frame(self):
+        """Test that record frames always carry the ID/SUCCESS/CONTENT columns with the record dtype."""
+        frame = GenericExtractor.to_record_frame(
+            [{"ID": 1, "SUCCESS": True, "CONTENT": '{"id": 1}'}]
+        )
+        empty = GenericExtractor.to_record_frame()
+
+        assert list(frame.columns) == ["ID", "SUCCESS", "CONTENT"]
+        assert frame.iloc[0].tolist() == ["1", "True", '{"id": 1}']
+        assert list(empty.columns) == ["ID", "SUCCESS", "CONTENT"]
+        assert all(dtype == frame["CONTENT"].dtype for dtype in frame.dtypes)
+
 
 class TestGenericAPIExtractor:
     """Tests for the GenericAPIExtractor class."""
@@ -41,6 +53,19 @@ class TestGenericAPIExtractor:
         assert extractor.fetch_paginated() == {"data": "test_data"}
         assert extractor.run() == "test_run_result"
 
+    def test_session_is_shared_per_origin(self):
+        """Test that extractors of the same origin reuse one pooled session."""
+        GenericAPIExtractor.close_sessions()
+        first = self.ConcreteAPIExtractor("test_source", "test_token", pool_size=4)
+        second = self.ConcreteAPIExtractor("test_source", "test_token")
+        other = self.ConcreteAPIExtractor("other_source", "test_token")
+
+        assert first.session is second.session
+        assert first.session is not other.session
+        assert first.session.headers["Accept-Encoding"] == "gzip, deflate"
+        assert first.session.get_adapter("https://api.example.com")._pool_maxsize == 4
+        GenericAPIExtractor.close_sessions()
+
 
 class TestGenericDatabaseExtractor:
     """Tests for the GenericDatabaseExtractor class."""
@@ -0,0 +1,235 @@
+import io
+import pytest
+import requests
+import pandas as pd
+from src.extractors.bendito_extractor import BenditoAPIExtractor
+from src.metadata.data_table import DataTable
+
+
+class TestBenditoAPIExtractor:
+    """Tests for the BenditoAPIExtractor class."""
+
+    @pytest.fixture
+    def table(self):
+        """Fixture for a Bendito DataTable with a unique id property."""
+        return DataTable(
+            origin="bendito",
+            source_name="invoice_item",
+            unique_id_property="id",
+            updated_at_property="time_modification",
+            days_interval=0,
+        )
+
+    @pytest.fixture
+    def bendito_extractor(self, table, monkeypatch):
+        """Fixture for creating a BenditoAPIExtractor instance."""
+        monkeypatch.setenv("BENDITO_BI_TOKEN", "test_token")
+        monkeypatch.setenv("BENDITO_BI_URL", "https://bi.example.com/query")
+        return BenditoAPIExtractor(table)
+
+    def test_get_query(self, bendito_extractor):
+        """Test the OFFSET query builder."""
+        assert bendito_extractor.get_query() == 'select * from public."invoice_item" where true order by 1 asc'
+
+    def test_get_keyset_query(self, bendito_extractor):
+        """Test the keyset query builder with and without a last key."""
+        assert (
+            bendito_extractor.get_keyset_query()
+            == 'select * from public."invoice_item" where true order by "id" asc'
+        )
+        assert (
+            bendito_extractor.get_keyset_query("41")
+            == 'select * from public."invoice_item" where true and "id" > \'41\' order by "id" asc'
+        )
+
+    def test_get_keyset_query_with_interval(self, bendito_extractor):
+        """Test that the keyset query keeps the incremental filter."""
+        bendito_extractor.table.days_interval = 3
+        assert bendito_extractor.get_keyset_query("7") == (
+            'select * from public."invoice_item" where true and time_modification >= current_date - 3 days'
+            ' and "id" > \'7\' order by "id" asc'
+        )
+
+    def test_get_keyset_query_with_watermark(self, bendito_extractor):
+        """Test that the watermark takes precedence over days_interval, minus the overlap."""
+        bendito_extractor.table.days_interval = 3
+        bendito_extractor.table.use_watermark = True
+        bendito_extractor.table.watermark_overlap = 15
+        bendito_extractor.table.last_successful_sync_at = "2024-05-10T12:00:00+00:00"
+        assert bendito_extractor.get_keyset_query() == (
+            'select * from public."invoice_item" where true'
+            " and time_modification >= '2024-05-10 11:45:00+00:00'::timestamptz"
+            ' order by "id" asc'
+        )
+
+    def test_watermark_is_normalised_to_utc(self, bendito_extractor):
+        """Test that a sync timestamp recorded with another offset is filtered in UTC."""
+        bendito_extractor.table.use_watermark = True
+        bendito_extractor.table.watermark_overlap = 15
+        bendito_extractor.table.last_successful_sync_at = "2024-05-10T09:00:00-03:00"
+        assert (
+            "time_modification >= '2024-05-10 11:45:00+00:00'::timestamptz"
+            in bendito_extractor.get_keyset_query()
+        )
+
+    def test_naive_watermark_is_utc(self, bendito_extractor):
+        """Test that a sync timestamp without an offset, read back in a UTC session, is taken as UTC."""
+        bendito_extractor.table.use_watermark = True
+        bendito_extractor.table.watermark_overlap = 15
+        bendito_extractor.table.last_successful_sync_at = "2024-05-10T12:00:00"
+        assert (
+            "time_modification >= '2024-05-10 11:45:00+00:00'::timestamptz"
+            in bendito_extractor.get_keyset_query()
+        )
+
+    def test_read_page_streams_csv(self, bendito_extractor, mocker):
+        """Test that the raw response bytes are decoded once as UTF-8 and parsed in chunks."""
+
+        class StreamedResponse:
+            status_code = 200
+
+            def __init__(self, body):
+                self.raw = io.BufferedReader(io.BytesIO(body))
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        body = b"id;name\r\n1;Jos\xc3\xa9\r\n2;Ana\r\n3;Jo\xc3\xa3o\r\n"
+        post = mocker.patch.object(
+            bendito_extractor.session, "request", return_value=StreamedResponse(body)
+        )
+        bendito_extractor.CSV_CHUNK_SIZE = 2
+
+        page = bendito_extractor._read_page("select 1")
+
+        assert post.call_args.kwargs["stream"] is True
+        assert page["id"].tolist() == ["1", "2", "3"]
+        assert page["name"].tolist() == ["José", "Ana", "João"]
+
+    def test_read_page_raises_on_error_status(self, bendito_extractor, mocker):
+        """Test that an error response is raised instead of being parsed as CSV."""
+        error = requests.Response()
+        error.status_code = 400
+        error.raw = io.BytesIO(b'{"error": "syntax error at or near \\"selec\\""}')
+        error.url = "https://bi.example.com/query"
+        mocker.patch.object(bendito_extractor.session, "request", return_value=error)
+
+        with pytest.raises(requests.HTTPError):
+            bendito_extractor._read_page("selec 1")
+
+    def test_post_data_honours_retry_after(self, bendito_extractor, mocker):
+        """Test that a 429 is retried after its Retry-After and slows the origin limiter down."""
+        throttled = mocker.MagicMock(status_code=429, headers={"Retry-After": "2"})
+        ok = mocker.MagicMock(status_code=200, headers={})
+        mocker.patch.object(bendito_extractor.session, "request", side_effect=[throttled, ok])
+        limiter = mocker.MagicMock()
+        bendito_extractor.rate_limiter = limiter
+
+        response = bendito_extractor.post_data("{}")
+
+        assert response is ok
+        assert bendito_extractor.session.request.call_count == 2
+        limiter.on_throttle.assert_called_once_with(2.0)
+        limiter.on_success.assert_called_once()
+        throttled.close.assert_called_once()
+
+    def test_fetch_keyset_paginated(self, bendito_extractor, mocker):
+        """Test that each page seeks past the last key of the previous one."""
+        pages = [
+            pd.DataFrame({"id": ["1", "2"]}),
+            pd.DataFrame({"id": ["3", "4"]}),
+            pd.DataFrame({"id": ["5"]}),
+        ]
+        mocker.patch.object(bendito_extractor, "_read_page", side_effect=pages)
+
+        results = list(bendito_extractor.fetch_keyset_paginated(page_size=2))
+
+        assert len(results) == 3
+        queries = [c.args[0] for c in bendito_extractor._read_page.call_args_list]
+        assert queries[0].endswith('where true order by "id" asc LIMIT 2')
+        assert '"id" > \'2\'' in queries[1]
+        assert '"id" > \'4\'' in queries[2]
+        assert all("OFFSET" not in query for query in queries)
+
+    def test_run_falls_back_to_offset(self, bendito_extractor, mocker):
+        """Test that tables without unique_id_property keep OFFSET pagination."""
+        bendito_extractor.table.unique_id_property = None
+        mocker.patch.object(
+            bendito_extractor,
+            "fetch_paginated",
+            return_value=iter([pd.DataFrame({"id": ["1"], "name": ["a"]})]),
+        )
+        mocker.patch.object(bendito_extractor, "fetch_keyset_paginated")
+
+        result = bendito_extractor.run(page_size=10)
+
+        bendito_extractor.fetch_keyset_paginated.assert_not_called()
+        assert result["ID"].tolist() == ["1"]
+
+    def test_get_partitions(self, bendito_extractor):
+        """Test that the key range is split in disjoint, contiguous slices."""
+        bendito_extractor.partitions = 4
+        partitions = bendito_extractor.get_partitions(1, 10)
+
+        assert partitions[0][0] == 1
+        assert partitions[-1][1] == 11
+        assert all(upper == lower for (_, upper), (lower, _) in zip(partitions, partitions[1:]))
+
+    def test_get_partitions_small_range(self, bendito_extractor):
+        """Test that a range smaller than the partition count is not over-split."""
+        bendito_extractor.partitions = 16
+        assert bendito_extractor.get_partitions(5, 6) == [(5, 6), (6, 7)]
+
+    def test_fetch_partitioned(self, bendito_extractor, mocker):
+        """Test that each partition is fetched with its own key bounds."""
+        bendito_extractor.partitions = 2
+        mocker.patch.object(bendito_extractor, "get_key_range", return_value=(1, 4))
+        mocker.patch.object(
+            bendito_extractor,
+            "fetch_keyset_paginated",
+            side_effect=lambda page_size, lower, upper: iter(
+                [pd.DataFrame({"id": [str(i) for i in range(lower, upper)]})]
+            ),
+        )
+
+        pages = bendito_extractor.fetch_partitioned(page_size=10)
+
+        assert sorted(pd.concat(pages)["id"].tolist()) == ["1", "2", "3", "4"]
+
+    def test_fetch_partitioned_streams_pages(self, bendito_extractor, mocker):
+        """Test that pages are yielded before the partitions are fully extracted."""
+        bendito_extractor.partitions = 2
+        bendito_extractor.max_workers = 2
+        mocker.patch.object(bendito_extractor, "get_key_range", return_value=(1, 2))
+        fetched = []
+
+        def fetch_keyset_paginated(page_size, lower, upper):
+            for page in range(100):
+                fetched.append((lower, page))
+                yield pd.DataFrame({"id": [f"{lower}-{page}"]})
+
+        mocker.patch.object(bendito_extractor, "fetch_keyset_paginated", side_effect=fetch_keyset_paginated)
+
+        pages = bendito_extractor.fetch_partitioned(page_size=1)
+        next(pages)
+        pages.close()
+
+        # Workers stop at the bounded queue instead of materialising their partitions
+        assert len(fetched) < 200
+
+    def test_fetch_partitioned_non_numeric_key(self, bendito_extractor, mocker):
+        """Test the sequential fallback when the key range is not numeric."""
+        mocker.patch.object(bendito_extractor, "get_key_range", return_value=None)
+        mocker.patch.object(
+            bendito_extractor,
+            "fetch_keyset_paginated",
+            return_value=iter([pd.DataFrame({"id": ["a"]})]),
+        )
+
+        pages = bendito_extractor.fetch_partitioned(page_size=10)
+
+        assert len(list(pages)) == 1
+        bendito_extractor.fetch_keyset_paginated.assert_called_once_with(10)
@@ -0,0 +1,153 @@
+import json
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+import pandas as pd
+from src.extractors.base_extractor import BufferedResponse
+from src.extractors.bitrix_extractor import BitrixAPIExtractor
+from src.metadata.data_table import DataTable
+
+
+class TestBitrixAPIExtractor:
+    """Tests for the BitrixAPIExtractor class."""
+
+    @pytest.fixture
+    def bitrix_extractor(self, monkeypatch):
+        """Fixture for creating a BitrixAPIExtractor instance."""
+        monkeypatch.setenv("BITRIX_TOKEN", "test_token")
+        monkeypatch.setenv("BITRIX_URL", "test.bitrix24.com")
+        monkeypatch.setenv("BITRIX_USER_ID", "1")
+        table = DataTable(
+            origin="bitrix",
+            source_name="crm.deal",
+            source_identifier="crm.deal",
+            extraction_strategy="batch",
+            days_interval=0,
+        )
+        return BitrixAPIExtractor(table)
+
+    @staticmethod
+    def _response(payload, status_code=200):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = payload
+        response.text = json.dumps(payload)
+        return response
+
+    def test_get_extract_function_batch(self, bitrix_extractor):
+        """Test that the 'batch' strategy maps to extract_as_batch."""
+        assert bitrix_extractor.get_extract_function("batch") == bitrix_extractor.extract_as_batch
+
+    def test_fetch_batch(self, bitrix_extractor, mocker):
+        """Test that batch results and errors are fanned back out by ID."""
+        payload = {
+            "result": {
+                "result": {"1": {"ID": "1", "TITLE": "Deal 1"}},
+                "result_error": {"2": {"error": "NOT_FOUND", "error_description": "Not found"}},
+            }
+        }
+        mocker.patch.object(
+            bitrix_extractor, "_request", return_value=self._response(payload)
+        )
+
+        records = bitrix_extractor.fetch_batch(["1", "2"])
+
+        bitrix_extractor._request.assert_called_once_with(
+            "post",
+            "https://test.bitrix24.com/rest/1/test_token/batch.json",
+            json={"halt": 0, "cmd": {"1": "crm.deal.get?ID=1", "2": "crm.deal.get?ID=2"}},
+        )
+        assert records[0]["SUCCESS"] is True
+        assert json.loads(records[0]["CONTENT"]) == {"ID": "1", "TITLE": "Deal 1"}
+        assert records[1]["SUCCESS"] is False
+        assert json.loads(records[1]["CONTENT"])["ERROR"]["error"] == "NOT_FOUND"
+
+    def test_fetch_batch_invalid_response(self, bitrix_extractor, mocker):
+        """Test that a failed batch call yields an error record for every ID."""
+        response = self._response({"error": "QUERY_LIMIT_EXCEEDED"}, status_code=503)
+        mocker.patch.object(bitrix_extractor, "_request", return_value=response)
+
+        records = bitrix_extractor.fetch_batch(["1", "2"])
+
+        assert [record["ID"] for record in records] == ["1", "2"]
+        assert not any(record["SUCCESS"] for record in records)
+
+    def test_extract_as_batch(self, bitrix_extractor, mocker):
+        """Test that IDs are grouped in chunks of BATCH_SIZE."""
+        ids = [str(i) for i in range(1, 121)]
+        mocker.patch.object(
+            bitrix_extractor, "fetch_list", return_value=pd.DataFrame({"ID": ids}, dtype=str)
+        )
+        mocker.patch.object(
+            bitrix_extractor,
+            "fetch_batch",
+            side_effect=lambda chunk: [
+                {"ID": object_id, "SUCCESS": True, "CONTENT": "{}"} for object_id in chunk
+            ],
+        )
+
+        result = bitrix_extractor.extract_as_batch()
+
+        assert bitrix_extractor.fetch_batch.call_count == 3
+        assert list(result.columns) == ["ID", "SUCCESS", "CONTENT"]
+        assert result["ID"].tolist() == ids
+
+    def test_extract_as_table_concurrent(self, bitrix_extractor, mocker):
+        """Test that detail fetches run through the worker pool and keep the ID order."""
+        ids = [str(i) for i in range(1, 21)]
+        mocker.patch.object(
+            bitrix_extractor, "fetch_list", return_value=pd.DataFrame({"ID": ids}, dtype=str)
+        )
+        mocker.patch.object(
+            bitrix_extractor,
+            "_request",
+            side_effect=lambda method, url: self._response(
+                {"result": {"ID": url.rsplit("=", 1)[-1]}}
+            ),
+        )
+        bitrix_extractor.max_workers = 4
+
+        result = bitrix_extractor.extract_as_table()
+
+        assert bitrix_extractor._request.call_count == len(ids)
+        assert result["ID"].tolist() == ids
+        assert result["SUCCESS"].tolist() == ["True"] * len(ids)
+        assert [json.loads(content)["ID"] for content in result["CONTENT"]] == ids
+
+    def test_extract_as_list_keeps_typed_values(self, bitrix_extractor, mocker):
+        """Test that list mode serializes the API records directly, page by page."""
+        pages = [
+            [{"ID": "1", "OPPORTUNITY": 10.5, "PHONE": [{"VALUE": "123"}], "CLOSED": None}],
+            [{"TITLE": "no id"}],
+        ]
+        mocker.patch.object(bitrix_extractor, "iter_list_pages", return_value=iter(pages))
+        bitrix_extractor.table.extraction_strategy = "list"
+
+        batches = list(bitrix_extractor.iter_batches())
+
+        assert len(batches) == 2
+        assert batches[0]["ID"].tolist() == ["1"]
+        assert json.loads(batches[0]["CONTENT"][0]) == pages[0][0]
+        assert batches[1]["ID"].tolist() == ["1"]
+        assert batches[1]["SUCCESS"].tolist() == ["True"]
+
+    def test_arun_batch(self, bitrix_extractor, mocker):
+        """Test that the asyncio path lists the IDs and fetches them through batch.json."""
+        ids = [str(i) for i in range(1, 4)]
+
+        async def arequest(method, url, **kwargs):
+            if method == "get":
+                payload = {"result": [{"ID": object_id} for object_id in ids]}
+            else:
+                commands = kwargs["json"]["cmd"]
+                payload = {"result": {"result": {key: {"ID": key} for key in commands}}}
+            return BufferedResponse(200, json.dumps(payload).encode(), url=url)
+
+        mocker.patch.object(bitrix_extractor, "_arequest", side_effect=arequest)
+
+        result = asyncio.run(bitrix_extractor.arun())
+
+        methods = [c.args[0] for c in bitrix_extractor._arequest.call_args_list]
+        assert methods == ["get", "post"]
+        assert result["ID"].tolist() == ids
+        assert [json.loads(content)["ID"] for content in result["CONTENT"]] == ids
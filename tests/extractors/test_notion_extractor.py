@@ -2,7 +2,9 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock, call
 import pandas as pd
+from datetime import datetime, timezone
 from src.extractors.notion_extractor import NotionDatabaseAPIExtractor
+from src.metadata.data_table import DataTable
 
 
 class TestNotionDatabaseAPIExtractor:
@@ -167,4 +169,154 @@ class TestNotionDatabaseAPIExtractor:
         assert result.iloc[0]['id'] == '1'
         assert result.iloc[0]['title'] == 'Test 1'
         assert result.iloc[1]['id'] == '2'
-        assert result.iloc[1]['title'] == 'Test 2' 
\ No newline at end of file
+        assert result.iloc[1]['title'] == 'Test 2' 
+
+
+class TestNotionSlicedExtraction:
+    """Tests for the created_time sliced extraction mode."""
+
+    @pytest.fixture
+    def sliced_extractor(self, monkeypatch):
+        """Fixture for a Notion extractor configured with the 'sliced' strategy."""
+        monkeypatch.setenv("NOTION_APIKEY", "test_token")
+        table = DataTable(
+            origin="notion",
+            source_name="tasks",
+            source_identifier="database_id",
+            extraction_strategy="sliced",
+            days_interval=0,
+        )
+        return NotionDatabaseAPIExtractor(table, max_workers=2, slices=3)
+
+    def test_get_slices(self, sliced_extractor):
+        """Test that the windows are contiguous and open-ended on both sides."""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        now = datetime(2024, 1, 4, tzinfo=timezone.utc)
+
+        assert sliced_extractor.get_slices(start, now) == [
+            (None, "2024-01-02T00:00:00+00:00"),
+            ("2024-01-02T00:00:00+00:00", "2024-01-03T00:00:00+00:00"),
+            ("2024-01-03T00:00:00+00:00", None),
+        ]
+
+    def test_get_slice_filter_keeps_incremental_filter(self, sliced_extractor):
+        """Test that the window bounds are combined with the last_edited_time filter."""
+        query_filter = {"filter": {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2024-01-01"}}}
+
+        slice_filter = sliced_extractor._get_slice_filter("2024-01-02", None, query_filter)
+
+        assert slice_filter == {
+            "filter": {
+                "and": [
+                    {"timestamp": "created_time", "created_time": {"on_or_after": "2024-01-02"}},
+                    query_filter["filter"],
+                ]
+            }
+        }
+        assert sliced_extractor._get_slice_filter(None, None) is None
+
+    def test_iter_batches_deduplicates_pages(self, sliced_extractor, mocker):
+        """Test that each window is walked with its own filter and repeated page ids are dropped."""
+
+        def post_data(payload=None):
+            if "sorts" in payload:
+                return {"results": [{"id": "a", "created_time": "2024-01-01T00:00:00.000Z"}]}
+            conditions = payload["filter"]["and"] if "and" in payload["filter"] else [payload["filter"]]
+            first_window = any("before" in condition.get("created_time", {}) for condition in conditions) and not any(
+                "on_or_after" in condition.get("created_time", {}) for condition in conditions
+            )
+            ids = ["a", "b"] if first_window else ["b", "c"]
+            return {"results": [{"id": page_id} for page_id in ids], "has_more": False}
+
+        mocker.patch.object(sliced_extractor, "post_data", side_effect=post_data)
+        sliced_extractor.slices = 2
+
+        result = pd.concat(list(sliced_extractor.iter_batches()), ignore_index=True)
+
+        assert sorted(result["ID"].tolist()) == ["a", "b", "c"]
+        assert sliced_extractor.post_data.call_count == 3
+
+
+    def test_fetch_sliced_raises_window_errors(self, sliced_extractor, mocker):
+        """Test that a failing window stops the extraction with its error."""
+        mocker.patch.object(
+            sliced_extractor,
+            "post_data",
+            return_value={"results": [{"id": "a", "created_time": "2024-01-01T00:00:00.000Z"}]},
+        )
+
+        def fetch_paginated(slice_filter):
+            raise RuntimeError("window failed")
+            yield
+
+        mocker.patch.object(sliced_extractor, "fetch_paginated", side_effect=fetch_paginated)
+        sliced_extractor.slices = 2
+
+        with pytest.raises(RuntimeError, match="window failed"):
+            list(sliced_extractor.fetch_sliced())
+
+class TestNotionProjection:
+    """Tests for page sizing and the filter_properties projection."""
+
+    @pytest.fixture
+    def table(self, monkeypatch):
+        """Fixture for a Notion DataTable."""
+        monkeypatch.setenv("NOTION_APIKEY", "test_token")
+        return DataTable(
+            origin="notion",
+            source_name="tasks",
+            source_identifier="database_id",
+            days_interval=0,
+        )
+
+    @staticmethod
+    def _write_models(models_dir, *models):
+        models_dir.mkdir()
+        for name, sql in models:
+            (models_dir / name).write_text(sql)
+
+    def test_page_size_is_capped(self, table):
+        """Test that the configured page size is sent and capped at 100."""
+        table.page_size = 500
+        extractor = NotionDatabaseAPIExtractor(table)
+
+        assert extractor._get_next_payload("cursor") == {"page_size": 100, "start_cursor": "cursor"}
+
+    def test_explicit_filter_properties(self, table):
+        """Test that a comma separated list is appended to the query endpoint without re-encoding."""
+        table.filter_properties = "title, %3EtXq"
+        extractor = NotionDatabaseAPIExtractor(table)
+
+        assert extractor._get_query_endpoint() == (
+            "https://api.notion.com/v1/databases/database_id/query"
+            "?filter_properties=title&filter_properties=%3EtXq"
+        )
+
+    def test_model_property_ids(self, table, tmp_path):
+        """Test that the ids read by the models of the raw table are collected."""
+        models_dir = tmp_path / "notion"
+        self._write_models(
+            models_dir,
+            ("ntn_processed_tasks.sql", (
+                "select (select value from jsonb_each(\"CONTENT\" -> 'properties') where value ->> 'id' = 'cQuD') as a,\n"
+                "(select value from jsonb_each(\"CONTENT\" -> 'properties') where value ->> 'id' = 'title') as b\n"
+                "from {{ source('notion', 'ntn_raw_tasks') }}"
+            )),
+            ("ntn_processed_other.sql", "select value ->> 'id' = 'zzzz' from {{ source('notion', 'ntn_raw_other') }}"),
+        )
+        extractor = NotionDatabaseAPIExtractor(table)
+
+        assert extractor.get_model_property_ids(models_dir) == ["cQuD", "title"]
+
+    def test_model_property_ids_unsafe(self, table, tmp_path):
+        """Test that a model enumerating every property disables the projection."""
+        models_dir = tmp_path / "notion"
+        self._write_models(
+            models_dir,
+            ("ntn_processed_properties.sql", (
+                "select jsonb_each(\"CONTENT\"->'properties') from {{ source('notion', 'ntn_raw_tasks') }}"
+            )),
+        )
+        extractor = NotionDatabaseAPIExtractor(table)
+
+        assert extractor.get_model_property_ids(models_dir) is None
@@ -0,0 +1,108 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from src.extractors.base_extractor import GenericExtractor
+from src.extractors.spool import RecordSpool
+from src.metadata.data_table import DataTable
+from src.streams.base_stream import Stream
+
+
+class SpooledStream(Stream):
+    """Minimal stream over a fixed list of extracted batches."""
+
+    def __init__(self, table, batches):
+        self.table = table
+        self.batches = batches
+
+    def set_extractor(self, **kwargs):
+        self.extractor = MagicMock()
+        self.extractor.iter_batches.side_effect = lambda: iter(self.batches)
+
+    def extract_stream(self, **kwargs):
+        return self.extract_records()
+
+    def set_loader(self, **kwargs):
+        self.loader = MagicMock()
+
+    def load_stream(self, **kwargs):
+        return self.stream_to_loader(**kwargs)
+
+
+class TestRecordSpool:
+    """Tests for the local NDJSON spool of extracted batches."""
+
+    @pytest.fixture
+    def table(self):
+        """Fixture for an incremental Bitrix DataTable."""
+        return DataTable(origin="bitrix", source_name="crm.deal", days_interval=3)
+
+    @staticmethod
+    def _batch(*ids):
+        return GenericExtractor.to_record_frame(
+            {
+                "ID": list(ids),
+                "SUCCESS": "True",
+                "CONTENT": [json.dumps({"ID": object_id, "TITLE": "Negócio"}) for object_id in ids],
+            }
+        )
+
+    def test_tee_and_replay(self, table, tmp_path):
+        """Test that a complete run is replayed batch by batch with its manifest."""
+        spool = RecordSpool(tmp_path, table, run_id="20240101T000000")
+        batches = [self._batch("1", "2"), self._batch(), self._batch("3")]
+
+        assert len(list(spool.tee(iter(batches)))) == 3
+
+        replayed = RecordSpool.latest(tmp_path, table)
+        assert replayed.run_id == "20240101T000000"
+        assert replayed.records == 3
+        assert replayed.incremental is True
+        frames = list(replayed.iter_batches())
+        assert [frame["ID"].tolist() for frame in frames] == [["1", "2"], ["3"]]
+        assert json.loads(frames[0]["CONTENT"][0])["TITLE"] == "Negócio"
+        assert frames[0]["SUCCESS"].tolist() == ["True", "True"]
+
+    def test_failed_extraction_is_discarded(self, table, tmp_path):
+        """Test that a run interrupted by an error leaves no replayable spool."""
+
+        def batches():
+            yield self._batch("1")
+            raise RuntimeError("API indisponível")
+
+        spool = RecordSpool(tmp_path, table)
+        with pytest.raises(RuntimeError):
+            list(spool.tee(batches()))
+
+        assert not spool.run_dir.exists()
+        assert RecordSpool.latest(tmp_path, table) is None
+
+    def test_cleanup_keeps_latest_runs(self, table, tmp_path):
+        """Test that only KEEP_RUNS complete runs are kept per table."""
+        for day in range(1, 6):
+            spool = RecordSpool(tmp_path, table, run_id=f"2024010{day}T000000")
+            list(spool.tee(iter([self._batch(str(day))])))
+
+        runs = sorted(path.name for path in spool.table_dir.iterdir())
+        assert runs == ["20240103T000000", "20240104T000000", "20240105T000000"]
+        assert RecordSpool.latest(tmp_path, table).run_id == "20240105T000000"
+
+    def test_failed_streamed_load_keeps_replayable_spool(self, table, tmp_path):
+        """Test that a load failure under streaming still completes the spool, and the replay loads it."""
+        batches = [self._batch(str(i)) for i in range(10)]
+        stream = SpooledStream(table, batches)
+        stream.set_loader()
+        stream.loader.load_batch.side_effect = RuntimeError("connection lost")
+        stream.set_spool(tmp_path)
+
+        with pytest.raises(RuntimeError, match="connection lost"):
+            stream.stream_to_loader(mode="auto", queue_size=1)
+        stream.loader.abort_load.assert_called_once_with("upsert")
+
+        replay = SpooledStream(table, [])
+        replay.set_loader()
+        replay.loader.load_batch.side_effect = lambda batch, chunksize: len(batch)
+        replay.set_spool(tmp_path, replay=True)
+
+        assert replay.spool.records == 10
+        assert replay.stream_to_loader(mode="auto") == 10
+        replay.loader.finalize_load.assert_called_once_with("upsert")
@@ -1,5 +1,6 @@
 import pytest
 import pandas as pd
+from io import StringIO
 from unittest.mock import patch, MagicMock, call
 from sqlalchemy import text
 import psycopg2
@@ -258,4 +259,404 @@ other_table;id;integer;
             
             assert args[0] == "test_table"  # Table name
             assert kwargs["schema"] == "test_schema"
-            assert kwargs["if_exists"] == "append" 
\ No newline at end of file
+            assert kwargs["if_exists"] == "append" 
+
+class TestPostgresLoaderCopy:
+    """Tests for the COPY based load path of PostgresLoader."""
+
+    @pytest.fixture
+    def raw_table(self):
+        """Fixture for a schemaless raw DataTable."""
+        from src.metadata.data_table import DataTable
+
+        return DataTable(origin="bitrix", source_name="crm.deal", days_interval=0)
+
+    @pytest.fixture
+    def records(self):
+        """Fixture for ID/SUCCESS/CONTENT records with JSON needing CSV escaping."""
+        return pd.DataFrame(
+            {
+                "ID": ["1", "2"],
+                "SUCCESS": ["True", "False"],
+                "CONTENT": ['{"TITLE": "Deal, \\"quoted\\""}', '{"ERROR": "line\\nbreak"}'],
+            }
+        )
+
+    def test_load_batch_uses_copy(self, mock_sqlalchemy_engine, raw_table, records):
+        """Test that load_batch streams a CSV buffer through copy_expert."""
+        loader = PostgresLoader(engine=mock_sqlalchemy_engine, table=raw_table)
+        connection = mock_sqlalchemy_engine.raw_connection.return_value
+        cursor = connection.cursor.return_value.__enter__.return_value
+        copied = {}
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(sql=sql, data=buffer.read())
+
+        loaded_rows = loader.load_batch(records)
+
+        assert loaded_rows == 2
+        assert copied["sql"] == (
+            'COPY bitrix.btx_raw_crm_deal ("ID", "SUCCESS", "CONTENT") FROM STDIN WITH (FORMAT csv)'
+        )
+        parsed = pd.read_csv(StringIO(copied["data"]), header=None, dtype=str)
+        assert parsed[2].tolist() == records["CONTENT"].tolist()
+        connection.commit.assert_called_once()
+        connection.close.assert_called_once()
+
+    def test_load_batch_copies_arrow_columns(self, mock_sqlalchemy_engine, raw_table, records):
+        """Test that Arrow-backed frames are written by the pyarrow CSV writer."""
+        pytest.importorskip("pyarrow")
+        loader = PostgresLoader(engine=mock_sqlalchemy_engine, table=raw_table)
+        connection = mock_sqlalchemy_engine.raw_connection.return_value
+        cursor = connection.cursor.return_value.__enter__.return_value
+        copied = {}
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(data=buffer.read())
+
+        assert loader.load_batch(records.astype("string[pyarrow]")) == 2
+
+        assert isinstance(copied["data"], bytes)
+        parsed = pd.read_csv(StringIO(copied["data"].decode("utf-8")), header=None, dtype=str)
+        assert parsed[2].tolist() == records["CONTENT"].tolist()
+
+    def test_load_batch_rolls_back_on_error(self, mock_sqlalchemy_engine, raw_table, records):
+        """Test that a failed COPY is rolled back and re-raised."""
+        loader = PostgresLoader(engine=mock_sqlalchemy_engine, table=raw_table)
+        connection = mock_sqlalchemy_engine.raw_connection.return_value
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = psycopg2.DataError("invalid input syntax for type json")
+
+        with pytest.raises(psycopg2.DataError):
+            loader.load_batch(records)
+
+        connection.rollback.assert_called_once()
+        connection.close.assert_called_once()
+
+    def test_load_batch_insert_fallback(self, mock_sqlalchemy_engine, raw_table, records, mocker):
+        """Test that the table's load_method can select the to_sql path."""
+        raw_table.load_method = "insert"
+        loader = PostgresLoader(engine=mock_sqlalchemy_engine, table=raw_table)
+        to_sql = mocker.patch.object(pd.DataFrame, "to_sql", return_value=2)
+
+        assert loader.load_batch(records, chunksize=500) == 2
+        to_sql.assert_called_once()
+        assert to_sql.call_args.kwargs["chunksize"] == 500
+        mock_sqlalchemy_engine.raw_connection.assert_not_called()
+
+
+class TestPostgresLoaderSwap:
+    """Tests for the shadow table load modes (swap and upsert) of PostgresLoader."""
+
+    @pytest.fixture
+    def loader(self, mock_sqlalchemy_engine):
+        """Fixture for a PostgresLoader targeting a schemaless raw table."""
+        from src.metadata.data_table import DataTable
+
+        table = DataTable(origin="bendito", source_name="invoice_item", days_interval=0)
+        return PostgresLoader(engine=mock_sqlalchemy_engine, table=table)
+
+    NO_PRIVILEGES = {"owner": "loader", "comment": None, "options": [], "grants": []}
+
+    @staticmethod
+    def _executed(engine):
+        connection = engine.begin.return_value.__enter__.return_value
+        return [str(c.args[0]) for c in connection.execute.call_args_list]
+
+    def test_prepare_load_targets_staging(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that swap mode loads into the staging table and leaves the live table untouched."""
+        mocker.patch.object(loader, "check_if_schema_exists", return_value=True)
+        inspector = MagicMock()
+        inspector.get_table_names.return_value = ["bdt_raw_invoice_item"]
+        mocker.patch("src.loaders.postgres_loader.inspect", return_value=inspector)
+
+        loader.prepare_load(mode="swap")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        assert loader.load_target == "bdt_raw_invoice_item__staging"
+        assert not any("TRUNCATE" in sql for sql in executed)
+        assert (
+            'ALTER TABLE bendito.bdt_raw_invoice_item ADD COLUMN IF NOT EXISTS "__updated_at" timestamptz NOT NULL DEFAULT now()'
+            in executed
+        )
+        assert (
+            'ALTER TABLE bendito.bdt_raw_invoice_item ADD COLUMN IF NOT EXISTS "HASH" varchar GENERATED ALWAYS AS (md5("CONTENT"::text)) STORED'
+            in executed
+        )
+        assert (
+            "CREATE TABLE bendito.bdt_raw_invoice_item__staging (LIKE bendito.bdt_raw_invoice_item INCLUDING ALL)"
+            in executed
+        )
+
+    def test_metadata_columns_skip_alter_when_present(self, loader, mock_sqlalchemy_engine):
+        """Test that no ALTER TABLE (and its ACCESS EXCLUSIVE lock) runs when the columns exist."""
+        reader = mock_sqlalchemy_engine.connect.return_value.__enter__.return_value
+        reader.execute.return_value = [("ID",), ("SUCCESS",), ("CONTENT",), ("HASH",), ("__updated_at",)]
+
+        loader.create_metadata_columns()
+
+        mock_sqlalchemy_engine.begin.assert_not_called()
+
+    def test_metadata_columns_add_only_missing(self, loader, mock_sqlalchemy_engine):
+        """Test that only the missing metadata column is added."""
+        reader = mock_sqlalchemy_engine.connect.return_value.__enter__.return_value
+        reader.execute.return_value = [("ID",), ("SUCCESS",), ("CONTENT",), ("__updated_at",)]
+
+        loader.create_metadata_columns()
+
+        assert self._executed(mock_sqlalchemy_engine) == [
+            'ALTER TABLE bendito.bdt_raw_invoice_item ADD COLUMN IF NOT EXISTS "HASH" varchar GENERATED ALWAYS AS (md5("CONTENT"::text)) STORED'
+        ]
+
+    def test_finalize_swaps_by_rename(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that the staging table is renamed in place of the live one."""
+        mocker.patch.object(loader, "get_dependent_views", return_value=[])
+        mocker.patch.object(loader, "get_indexes", return_value=[])
+        mocker.patch.object(loader, "get_privileges", return_value=self.NO_PRIVILEGES)
+        mocker.patch.object(loader, "update_key_catalog")
+
+        loader.finalize_load(mode="swap")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        assert "ALTER TABLE bendito.bdt_raw_invoice_item RENAME TO bdt_raw_invoice_item__old" in executed
+        assert "ALTER TABLE bendito.bdt_raw_invoice_item__staging RENAME TO bdt_raw_invoice_item" in executed
+        assert "DROP TABLE bendito.bdt_raw_invoice_item__old" in executed
+        assert not any("INSERT" in sql or "TRUNCATE" in sql for sql in executed)
+        mock_sqlalchemy_engine.begin.assert_called_once()
+
+    def test_finalize_swap_recreates_dependent_views(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that dependent views are dropped before the rename and recreated after it, in one transaction."""
+        views = [
+            {"schema": "bendito", "name": "bdt_processed_invoice_item", "kind": "v",
+             "definition": " SELECT * FROM bendito.bdt_raw_invoice_item;"},
+            {"schema": "bendito", "name": "bdt_invoice_item", "kind": "v",
+             "definition": " SELECT * FROM bendito.bdt_processed_invoice_item;"},
+        ]
+        mocker.patch.object(loader, "get_dependent_views", return_value=views)
+        mocker.patch.object(loader, "get_indexes", return_value=[])
+        mocker.patch.object(loader, "get_privileges", return_value=self.NO_PRIVILEGES)
+        mocker.patch.object(loader, "update_key_catalog")
+
+        loader.finalize_load(mode="swap")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        drop = executed.index('DROP VIEW IF EXISTS "bendito"."bdt_processed_invoice_item" CASCADE')
+        rename = executed.index("ALTER TABLE bendito.bdt_raw_invoice_item__staging RENAME TO bdt_raw_invoice_item")
+        create = executed.index(
+            'CREATE VIEW "bendito"."bdt_processed_invoice_item" AS  SELECT * FROM bendito.bdt_raw_invoice_item;'
+        )
+        create_nested = executed.index(
+            'CREATE VIEW "bendito"."bdt_invoice_item" AS  SELECT * FROM bendito.bdt_processed_invoice_item;'
+        )
+        assert drop < rename < create < create_nested
+        mock_sqlalchemy_engine.begin.assert_called_once()
+
+    def test_finalize_swap_renames_staging_indexes(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that the staging indexes take the names of the matching live indexes."""
+        unique_id = ('btree ("ID")', True, False)
+        mocker.patch.object(loader, "get_dependent_views", return_value=[])
+        mocker.patch.object(
+            loader,
+            "get_indexes",
+            side_effect=[
+                [("bdt_raw_invoice_item__id_unique", unique_id)],
+                [("bdt_raw_invoice_item__staging_ID_idx", unique_id)],
+            ],
+        )
+        mocker.patch.object(loader, "get_privileges", return_value=self.NO_PRIVILEGES)
+        mocker.patch.object(loader, "update_key_catalog")
+
+        loader.finalize_load(mode="swap")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        rename = executed.index(
+            'ALTER INDEX bendito."bdt_raw_invoice_item__staging_ID_idx" RENAME TO "bdt_raw_invoice_item__id_unique"'
+        )
+        assert rename > executed.index("DROP TABLE bendito.bdt_raw_invoice_item__old")
+
+    def test_finalize_swap_reapplies_privileges(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that grants, ownership and comments of the raw table and its views survive the swap."""
+        views = [
+            {"schema": "bendito", "name": "bdt_processed_invoice_item", "kind": "v",
+             "definition": " SELECT * FROM bendito.bdt_raw_invoice_item;"},
+        ]
+        mocker.patch.object(loader, "get_dependent_views", return_value=views)
+        mocker.patch.object(loader, "get_indexes", return_value=[])
+        mocker.patch.object(
+            loader,
+            "get_privileges",
+            side_effect=[
+                {"owner": "loader", "comment": None, "options": ["fillfactor=90"],
+                 "grants": [("analyst", "SELECT", False)]},
+                {"owner": "dbt", "comment": "Notas processadas", "options": ["security_barrier=true"],
+                 "grants": [("bi_reader", "SELECT", True), ("PUBLIC", "SELECT", False)]},
+            ],
+        )
+        mocker.patch.object(loader, "update_key_catalog")
+
+        loader.finalize_load(mode="swap")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        rename = executed.index("ALTER TABLE bendito.bdt_raw_invoice_item__staging RENAME TO bdt_raw_invoice_item")
+        grant = executed.index("GRANT SELECT ON bendito.bdt_raw_invoice_item TO analyst")
+        assert rename < grant
+        assert "ALTER TABLE bendito.bdt_raw_invoice_item OWNER TO loader" in executed
+        assert "ALTER TABLE bendito.bdt_raw_invoice_item SET (fillfactor=90)" in executed
+        view = '"bendito"."bdt_processed_invoice_item"'
+        create = executed.index(f"CREATE VIEW {view} AS  SELECT * FROM bendito.bdt_raw_invoice_item;")
+        assert executed[create + 1:create + 6] == [
+            f"ALTER VIEW {view} OWNER TO dbt",
+            f"ALTER VIEW {view} SET (security_barrier=true)",
+            f"GRANT SELECT ON {view} TO bi_reader WITH GRANT OPTION",
+            f"GRANT SELECT ON {view} TO PUBLIC",
+            f"COMMENT ON VIEW {view} IS :comment",
+        ]
+        mock_sqlalchemy_engine.begin.assert_called_once()
+
+    def test_failed_swap_keeps_catalog_and_drops_staging(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that a failed swap leaves the key catalog alone and discards the staging table."""
+        mocker.patch.object(loader, "swap_staging_table", side_effect=RuntimeError("lock timeout"))
+        update_key_catalog = mocker.patch.object(loader, "update_key_catalog")
+
+        with pytest.raises(RuntimeError, match="lock timeout"):
+            loader.finalize_load(mode="swap")
+
+        update_key_catalog.assert_not_called()
+        assert self._executed(mock_sqlalchemy_engine) == [
+            "DROP TABLE IF EXISTS bendito.bdt_raw_invoice_item__staging"
+        ]
+
+    def test_abort_drops_staging(self, loader, mock_sqlalchemy_engine):
+        """Test that an aborted swap load discards the staging table."""
+        loader.abort_load(mode="swap")
+
+        assert self._executed(mock_sqlalchemy_engine) == [
+            "DROP TABLE IF EXISTS bendito.bdt_raw_invoice_item__staging"
+        ]
+
+    def test_prepare_upsert_targets_unlogged_staging(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that upsert mode ensures the ID index and loads into an unlogged staging table."""
+        mocker.patch.object(loader, "check_if_schema_exists", return_value=True)
+        inspector = MagicMock()
+        inspector.get_table_names.return_value = ["bdt_raw_invoice_item"]
+        mocker.patch("src.loaders.postgres_loader.inspect", return_value=inspector)
+
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        connection.execute.return_value.fetchone.return_value = None
+        connection.execute.return_value.rowcount = 0
+
+        loader.prepare_load(mode="upsert")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        assert loader.load_target == "bdt_raw_invoice_item__staging"
+        assert not any("TRUNCATE" in sql for sql in executed)
+        assert (
+            'CREATE UNIQUE INDEX IF NOT EXISTS bdt_raw_invoice_item__id_unique ON bendito.bdt_raw_invoice_item ("ID")'
+            in executed
+        )
+        assert (
+            "CREATE UNLOGGED TABLE bendito.bdt_raw_invoice_item__staging (LIKE bendito.bdt_raw_invoice_item INCLUDING DEFAULTS, "
+            '"__load_order" bigint GENERATED ALWAYS AS IDENTITY)'
+            in executed
+        )
+
+    def test_unique_id_index_removes_duplicates_first(self, loader, mock_sqlalchemy_engine):
+        """Test that duplicate IDs left by old replace loads are removed, keeping the latest row, before the index."""
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        connection.execute.return_value.fetchone.return_value = None
+        connection.execute.return_value.rowcount = 3
+
+        assert loader.create_unique_id_index() == 3
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert executed[1].startswith("DELETE FROM bendito.bdt_raw_invoice_item AS live")
+        assert 'PARTITION BY "ID" ORDER BY "__updated_at" DESC, ctid DESC' in executed[1]
+        assert "ranked.position > 1" in executed[1]
+        assert executed[2] == 'CREATE UNIQUE INDEX IF NOT EXISTS bdt_raw_invoice_item__id_unique ON bendito.bdt_raw_invoice_item ("ID")'
+
+    def test_unique_id_index_skips_existing_index(self, loader, mock_sqlalchemy_engine):
+        """Test that nothing is deleted or created once the index exists."""
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        connection.execute.return_value.fetchone.return_value = (1,)
+
+        assert loader.create_unique_id_index() == 0
+        assert len(self._executed(mock_sqlalchemy_engine)) == 1
+
+    def test_finalize_upsert_merges_changed_rows(self, loader, mock_sqlalchemy_engine, mocker):
+        """Test that upsert mode merges staging by ID, only updating changed content."""
+        executed_before_catalog = []
+        mocker.patch.object(
+            loader,
+            "update_key_catalog",
+            side_effect=lambda mode: executed_before_catalog.extend(self._executed(mock_sqlalchemy_engine)),
+        )
+
+        loader.finalize_load(mode="upsert")
+
+        executed = self._executed(mock_sqlalchemy_engine)
+        merge_query = " ".join(executed[0].split())
+        assert 'ON CONFLICT ("ID") DO UPDATE' in merge_query
+        assert 'SELECT DISTINCT ON ("ID")' in merge_query
+        assert 'ORDER BY "ID", "__load_order" DESC' in merge_query
+        assert 'WHERE live."HASH" IS DISTINCT FROM md5(EXCLUDED."CONTENT"::text)' in merge_query
+        assert '"__updated_at" = now()' in merge_query
+        assert executed[1] == "DROP TABLE bendito.bdt_raw_invoice_item__staging"
+        # The catalog is updated from the staging table after the merge and before its drop
+        assert executed_before_catalog == executed[:1]
+
+    def test_update_key_catalog_reads_loaded_rows(self, loader, mock_sqlalchemy_engine):
+        """Test that the key catalog is fed from the table that received the batches."""
+        loader.load_target = loader.staging_table_name
+
+        loader.update_key_catalog()
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert executed[0].startswith("CREATE TABLE IF NOT EXISTS bendito._raw_key_catalog")
+        assert 'SELECT DISTINCT :table_name, jsonb_object_keys("CONTENT") FROM bendito.bdt_raw_invoice_item__staging' in executed[1]
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        assert connection.execute.call_args_list[1].args[1] == {"table_name": "bdt_raw_invoice_item"}
+
+    def test_update_key_catalog_prunes_keys_missing_from_full_load(self, loader, mock_sqlalchemy_engine):
+        """Test that a full load drops the keys it did not see."""
+        loader.load_target = loader.staging_table_name
+
+        loader.update_key_catalog(mode="swap")
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert executed[2] == (
+            "DELETE FROM bendito._raw_key_catalog WHERE table_name = :table_name AND last_seen_at < now()"
+        )
+
+    def test_update_key_catalog_append_reads_loaded_rows(self, loader, mock_sqlalchemy_engine):
+        """Test that an append load only scans the rows it loaded and prunes by retention."""
+        loader.load_target = loader.table.raw_model_name
+        loader.load_started_at = "2024-05-10 12:00:00+00"
+
+        loader.update_key_catalog(mode="append")
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert executed[1] == "SELECT 1 FROM bendito._raw_key_catalog WHERE table_name = :table_name LIMIT 1"
+        assert 'FROM bendito.bdt_raw_invoice_item WHERE jsonb_typeof("CONTENT") = \'object\' AND "__updated_at" >= :loaded_since' in executed[2]
+        assert "AND catalog.last_seen_at < now() - make_interval(days => 30)" in executed[3]
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        assert connection.execute.call_args_list[2].args[1]["loaded_since"] == "2024-05-10 12:00:00+00"
+
+    def test_update_key_catalog_seeds_uncataloged_table(self, loader, mock_sqlalchemy_engine):
+        """Test that the first incremental load of a table scans the whole raw table."""
+        loader.load_target = loader.staging_table_name
+        connection = mock_sqlalchemy_engine.begin.return_value.__enter__.return_value
+        connection.execute.return_value.fetchone.return_value = None
+
+        loader.update_key_catalog(mode="upsert")
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert 'jsonb_object_keys("CONTENT") FROM bendito.bdt_raw_invoice_item WHERE' in executed[2]
+        assert connection.execute.call_args_list[2].args[1] == {"table_name": "bdt_raw_invoice_item"}
+
+    def test_update_key_catalog_keeps_expired_keys_still_in_raw_table(self, loader, mock_sqlalchemy_engine):
+        """Test that an incremental load only expires keys no longer present in the raw table."""
+        loader.load_target = loader.staging_table_name
+
+        loader.update_key_catalog(mode="upsert")
+
+        executed = [" ".join(sql.split()) for sql in self._executed(mock_sqlalchemy_engine)]
+        assert 'jsonb_object_keys("CONTENT") FROM bendito.bdt_raw_invoice_item__staging' in executed[2]
+        assert executed[3].endswith(
+            'AND NOT EXISTS (SELECT 1 FROM bendito.bdt_raw_invoice_item AS raw WHERE raw."CONTENT" ? catalog.key)'
+        )
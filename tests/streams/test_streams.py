@@ -0,0 +1,29 @@
+import pytest
+from src.metadata.data_table import DataTable
+from src.streams.bendito_stream import BenditoStream
+from src.streams.bitrix_stream import BitrixStream
+
+
+class TestResolveLoadMode:
+    """Tests for the "auto" load mode resolution of the streams."""
+
+    @pytest.mark.parametrize(
+        "strategy, expected",
+        [("table", "upsert"), ("batch", "upsert"), ("list", "swap"), ("enum", "swap"), ("fields", "swap")],
+    )
+    def test_bitrix_positional_ids_are_replaced(self, strategy, expected):
+        """Test that Bitrix modes with positional ID fallbacks are never upserted."""
+        table = DataTable(origin="bitrix", source_name="crm.deal", extraction_strategy=strategy, days_interval=3)
+        assert BitrixStream(table).resolve_load_mode("auto") == expected
+
+    def test_bendito_without_unique_id_is_replaced(self):
+        """Test that Bendito tables without a unique_id_property are never upserted."""
+        table = DataTable(origin="bendito", source_name="invoice", days_interval=3)
+        assert BenditoStream(table).resolve_load_mode("auto") == "swap"
+        table.unique_id_property = "id"
+        assert BenditoStream(table).resolve_load_mode("auto") == "upsert"
+
+    def test_explicit_mode_is_kept(self):
+        """Test that an explicit load mode is not overridden."""
+        table = DataTable(origin="bitrix", source_name="crm.status", extraction_strategy="list", days_interval=3)
+        assert BitrixStream(table).resolve_load_mode("upsert") == "upsert"
@@ -0,0 +1,160 @@
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+import yaml
+from src.utils.dbt_runner import DBTRunner
+from src.metadata.data_table import DataTable
+
+
+class TestDBTRunner:
+    """Tests for the DBTRunner class."""
+
+    @pytest.fixture
+    def dbt_runner(self):
+        """Fixture for an in-process DBTRunner."""
+        return DBTRunner(project_dir="/dbt", profiles_dir="/dbt", in_process=True)
+
+    @staticmethod
+    def _node_finished(name, status, rows_affected=None):
+        return SimpleNamespace(
+            info=SimpleNamespace(name="NodeFinished"),
+            data=SimpleNamespace(
+                node_info=SimpleNamespace(
+                    node_name=name, unique_id=f"model.bdt.{name}", node_status=status
+                ),
+                run_result=SimpleNamespace(
+                    status=status,
+                    execution_time=0.5,
+                    message="SELECT 1",
+                    adapter_response={"rows_affected": rows_affected} if rows_affected is not None else {},
+                ),
+            ),
+        )
+
+    def test_build_args(self, dbt_runner):
+        """Test the dbt command line arguments."""
+        assert dbt_runner._build_args(
+            "run", select="bitrix", vars_dict={"target_schema": "bitrix"}, full_refresh=True
+        ) == [
+            "run",
+            "--project-dir", "/dbt",
+            "--profiles-dir", "/dbt",
+            "--vars", '{"target_schema": "bitrix"}',
+            "--select", "bitrix",
+            "--full-refresh",
+        ]
+
+    def test_reuses_manifest_between_commands(self, dbt_runner, mocker):
+        """Test that the project is parsed once and the manifest reused by run and test."""
+        manifest = object()
+        runners = []
+
+        def create_dbt_runner(manifest=None, callbacks=None):
+            runner = MagicMock()
+            runner.invoke.return_value = SimpleNamespace(success=True, result=parsed, exception=None)
+            runners.append((runner, manifest))
+            return runner
+
+        parsed = manifest
+        mocker.patch.object(dbt_runner, "_create_dbt_runner", side_effect=create_dbt_runner)
+
+        assert dbt_runner.run(select="bitrix", target_schema="bitrix")
+        assert dbt_runner.test(select="bitrix", target_schema="bitrix")
+
+        commands = [runner.invoke.call_args.args[0][0] for runner, _ in runners]
+        assert commands == ["parse", "run", "test"]
+        assert [used for _, used in runners[1:]] == [manifest, manifest]
+
+    def test_update_model_configs_resets_manifest(self, dbt_runner, tmp_path):
+        """Test that rewriting schema.yml forces a new parse."""
+        dbt_runner.project_dir = str(tmp_path)
+        dbt_runner.manifest = object()
+
+        dbt_runner.update_model_configs([], "bitrix")
+
+        assert dbt_runner.manifest is None
+
+    def test_on_event_collects_node_results(self, dbt_runner):
+        """Test that finished nodes become structured results passed to on_result."""
+        received = []
+        dbt_runner.on_result = received.append
+
+        dbt_runner._on_event(SimpleNamespace(info=SimpleNamespace(name="MainReportVersion")))
+        dbt_runner._on_event(self._node_finished("btx_crm_deal", "success", rows_affected=42.0))
+
+        assert len(dbt_runner.last_results) == 1
+        result = dbt_runner.last_results[0]
+        assert received == [result]
+        assert (result.name, result.status, result.rows_affected) == ("btx_crm_deal", "success", 42)
+        assert result.unique_id == "model.bdt.btx_crm_deal"
+
+    def test_failed_command_returns_false(self, dbt_runner, mocker):
+        """Test that an unsuccessful invocation is reported as a failure."""
+        dbt_runner.manifest = object()
+        runner = MagicMock()
+        runner.invoke.return_value = SimpleNamespace(success=False, result=None, exception=None)
+        mocker.patch.object(dbt_runner, "_create_dbt_runner", return_value=runner)
+
+        assert dbt_runner.build(select="bitrix") is False
+
+    def test_run_changed_selects_downstream_of_sources(self, dbt_runner, mocker):
+        """Test that only models downstream of the reloaded raw tables are selected."""
+        mocker.patch.object(dbt_runner, "run_command", return_value=True)
+        tables = [
+            DataTable(origin="bitrix", source_name="crm.deal"),
+            DataTable(origin="bitrix", source_name="crm.lead"),
+        ]
+
+        assert dbt_runner.run_changed(tables, target_schema="bitrix")
+
+        kwargs = dbt_runner.run_command.call_args.kwargs
+        assert kwargs["select"] == "source:bitrix.btx_raw_crm_deal+ source:bitrix.btx_raw_crm_lead+"
+        assert kwargs["models"] is None
+
+    def test_run_changed_without_tables(self, dbt_runner, mocker):
+        """Test that nothing runs when no table was reloaded."""
+        mocker.patch.object(dbt_runner, "run_command")
+
+        assert dbt_runner.run_changed([]) is True
+        dbt_runner.run_command.assert_not_called()
+
+    def test_generate_incremental_model_config(self, dbt_runner):
+        """Test that incremental curated models get the unique key and append new columns."""
+        table = DataTable(
+            origin="bendito",
+            source_name="invoice_item",
+            unique_id_property="id",
+            materialization_strategy="incremental",
+            run_dbt_processed=False,
+        )
+
+        configs = dbt_runner._generate_model_configs([table])
+
+        assert configs[0]["name"] == "bdt_invoice_item"
+        assert configs[0]["config"]["unique_key"] == "id"
+        assert configs[0]["config"]["on_schema_change"] == "append_new_columns"
+
+
+DBT_MODELS_DIR = Path(__file__).resolve().parents[2] / "dbt" / "models"
+
+
+def _incremental_models():
+    """Lists the (origin, model) pairs materialized as incremental in the schema files."""
+    models = []
+    for schema_path in sorted(DBT_MODELS_DIR.glob("*/schema.yml")):
+        schema = yaml.safe_load(schema_path.read_text()) or {}
+        for model in schema.get("models", []):
+            if model.get("config", {}).get("materialized") == "incremental":
+                models.append((schema_path.parent.name, model["name"]))
+    return models
+
+
+@pytest.mark.parametrize("origin,model_name", _incremental_models())
+def test_incremental_models_filter_by_updated_at(origin, model_name):
+    """Test that every incremental model exposes __updated_at and applies the incremental filter."""
+    sql = (DBT_MODELS_DIR / origin / f"{model_name}.sql").read_text()
+
+    assert "{{ incremental_filter() }}" in sql
+    assert '"__updated_at"' in sql
+
@@ -0,0 +1,40 @@
+import pytest
+from src.utils.engine_registry import EngineRegistry
+
+
+class TestEngineRegistry:
+    """Tests for the EngineRegistry class."""
+
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        """Dispose every engine created by a test."""
+        yield
+        EngineRegistry.dispose_all()
+
+    def test_get_engine_reuses_engine_per_url(self, mocker):
+        """Test that one engine is created per URL, with pre-ping and the pool sizing."""
+        create_engine = mocker.patch("src.utils.engine_registry.create_engine")
+        create_engine.side_effect = lambda url, **kwargs: mocker.MagicMock(name=url)
+
+        first = EngineRegistry.get_engine("postgresql://host/db_a", pool_size=8)
+        second = EngineRegistry.get_engine("postgresql://host/db_a")
+        other = EngineRegistry.get_engine("postgresql://host/db_b")
+
+        assert first is second
+        assert first is not other
+        assert create_engine.call_count == 2
+        kwargs = create_engine.call_args_list[0].kwargs
+        assert kwargs["pool_size"] == 8
+        assert kwargs["max_overflow"] == EngineRegistry.DEFAULT_MAX_OVERFLOW
+        assert kwargs["pool_pre_ping"] is True
+
+    def test_dispose_all(self, mocker):
+        """Test that disposing the registry closes the pools and forgets the engines."""
+        create_engine = mocker.patch("src.utils.engine_registry.create_engine")
+        create_engine.side_effect = lambda url, **kwargs: mocker.MagicMock(name=url)
+        engine = EngineRegistry.get_engine("postgresql://host/db")
+
+        EngineRegistry.dispose_all()
+
+        engine.dispose.assert_called_once()
+        assert EngineRegistry.get_engine("postgresql://host/db") is not engine
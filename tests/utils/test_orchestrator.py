@@ -0,0 +1,108 @@
+import time
+import asyncio
+import datetime
+import threading
+from unittest.mock import MagicMock
+from src.utils.orchestrator import SyncOrchestrator, AsyncOrchestrator
+from src.metadata.data_table import DataTable
+
+
+class TestSyncOrchestrator:
+    """Tests for the SyncOrchestrator class."""
+
+    @staticmethod
+    def _tables(origin, count):
+        return [
+            DataTable(id=i, origin=origin, source_name=f"table_{i}", days_interval=0)
+            for i in range(count)
+        ]
+
+    def test_run_collects_outcomes_in_order(self):
+        """Test that outcomes follow the table order and failures do not stop other tables."""
+        tables = self._tables("bendito", 4)
+
+        def replicate(table):
+            if table.id == 1:
+                raise RuntimeError("boom")
+            return 0 if table.id == 2 else 1
+
+        outcomes = SyncOrchestrator(replicate).run(tables)
+
+        assert [outcome.table for outcome in outcomes] == tables
+        assert [outcome.success for outcome in outcomes] == [True, False, False, True]
+        assert isinstance(outcomes[1].error, RuntimeError)
+        assert outcomes[2].error is None
+
+    def test_records_sync_timestamps(self):
+        """Test that every attempt is recorded and only successes move the watermark."""
+        config_handler = MagicMock()
+        tables = self._tables("notion", 2)
+
+        outcomes = SyncOrchestrator(
+            lambda table: 1 if table.id == 0 else 0, config_handler=config_handler
+        ).run(tables)
+
+        calls = config_handler.update_table_configuration.call_args_list
+        attempts = [c for c in calls if "last_sync_attempt_at" in c.kwargs]
+        successes = [c for c in calls if "last_successful_sync_at" in c.kwargs]
+        assert len(attempts) == 2
+        assert len(successes) == 1
+        assert successes[0].args == (0, "table_0")
+        assert successes[0].kwargs["last_successful_sync_at"] == outcomes[0].started_at
+        assert outcomes[0].started_at.utcoffset() == datetime.timedelta(0)
+
+    def test_respects_origin_concurrency(self):
+        """Test that no more than max_concurrency tables of an origin run at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def replicate(table):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return 1
+
+        outcomes = SyncOrchestrator(replicate, max_concurrency=2).run(self._tables("bitrix", 6))
+
+        assert all(outcome.success for outcome in outcomes)
+        assert peak == 2
+
+
+class TestAsyncOrchestrator:
+    """Tests for the AsyncOrchestrator class."""
+
+    def test_run_on_one_loop(self):
+        """Test ordered outcomes, the per-origin limit and the final cleanup on a single event loop."""
+        tables = TestSyncOrchestrator._tables("notion", 5)
+        active = 0
+        peak = 0
+        threads = set()
+        cleanup_calls = []
+
+        async def replicate(table):
+            nonlocal active, peak
+            threads.add(threading.get_ident())
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if table.id == 3:
+                raise RuntimeError("boom")
+            return 1
+
+        async def cleanup():
+            cleanup_calls.append(True)
+
+        outcomes = AsyncOrchestrator(replicate, max_concurrency=2, cleanup=cleanup).run(tables)
+
+        assert [outcome.table for outcome in outcomes] == tables
+        assert [outcome.success for outcome in outcomes] == [True, True, True, False, True]
+        assert isinstance(outcomes[3].error, RuntimeError)
+        assert peak == 2
+        assert len(threads) == 1
+        assert cleanup_calls == [True]
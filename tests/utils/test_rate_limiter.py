@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+from src.utils.rate_limiter import TokenBucket, AdaptiveRateLimiter, parse_retry_after
+
+
+class TestTokenBucket:
+    """Tests for the TokenBucket rate limiter."""
+
+    def test_burst_does_not_wait(self):
+        """Test that acquiring up to the capacity never sleeps."""
+        bucket = TokenBucket(rate=1, capacity=5)
+        with patch("src.utils.rate_limiter.time.sleep") as mock_sleep:
+            for _ in range(5):
+                bucket.acquire()
+        mock_sleep.assert_not_called()
+
+    def test_empty_bucket_waits(self):
+        """Test that an empty bucket sleeps for the time needed to refill a token."""
+        bucket = TokenBucket(rate=2, capacity=1)
+        bucket.acquire()
+        with patch("src.utils.rate_limiter.time.sleep", side_effect=lambda seconds: bucket.__setattr__("tokens", 1)) as mock_sleep:
+            bucket.acquire()
+        wait_time = mock_sleep.call_args[0][0]
+        assert 0 < wait_time <= 0.5
+
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_for_origin_is_shared(self):
+        """Test that the same limiter is returned for the same origin."""
+        first = TokenBucket.for_origin("test_origin", rate=2, capacity=10)
+        second = TokenBucket.for_origin("test_origin", rate=5, capacity=1)
+        assert first is second
+
+    def test_for_origin_is_per_class(self):
+        """Test that a plain bucket registered first does not shadow the adaptive limiter of the origin."""
+        with patch.dict(TokenBucket._registry, clear=True):
+            bucket = TokenBucket.for_origin("bitrix", rate=2)
+            limiter = AdaptiveRateLimiter.for_origin("bitrix", rate=2, max_rate=4)
+
+            assert isinstance(limiter, AdaptiveRateLimiter)
+            assert limiter is not bucket
+            assert AdaptiveRateLimiter.for_origin("bitrix", rate=2) is limiter
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the AIMD AdaptiveRateLimiter."""
+
+    def test_throttle_halves_rate_and_pauses(self):
+        """Test that a throttled response halves the rate once per cooldown and pauses the origin."""
+        limiter = AdaptiveRateLimiter(rate=4, capacity=10, min_rate=1)
+        limiter.on_throttle(pause=3)
+        limiter.on_throttle()
+
+        assert limiter.rate == 2
+        assert limiter.tokens < 1
+        assert 2.5 < limiter._try_acquire(1) <= 3
+
+    def test_success_increases_rate_up_to_max(self):
+        """Test the additive increase, capped at max_rate."""
+        limiter = AdaptiveRateLimiter(rate=1, max_rate=1.5, increase=0.2)
+        limiter.on_success()
+        assert limiter.rate == 1.2
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.rate == 1.5
+
+    def test_parse_retry_after(self):
+        """Test the Retry-After header in seconds, as an HTTP date and when invalid."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0